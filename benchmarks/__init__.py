@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""Reproducible benchmarks of the pipeline and page hot paths.
+
+Usage (from the repository root):
+    python -m benchmarks                          # every case at 1x, 10x, 100x
+    python -m benchmarks --only load. trade.      # a subset (substring of the case name)
+    python -m benchmarks --source tiled           # the real store repeated instead of a synthetic league
+    python -m benchmarks --save                   # record benchmarks/results/baseline.json
+    python -m benchmarks --compare                # exit 1 if a case is >25% slower than the baseline
+    python -m benchmarks.loadtest                 # concurrent users on a local headless server
+"""
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Command line entry point for the benchmarks (see benchmarks/__init__.py)."""
+
+import argparse
+import logging
+import sys
+
+import pandas as pd
+
+from benchmarks import cases, harness
+from benchmarks.data import SOURCES, ScaledStore
+
+log = logging.getLogger("benchmarks")
+
+DEFAULT_SCALES = (1, 10, 100)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time the load, derivation, salary and history hot paths on leagues k times the current size.",
+    )
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES),
+                        help="league sizes, as multiples of the current store (default: 1 10 100)")
+    parser.add_argument("--source", choices=SOURCES, default="synthetic",
+                        help="synthetic league or tiled copies of data/store (default: %(default)s)")
+    parser.add_argument("--only", nargs="+", default=None, metavar="PATTERN",
+                        help="only the cases whose name contains one of the patterns")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (default: %(default)s)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak measurement")
+    parser.add_argument("--save", nargs="?", const=harness.BASELINE_PATH, default=None, metavar="PATH",
+                        help="write the results as a baseline (default: %(const)s)")
+    parser.add_argument("--compare", nargs="?", const=harness.BASELINE_PATH, default=None, metavar="PATH",
+                        help="compare with a baseline and exit 1 on a regression")
+    parser.add_argument("--threshold", type=float, default=harness.THRESHOLD,
+                        help="median slowdown flagged as a regression (default: %(default)s)")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    return parser
+
+
+def run(selected, scales, repeat: int = 5, memory: bool = True, source: str = "synthetic") -> list:
+    results = []
+    for factor in scales:
+        store = ScaledStore(factor, source)
+        try:
+            for c in selected:
+                if c.max_scale is not None and factor > c.max_scale:
+                    continue
+                setup = c.setup(store)
+                if setup is None:
+                    continue
+                func, rows = setup
+                result = harness.measure(func, c.name, factor, rows, repeat=c.repeat or repeat,
+                                         memory=memory and c.memory)
+                log.info("%4dx %-48s %10.2f ms  (%d rows)", factor, c.name, result.median_ms, rows)
+                results.append(result)
+        finally:
+            store.close()
+    return results
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%H:%M:%S")
+
+    selected = cases.select(args.only)
+    if args.list or not selected:
+        for c in selected:
+            print(c.name + (f"  (<= {c.max_scale}x)" if c.max_scale else ""))
+        return 0 if selected or args.list else 1
+
+    results = run(selected, args.scales, args.repeat, memory=not args.no_memory, source=args.source)
+    if not results:
+        log.warning("No case applies to scales %s (%s source)", args.scales, args.source)
+        return 0
+    with pd.option_context("display.width", 160, "display.max_rows", None):
+        print(harness.to_frame(results).drop(columns="repeat").to_string(index=False))
+
+    if args.save:
+        log.info("Baseline written to %s", harness.save(results, args.save, source=args.source))
+
+    if args.compare:
+        report = harness.compare(results, harness.load(args.compare), args.threshold)
+        with pd.option_context("display.width", 160, "display.max_rows", None):
+            print(report.to_string(index=False))
+        slower = report[report["status"] == "slower"]
+        if len(slower):
+            log.error("%d case(s) more than %.0f%% slower than %s", len(slower), args.threshold * 100, args.compare)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""Benchmark cases: the load, derivation, salary, history and rolling-form hot paths.
+
+A case is a setup function registered with @case. It receives a
+ScaledStore and returns (func, rows): the zero-argument callable to time and
+the number of input rows it works on, or None when the case does not apply
+to that store. Setup work (writing the input files, building the inputs of a
+lookup) is not timed.
+"""
+
+import re
+from dataclasses import dataclass
+
+import pandas as pd
+
+from data_processing.derive import add_derived
+from data_processing.gamelogs import PLAYER_KEYS, PLAYER_LABELS
+from nba_data import loaders, search, trades
+from nba_data.rolling import RollingForm
+from nba_data.capsheet import CapSheet
+from nba_data.store import DATASETS
+
+SALARIES = "df_nba_players_salaries"
+PLAYERS = "df_reg_season_players"
+PLAYERS_FILTERED = "df_reg_season_players_filtered"
+CHAMPIONS = "df_nba_champion"
+
+# openpyxl reads ~10k cells/s per core: past 10x the Excel cases take minutes
+EXCEL_MAX_SCALE = 10
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    setup: object
+    max_scale: int = None
+    repeat: int = None   # None -> the --repeat of the run
+    memory: bool = True
+
+
+CASES = {}
+
+
+def case(name: str, max_scale: int = None, repeat: int = None, memory: bool = True):
+    def register(setup):
+        CASES[name] = Case(name, setup, max_scale, repeat, memory)
+        return setup
+    return register
+
+
+def select(patterns=None) -> list:
+    """Cases whose name contains one of `patterns` (all cases when empty)."""
+    return [c for name, c in CASES.items() if not patterns or any(p in name for p in patterns)]
+
+
+_SEASON = re.compile(r"^\d{4}-\d{2}$")
+
+
+def _salary_years(df) -> list:
+    """'2025-26', ... columns of a salaries frame or trade pool."""
+    return [c for c in df.columns if _SEASON.match(str(c))]
+
+
+# -------------------------------
+# Loading: Excel vs columnar store
+# -------------------------------
+def _register_load(name: str):
+    @case(f"load.parquet.{name}")
+    def _parquet(store):
+        path = store.workdir / f"{name}.parquet"
+        if not path.exists():
+            store.frame(name).to_parquet(path, index=False, engine="pyarrow")
+        return (lambda: pd.read_parquet(path, engine="pyarrow")), len(store.frame(name))
+
+    @case(f"load.excel.{name}", max_scale=EXCEL_MAX_SCALE, repeat=3, memory=False)
+    def _excel(store):
+        path = store.workdir / f"{name}.xlsx"
+        if not path.exists():
+            store.frame(name).to_excel(path, index=False)
+        return (lambda: pd.read_excel(path)), len(store.frame(name))
+
+
+for _name in DATASETS:
+    _register_load(_name)
+
+
+# -------------------------------
+# Derivation
+# -------------------------------
+@case("derive.add_derived")
+def _derive(store):
+    df = store.frame(PLAYERS)
+    return (lambda: add_derived(df)), len(df)
+
+
+# -------------------------------
+# Salaries
+# -------------------------------
+@case("salaries.build_salaries_long")
+def _salaries_long(store):
+    salaries, players = store.frame(SALARIES), store.frame(PLAYERS_FILTERED)
+    years = _salary_years(salaries)
+    return (lambda: loaders.build_salaries_long(salaries, players, years)), len(salaries)
+
+
+@case("salaries.build_trade_pool")
+def _trade_pool(store):
+    salaries, players = store.frame(SALARIES), store.frame(PLAYERS_FILTERED)
+    years = _salary_years(salaries)
+    return (lambda: loaders.build_trade_pool(salaries, players, years)), len(salaries)
+
+
+# -------------------------------
+# Trade Machine
+# -------------------------------
+def _pool(store):
+    salaries = store.frame(SALARIES)
+    return loaders.build_trade_pool(salaries, store.frame(PLAYERS_FILTERED), _salary_years(salaries))
+
+
+def _roster(pool, team, season, n):
+    return pool.loc[(pool["TEAM"] == team) & (pool[season] > 0), "PLAYER"].head(n).tolist()
+
+
+@case("trade.salaire_cumule")
+def _cumulative_salary(store):
+    # Same expression as salaire_cumule() in pages/4_Trade_Machine.py
+    pool = _pool(store)
+    season = _salary_years(pool)[0]
+    team = pool["TEAM"].iloc[0]
+    selected = _roster(pool, team, season, 3)
+    return (lambda: int(pool.loc[pool["PLAYER"].isin(selected), season].sum())), len(pool)
+
+
+@case("trade.cap_sheet")
+def _cap_sheet(store):
+    salaries = store.frame(SALARIES)
+    years = _salary_years(salaries)
+    return (lambda: CapSheet(salaries, years)), len(salaries)
+
+
+@case("trade.validate")
+def _validate(store):
+    salaries = store.frame(SALARIES)
+    sheet = CapSheet(salaries, _salary_years(salaries))
+    season = sheet.seasons[0]
+    pool = _pool(store)
+    teams = sheet.teams[:3]
+    moves = [trades.Move(player, team, teams[(i + 1) % len(teams)])
+             for i, team in enumerate(teams) for player in _roster(pool, team, season, 2)]
+    return (lambda: trades.validate(moves, teams, sheet=sheet)), len(salaries)
+
+
+@case("trade.find_counter_offers")
+def _counter_offers(store):
+    if store.rosters_grow:  # C(150, 4) ~ 20M packages per team at 10x tiled
+        return None
+    pool = _pool(store)
+    teams = sorted(pool["TEAM"].dropna().unique())
+    season = _salary_years(pool)[0]
+    outgoing = _roster(pool, teams[0], season, 2)
+    return (lambda: trades.find_counter_offers(pool, season, outgoing, teams[1], team_a=teams[0])), len(pool)
+
+
+# -------------------------------
+# Champions history filters
+# -------------------------------
+def _champions(store):
+    df = store.frame(CHAMPIONS)
+    return df.assign(RUNNER=df["RUNNER-UP"]) if "RUNNER-UP" in df.columns else df
+
+
+@case("champions.index_build")
+def _champions_index(store):
+    df = _champions(store)
+    return (lambda: search.InvertedIndex(df, search.CHAMPION_FIELDS)), len(df)
+
+
+@case("champions.search")
+def _champions_search(store):
+    df = _champions(store)
+    ix = search.InvertedIndex(df, search.CHAMPION_FIELDS)
+    # Every champion alone, then champion + Finals MVP (the page's filter combinations)
+    queries = [{"CHAMPION": c} for c in ix.options("CHAMPION")]
+    for row in df.head(50).itertuples(index=False):
+        queries.append({"CHAMPION": row.CHAMPION, "PLAYER": row.FINALS_MVP})
+
+    def run():
+        for q in queries:
+            ix.take(ix.search(**q))
+    return run, len(df)
+
+
+# -------------------------------
+# Rolling form (game logs)
+# -------------------------------
+def _form_engine(state=None, form=None) -> RollingForm:
+    return RollingForm(PLAYER_KEYS, labels=PLAYER_LABELS, state=state, form=form)
+
+
+@case("rolling.season_replay", repeat=3)
+def _rolling_season(store):
+    logs = store.game_logs
+    if logs is None:
+        return None
+    return (lambda: _form_engine().update(logs)), len(logs)
+
+
+@case("rolling.one_game_day")
+def _rolling_day(store):
+    """The nightly batch: one game day on top of the engine state after the rest of the season."""
+    logs = store.game_logs
+    if logs is None:
+        return None
+    last_day = logs["GAME_DATE"] == logs["GAME_DATE"].max()
+    engine = _form_engine()
+    engine.update(logs[~last_day])
+    day = logs[last_day]
+    # A fresh engine on the saved state each time, as the ingest job does
+    return (lambda: _form_engine(engine.state, engine.form).update(day)), len(day)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Store datasets at k times the size of the league.
+
+Two sources:
+    synthetic (default)  a generated league of 30 x k teams (data_processing.synthetic):
+                         rosters, contracts and the champions history keep a
+                         realistic size per team, only the league grows.
+    tiled                the real store repeated k times.
+
+scale(df, k) tiles a frame k times. Replica i > 0 gets 'R<i> ' prefixed to
+its name columns and its ids offset, so a 10x league has 10x distinct
+players (joins, indexes and factorizations grow with it) while every
+replica keeps the real value distributions. The prefix is a separate word
+so names.join_key() still strips suffixes such as 'Jr.' or 'III'.
+"""
+
+import shutil
+import tempfile
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_processing import synthetic
+from nba_data.store import read_frame
+
+# Columns made distinct per replica
+NAME_COLS = ("PLAYER", "PLAYER_NAME", "NICKNAME", "FINALS_MVP", "POINTS", "REBOUNDS", "ASSISTS")
+ID_COLS = ("PLAYER_ID",)
+ID_OFFSET = 10_000_000
+SOURCES = ("synthetic", "tiled")
+
+
+def scale(df: pd.DataFrame, factor: int) -> pd.DataFrame:
+    """df repeated `factor` times, name / id columns made distinct per replica."""
+    if factor <= 1:
+        return df.copy()
+    n = len(df)
+    out = df.iloc[np.tile(np.arange(n), factor)].reset_index(drop=True)
+    replica = np.repeat(np.arange(factor), n)
+    prefix = pd.Series(np.char.add(np.char.add("R", replica.astype(str)), " "))
+    prefix[replica == 0] = ""
+    for col in NAME_COLS:
+        if col in out.columns:
+            values = out[col].astype("object")
+            named = values.notna().to_numpy()
+            out[col] = values.where(~named, prefix + values.astype(str))
+    for col in ID_COLS:
+        if col in out.columns:
+            out[col] = out[col] + replica * ID_OFFSET
+    return out
+
+
+def league_config(factor: int, seed: int = 0) -> synthetic.LeagueConfig:
+    """A current-season league with `factor` x 30 teams and `factor` x 50 years of champions."""
+    return synthetic.LeagueConfig(teams=30 * factor, champion_years=50 * factor, seed=seed)
+
+
+class ScaledStore:
+    """Store datasets at one scale, built on first use, plus a scratch directory."""
+
+    def __init__(self, factor: int, source: str = "synthetic"):
+        if source not in SOURCES:
+            raise ValueError(f"Unknown source {source!r}, expected one of {SOURCES}")
+        self.factor = factor
+        self.source = source
+        self._frames = {}
+
+    @property
+    def rosters_grow(self) -> bool:
+        """True when a team has k times more players at scale k (tiled source)."""
+        return self.source == "tiled" and self.factor > 1
+
+    def frame(self, name: str) -> pd.DataFrame:
+        if not self._frames and self.source == "synthetic":
+            self._frames = synthetic.league_frames(league_config(self.factor))
+        if name not in self._frames:
+            self._frames[name] = scale(read_frame(name), self.factor)
+        return self._frames[name]
+
+    @cached_property
+    def game_logs(self):
+        """Regular-season player game logs of the synthetic league (None for the tiled source)."""
+        if self.source != "synthetic":
+            return None
+        config = league_config(self.factor)
+        season = None
+        for season in synthetic.iter_seasons(config):
+            pass
+        return synthetic.game_logs(config, season).assign(SEASON=config.current, SEASON_TYPE="Regular Season")
+
+    @cached_property
+    def workdir(self) -> Path:
+        return Path(tempfile.mkdtemp(prefix=f"nba_bench_{self.factor}x_"))
+
+    def close(self):
+        if "workdir" in self.__dict__:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+        self.__dict__.pop("game_logs", None)
+        self._frames.clear()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Timing / memory measurement, baselines and comparison.
+
+A benchmark is a zero-argument callable. measure() runs it once to warm up,
+then times `repeat` runs with the garbage collector disabled (collected
+before each run), and one extra run under tracemalloc for the peak Python
+allocation. min and median are reported; comparisons use the median.
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+BASELINE_PATH = RESULTS_DIR / "baseline.json"
+THRESHOLD = 0.25  # median more than 25% slower than baseline -> regression
+
+
+@dataclass
+class Result:
+    name: str
+    scale: int
+    rows: int
+    repeat: int
+    min_ms: float
+    median_ms: float
+    stdev_ms: float
+    peak_kb: float    # None when not measured
+
+
+def measure(func, name: str, scale: int, rows: int = 0, repeat: int = 5, warmup: int = 1,
+            memory: bool = True) -> Result:
+    for _ in range(warmup):
+        func()
+    times = []
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter_ns()
+            func()
+            times.append((time.perf_counter_ns() - start) / 1e6)
+            gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return Result(name, scale, rows, repeat, round(min(times), 3), round(statistics.median(times), 3),
+                  round(statistics.stdev(times), 3) if len(times) > 1 else 0.0, None if peak is None else round(peak / 1024, 1))
+
+
+# -------------------------------
+# Baselines
+# -------------------------------
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save(results, path=BASELINE_PATH, **meta) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"environment": {**environment(), **meta}, "results": [asdict(r) for r in results]}
+    path.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+    return path
+
+
+def load(path=BASELINE_PATH) -> list:
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return [Result(**r) for r in payload["results"]]
+
+
+def to_frame(results) -> pd.DataFrame:
+    return pd.DataFrame([asdict(r) for r in results])
+
+
+def compare(results, baseline, threshold: float = THRESHOLD) -> pd.DataFrame:
+    """Current vs baseline medians per (name, scale); STATUS is 'slower' above the threshold."""
+    current = to_frame(results).set_index(["name", "scale"])
+    base = to_frame(baseline).set_index(["name", "scale"])
+    joined = current[["median_ms", "peak_kb"]].join(
+        base[["median_ms", "peak_kb"]], rsuffix="_base", how="left")
+    joined["ratio"] = (joined["median_ms"] / joined["median_ms_base"]).round(3)
+    joined["status"] = np.select(
+        [joined["median_ms_base"].isna(), joined["ratio"] > 1 + threshold, joined["ratio"] < 1 - threshold],
+        ["new", "slower", "faster"], default="ok")
+    return joined.reset_index()
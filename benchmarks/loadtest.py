@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+"""Concurrent-user load test of the Streamlit pages, against a local headless server.
+
+The app is started with `streamlit run home.py --server.headless true` on a
+free localhost port. N virtual analysts connect to it over the same websocket
+protocol as the browser, so their reruns execute concurrently in the server
+and share its caches, as they would on one pod. Each analyst runs
+scripted sessions:
+    team     open Team, pick a team, toggle playoffs and back, switch salary year
+    trade    open Trade Machine, pick a season, two teams and players, test the
+             trade, search counter-offers
+    history  open Champ Historic, filter by champion, then by player, then reset
+
+Every step is one script rerun, timed from the request to script_finished.
+The report gives throughput (reruns / s), latency percentiles per step, errors
+(exceptions shown by the page included) and the server RSS, sampled during
+the run. Nothing leaves the machine; point NBA_STORE_DIR at a synthetic
+store (python -m data_processing.synthetic) to test at larger volumes.
+
+Usage (from the repository root):
+    python -m benchmarks.loadtest                          # 8 users, 3 sessions each
+    python -m benchmarks.loadtest --users 32 --sessions 5 --scenarios team trade
+    NBA_STORE_DIR=/tmp/league/store python -m benchmarks.loadtest --users 16
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState, WidgetStates
+from streamlit.testing.v1.element_tree import parse_tree_from_messages
+from tornado.websocket import websocket_connect
+
+from benchmarks.harness import RESULTS_DIR, environment
+
+log = logging.getLogger("benchmarks")
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = "home.py"
+TIMEOUT = 120  # seconds per rerun
+STARTUP_TIMEOUT = 60
+LOADTEST_PATH = RESULTS_DIR / "loadtest.json"
+
+
+# -------------------------------
+# Server
+# -------------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Server:
+    """`streamlit run home.py` in a subprocess, on a free localhost port."""
+
+    def __init__(self, port: int = None):
+        self.port = port or _free_port()
+        self.process = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self):
+        cmd = [sys.executable, "-m", "streamlit", "run", APP,
+               "--server.headless", "true", "--server.address", "127.0.0.1", "--server.port", str(self.port),
+               "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"]
+        self.process = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"streamlit exited with code {self.process.returncode}:\n"
+                                   + self.process.stderr.read().decode(errors="replace"))
+            try:
+                with urllib.request.urlopen(f"{self.url}/_stcore/health", timeout=1) as r:
+                    if r.status == 200:
+                        return self
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise TimeoutError(f"streamlit not healthy on {self.url} after {STARTUP_TIMEOUT}s")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def memory_mb(self) -> dict:
+        """VmRSS (current) and VmHWM (peak) of the server, in MB (Linux /proc; NaN elsewhere)."""
+        out = {"VmRSS": np.nan, "VmHWM": np.nan}
+        try:
+            with open(f"/proc/{self.process.pid}/status") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    if key in out:
+                        out[key] = int(value.split()[0]) / 2**10  # kB
+        except OSError:
+            pass
+        return out
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# -------------------------------
+# Client
+# -------------------------------
+class Client:
+    """One browser tab: a websocket session that keeps its widget values between reruns."""
+
+    def __init__(self, server: Server):
+        self.server = server
+        self.ws = None
+        self.pages = {}        # url_pathname -> page_script_hash
+        self.page_hash = ""
+        self.widgets = {}      # widget id -> WidgetState sent with the next rerun
+        self.tree = None
+
+    async def connect(self):
+        url = self.server.url.replace("http", "ws", 1) + "/_stcore/stream"
+        self.ws = await websocket_connect(url, subprotocols=["streamlit"])
+        return await self.rerun()
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    def open(self, page: str):
+        """Switch to a page (its url_pathname, e.g. 'Team'), like a sidebar link."""
+        self.page_hash = self.pages[page]
+        self.widgets.clear()
+        return self.rerun()
+
+    async def rerun(self):
+        """Send the widget values, wait for script_finished; returns the error shown, if any."""
+        state = ClientState(page_script_hash=self.page_hash,
+                            widget_states=WidgetStates(widgets=list(self.widgets.values())))
+        await self.ws.write_message(BackMsg(rerun_script=state).SerializeToString(), binary=True)
+        messages = await asyncio.wait_for(self._until_finished(), TIMEOUT)
+
+        self.tree = parse_tree_from_messages(messages)
+        # Buttons are one-shot; widgets no longer on the page are forgotten, as in the browser
+        present = {w.id for w in self.tree if hasattr(w, "id") and w.id}
+        self.widgets = {i: w for i, w in self.widgets.items()
+                        if i in present and w.WhichOneof("value") != "trigger_value"}
+        if self.tree.exception:
+            return self.tree.exception[0].message
+        return None
+
+    async def _until_finished(self) -> list:
+        messages = []
+        while True:
+            payload = await self.ws.read_message()
+            if payload is None:
+                raise ConnectionError("websocket closed by the server")
+            msg = ForwardMsg()
+            msg.ParseFromString(payload)
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                messages = []
+            elif kind == "navigation":  # the pages of the app, sent on every run
+                self.pages = {p.url_pathname: p.page_script_hash for p in msg.navigation.app_pages}
+                self.page_hash = msg.navigation.page_script_hash
+            elif kind == "script_finished":
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("script compile error")
+                if msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return messages
+            elif kind == "page_not_found":
+                raise KeyError(f"page not found: {msg.page_not_found.page_name}")
+            else:
+                messages.append(msg)
+
+    # Widget interactions, the values the frontend would send
+    def widget(self, kind: str, key: str = None, label: str = None):
+        widgets = getattr(self.tree, kind)
+        if key is not None:
+            return widgets(key)
+        return next(w for w in widgets if w.label == label)
+
+    def select(self, widget, value):
+        self.widgets[widget.id] = WidgetState(id=widget.id, string_value=value)
+        return self.rerun()
+
+    def choose(self, widget, value):
+        self.widgets[widget.id] = WidgetState(id=widget.id, int_value=widget.options.index(value))
+        return self.rerun()
+
+    def multiselect(self, widget, values):
+        state = WidgetState(id=widget.id)
+        state.string_array_value.data[:] = values
+        self.widgets[widget.id] = state
+        return self.rerun()
+
+    def click(self, widget):
+        self.widgets[widget.id] = WidgetState(id=widget.id, trigger_value=True)
+        return self.rerun()
+
+
+# -------------------------------
+# Scenarios
+# -------------------------------
+def _pick(rng: random.Random, options, exclude=("",)):
+    return rng.choice([o for o in options if o not in exclude])
+
+
+def _open(page: str):
+    return lambda c, rng: c.open(page)
+
+
+def _select_random(kind: str, key: str = None, label: str = None, exclude=("",), first: int = None):
+    def step(c, rng):
+        w = c.widget(kind, key, label)
+        return c.select(w, _pick(rng, w.options[:first], exclude))
+    return step
+
+
+def _team_scenario():
+    return [
+        ("team.open", _open("Team")),
+        ("team.select_team", _select_random("selectbox", key="team_filter")),
+        ("team.playoffs", lambda c, rng: c.choose(c.widget("radio", key="season_filter_team"), "Playoffs")),
+        ("team.regular_season", lambda c, rng: c.choose(c.widget("radio", key="season_filter_team"),
+                                                         "Saison Régulière")),
+        ("team.salary_year", _select_random("selectbox", key="salary_year")),
+    ]
+
+
+def _select_players(key: str):
+    def step(c, rng):
+        w = c.widget("multiselect", key=key)
+        return c.multiselect(w, rng.sample(w.options, min(len(w.options), rng.randint(1, 2))))
+    return step
+
+
+def _trade_scenario():
+    return [
+        ("trade.open", _open("Trade_Machine")),
+        ("trade.season", _select_random("selectbox", label="Sélectionner la saison", first=2)),
+        ("trade.team_a", _select_random("selectbox", key="equipeA")),
+        ("trade.team_b", _select_random("selectbox", key="equipeB")),
+        ("trade.players_a", _select_players("joueursA")),
+        ("trade.players_b", _select_players("joueursB")),
+        ("trade.validate", lambda c, rng: c.click(c.widget("button", label="Essayer cet échange"))),
+        ("trade.counter_offers", lambda c, rng: c.click(c.widget("button", key="chercher"))),
+    ]
+
+
+def _history_scenario():
+    return [
+        ("history.open", _open("Champ_Historic")),
+        ("history.champion", _select_random("selectbox", key="champ_hist", exclude=("Toutes",))),
+        ("history.player", _select_random("selectbox", key="player_hist", exclude=("Toutes",))),
+        ("history.reset", lambda c, rng: c.select(c.widget("selectbox", key="champ_hist"), "Toutes")),
+    ]
+
+
+SCENARIOS = {
+    "team": _team_scenario,
+    "trade": _trade_scenario,
+    "history": _history_scenario,
+}
+
+
+# -------------------------------
+# Runner
+# -------------------------------
+@dataclass
+class Sample:
+    user: int
+    session: int
+    step: str
+    ms: float
+    error: str = None
+
+
+@dataclass
+class LoadReport:
+    users: int
+    sessions: int
+    duration_s: float
+    reruns: int
+    errors: int
+    throughput: float          # reruns / s
+    rss_start_mb: float        # server, after startup
+    rss_end_mb: float
+    peak_rss_mb: float
+    steps: list = field(default_factory=list)
+
+
+async def _timed(samples: list, user: int, session: int, step: str, action) -> str:
+    start = time.perf_counter()
+    try:
+        error = await action()
+    except Exception as exc:  # a broken step must not stop the other users
+        error = f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+    samples.append(Sample(user, session, step, (time.perf_counter() - start) * 1000, error))
+    if error:
+        log.warning("user %d session %d %s: %s", user, session, step, error)
+    return error
+
+
+async def _session(server: Server, user: int, session: int, scenarios, rng: random.Random, think: float,
+                   samples: list):
+    client = Client(server)
+    try:
+        if await _timed(samples, user, session, "home.open", client.connect):
+            return
+        for name in rng.sample(scenarios, len(scenarios)):  # each analyst visits the pages in a random order
+            for step, action in SCENARIOS[name]():
+                if await _timed(samples, user, session, step, lambda: action(client, rng)):
+                    break  # the rest of the scenario depends on this step
+                if think:
+                    await asyncio.sleep(rng.expovariate(1 / think))
+    finally:
+        client.close()
+
+
+async def _run(server: Server, users: int, sessions: int, scenarios, think: float, seed: int, samples: list) -> float:
+    peak = server.memory_mb()["VmRSS"]
+
+    async def user_loop(user):
+        rng = random.Random(seed * 100_003 + user)
+        for session in range(sessions):
+            await _session(server, user, session, scenarios, rng, think, samples)
+
+    async def sample_memory():
+        nonlocal peak
+        while True:
+            peak = np.nanmax([peak, server.memory_mb()["VmRSS"]])
+            await asyncio.sleep(0.25)
+
+    sampler = asyncio.ensure_future(sample_memory())
+    try:
+        await asyncio.gather(*(user_loop(u) for u in range(users)))
+    finally:
+        sampler.cancel()
+    return peak
+
+
+def run(users: int = 8, sessions: int = 3, scenarios=tuple(SCENARIOS), think: float = 0.0,
+        seed: int = 0) -> tuple:
+    """Run `users` concurrent users x `sessions` sessions; returns (LoadReport, samples frame)."""
+    samples = []
+    with Server() as server:
+        rss_start = server.memory_mb()["VmRSS"]
+        started = time.perf_counter()
+        sampled_peak = asyncio.run(_run(server, users, sessions, list(scenarios), think, seed, samples))
+        duration = time.perf_counter() - started
+        memory = server.memory_mb()
+
+    df = pd.DataFrame([asdict(s) for s in samples], columns=["user", "session", "step", "ms", "error"])
+    report = LoadReport(
+        users=users, sessions=sessions, duration_s=round(duration, 2), reruns=len(df),
+        errors=int(df["error"].notna().sum()), throughput=round(len(df) / duration, 2) if duration else 0.0,
+        rss_start_mb=round(rss_start, 1), rss_end_mb=round(memory["VmRSS"], 1),
+        peak_rss_mb=round(np.nanmax([sampled_peak, memory["VmHWM"]]), 1),
+        steps=step_summary(df).to_dict(orient="records"),
+    )
+    return report, df
+
+
+def step_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """STEP, COUNT, ERRORS, P50_MS, P95_MS, P99_MS, MAX_MS (all steps in the last row)."""
+    rows = []
+    groups = [(step, g) for step, g in df.groupby("step", sort=False)] + [("all", df)]
+    for step, g in groups:
+        ms = g["ms"].to_numpy()
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99]) if len(ms) else (np.nan,) * 3
+        rows.append({"STEP": step, "COUNT": len(g), "ERRORS": int(g["error"].notna().sum()),
+                     "P50_MS": round(p50, 1), "P95_MS": round(p95, 1), "P99_MS": round(p99, 1),
+                     "MAX_MS": round(ms.max(), 1) if len(ms) else np.nan})
+    return pd.DataFrame(rows, columns=["STEP", "COUNT", "ERRORS", "P50_MS", "P95_MS", "P99_MS", "MAX_MS"])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.loadtest",
+        description="Concurrent analysts on the Streamlit pages, against a local headless server.",
+    )
+    parser.add_argument("--users", type=int, default=8, help="concurrent users (default: %(default)s)")
+    parser.add_argument("--sessions", type=int, default=3, help="sessions per user (default: %(default)s)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS),
+                        help="pages visited in each session (default: all)")
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="mean think time between steps, in seconds (default: none)")
+    parser.add_argument("--seed", type=int, default=0, help="default: %(default)s")
+    parser.add_argument("--save", nargs="?", const=LOADTEST_PATH, default=None, metavar="PATH",
+                        help="write the report as JSON (default: %(const)s)")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%H:%M:%S")
+
+    log.info("%d users x %d sessions (%s), store %s", args.users, args.sessions, ", ".join(args.scenarios),
+             os.environ.get("NBA_STORE_DIR") or "data/store")
+    report, _ = run(args.users, args.sessions, args.scenarios, args.think, args.seed)
+
+    with pd.option_context("display.width", 160, "display.max_rows", None):
+        print(pd.DataFrame(report.steps).to_string(index=False))
+    print(f"\n{report.reruns} reruns in {report.duration_s:.1f}s -> {report.throughput:.1f} reruns/s, "
+          f"{report.errors} error(s); server RSS {report.rss_start_mb:.0f} -> {report.rss_end_mb:.0f} MB "
+          f"(peak {report.peak_rss_mb:.0f} MB)")
+
+    if args.save:
+        path = Path(args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"environment": environment(), "report": asdict(report)}, indent=1),
+                        encoding="utf-8")
+        log.info("Report written to %s", path)
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Data processing pipeline (run headless with: python -m data_processing)."""
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Command line entry point for the processing pipeline.
+
+Usage (from the repository root):
+    python -m data_processing                      # fetch -> positions -> filter -> export
+    python -m data_processing --no-positions       # skip the 30 roster calls
+    python -m data_processing --from-store         # re-run positions/filter on stored players
+    python -m data_processing --excel              # also write data/*.xlsx
+    python -m data_processing --seasons 2004-05:2024-25   # backfill the season partitions
+    python -m data_processing --offline            # replay cached API responses only
+    python -m data_processing --force              # full rebuild (ignore the manifest)
+"""
+
+import argparse
+import logging
+import sys
+
+from data_processing import http_cache, pipeline
+
+log = logging.getLogger("data_processing")
+
+SEASON_TYPE_CHOICES = {
+    "all": pipeline.SEASON_TYPES,
+    "regular": ("Regular Season",),
+    "playoffs": ("Playoffs",),
+}
+
+
+def _print_progress(done: int, total: int, label: str = ""):
+    log.info("  [%2d/%d] %s", done, total, label)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m data_processing",
+        description="Refresh the data/store datasets without Streamlit.",
+    )
+    parser.add_argument("--season", default=pipeline.SEASON,
+                        help="current NBA season, written to the flat datasets (default: %(default)s)")
+    parser.add_argument("--seasons", type=pipeline.parse_seasons, default=None,
+                        help="seasons to ingest into the partitioned store: 2015-16:2024-25 or "
+                             "2019-20,2024-25 (default: --season)")
+    parser.add_argument("--season-types", choices=SEASON_TYPE_CHOICES, default="all",
+                        help="season types to ingest (default: %(default)s)")
+    parser.add_argument("--from-store", action="store_true",
+                        help="skip the API fetch and reuse the player frames already in the store")
+    parser.add_argument("--no-positions", action="store_true", help="skip the roster positions merge")
+    parser.add_argument("--workers", type=int, default=pipeline.ROSTER_WORKERS,
+                        help="concurrent roster calls (default: %(default)s)")
+    parser.add_argument("--rate", type=float, default=pipeline.ROSTER_RATE,
+                        help="max API calls per second (default: %(default)s)")
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument("--offline", dest="cache_mode", action="store_const", const="offline",
+                       help="serve API calls from .cache/nba_api only (no network)")
+    cache.add_argument("--refresh", dest="cache_mode", action="store_const", const="refresh",
+                       help="revalidate every cached API response")
+    cache.add_argument("--no-cache", dest="cache_mode", action="store_const", const="off",
+                       help="bypass the API response cache")
+    parser.add_argument("--cache-ttl", type=float, default=None,
+                        help="seconds before a cached API response is revalidated "
+                             f"(default: {http_cache.DEFAULT_TTL:.0f})")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every output, even when its inputs are unchanged")
+    parser.add_argument("--excel", action="store_true", help="also export data/*.xlsx (human-readable copy)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print warnings and errors")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(asctime)s %(levelname)-7s %(message)s",
+        datefmt="%H:%M:%S",
+    )
+    http_cache.configure(ttl=args.cache_ttl, mode=args.cache_mode)
+    try:
+        pipeline.run(
+            season=args.season,
+            seasons=args.seasons,
+            season_types=SEASON_TYPE_CHOICES[args.season_types],
+            fetch=not args.from_store,
+            positions=not args.no_positions,
+            excel=args.excel,
+            progress=_print_progress,
+            max_workers=args.workers,
+            rate=args.rate,
+            force=args.force,
+        )
+    except KeyboardInterrupt:
+        log.error("Interrupted")
+        return 130
+    except Exception:
+        log.exception("Pipeline failed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
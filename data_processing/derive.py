@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Vectorized rate-stat derivation: per game, per 36 minutes, per 100 possessions.
+
+Driven by COUNTING_STATS and VARIANTS: the counting stats are taken as one
+(players x stats) NumPy block and multiplied by one (players x variants)
+factor matrix, so every <STAT>_<VARIANT> column comes out of a single
+broadcast instead of one Series assignment per column.
+
+Possessions come from the player's team pace: team possessions are estimated
+from the team totals (FGA + 0.44 * FTA + TOV - OREB), pace = possessions per
+48 team minutes, and POSS = MIN * pace / 48. Per-100 values therefore differ
+from per-36 values across teams, not only by a constant factor.
+
+Rows whose base is zero (GP == 0, MIN == 0) get NaN, never inf.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Counting stats that get rate columns (order = column order in the output)
+COUNTING_STATS = ['MIN', 'FGM', 'FGA', 'FG3M', 'FG3A', 'FTM', 'FTA', 'PTS',
+                  'OREB', 'DREB', 'REB', 'AST', 'TOV', 'STL', 'BLK', 'PLUS_MINUS']
+
+# suffix -> (base column, scale, stats left out); rate = stat / base * scale
+VARIANTS = {
+    "PG":   ("GP",   1.0,   ()),
+    "P36":  ("MIN",  36.0,  ("MIN",)),
+    "P100": ("POSS", 100.0, ("MIN",)),
+}
+
+# Possessions per 48 minutes when a team pace cannot be estimated (no team column, no minutes)
+LEAGUE_PACE = 99.0
+DECIMALS = 1
+TEAM_COL = "TEAM_ABBREVIATION"
+
+
+def derived_columns(stats=COUNTING_STATS, variants=VARIANTS) -> list:
+    """Names of the columns add_derived() produces, in output order."""
+    return [f"{stat}_{suffix}"
+            for suffix, (_, _, skip) in variants.items()
+            for stat in stats if stat not in skip]
+
+
+def team_pace(df: pd.DataFrame, team_col: str = TEAM_COL) -> np.ndarray:
+    """Per-row pace of the player's team: 48 * possessions / (team minutes / 5).
+
+    Team possessions = sum over its players of FGA + 0.44 * FTA + TOV - OREB.
+    Rows without a team column or whose team logged no minutes get LEAGUE_PACE.
+    """
+    if team_col not in df.columns:
+        return np.full(len(df), LEAGUE_PACE)
+    codes, uniques = pd.factorize(df[team_col])
+    known = codes >= 0  # NaN team -> -1
+    col = lambda c: df[c].to_numpy(dtype=np.float64)
+    poss = col("FGA") + 0.44 * col("FTA") + col("TOV") - col("OREB")
+    # Team sums on the integer codes, then broadcast back to the rows
+    team_poss = np.bincount(codes[known], weights=poss[known], minlength=len(uniques))
+    team_games = np.bincount(codes[known], weights=col("MIN")[known], minlength=len(uniques)) / 5.0 / 48.0
+    team_pace = np.divide(team_poss, team_games, out=np.full(len(uniques), LEAGUE_PACE), where=team_games > 0)
+    pace = np.full(len(df), LEAGUE_PACE)
+    pace[known] = team_pace[codes[known]]
+    return pace
+
+
+def _bases(df: pd.DataFrame, variants, pace) -> np.ndarray:
+    """(n, n_variants) matrix of the denominators (POSS estimated from MIN and pace)."""
+    cols = []
+    for base, _, _ in variants.values():
+        if base == "POSS" and "POSS" not in df.columns:
+            cols.append(df["MIN"].to_numpy(dtype=np.float64) * (np.asarray(pace, dtype=np.float64) / 48.0))
+        else:
+            cols.append(df[base].to_numpy(dtype=np.float64))
+    return np.column_stack(cols) if cols else np.empty((len(df), 0))
+
+
+def rate_block(df: pd.DataFrame, stats=COUNTING_STATS, variants=VARIANTS,
+               pace=None, decimals=DECIMALS) -> np.ndarray:
+    """(n, n_variants, n_stats) array of stat / base * scale, NaN where base == 0."""
+    if pace is None:
+        pace = team_pace(df)
+    # Column by column: df[stats].to_numpy() would first build a (mixed-dtype) sub-frame
+    block = np.column_stack([df[s].to_numpy(dtype=np.float64) for s in stats])  # (n, k)
+    bases = _bases(df, variants, pace)                                  # (n, v)
+    scales = np.array([scale for _, scale, _ in variants.values()])    # (v,)
+    # Divide (not multiply by a reciprocal) so PG matches stat / GP to the last bit
+    rates = np.divide(block[:, None, :], (bases / scales)[:, :, None],
+                      out=np.full((len(df), len(scales), block.shape[1]), np.nan),
+                      where=(bases > 0)[:, :, None])
+    return rates if decimals is None else np.round(rates, decimals, out=rates)
+
+
+def add_derived(df: pd.DataFrame, stats=COUNTING_STATS, variants=VARIANTS,
+                pace=None, decimals=DECIMALS) -> pd.DataFrame:
+    """Return df with every <STAT>_<VARIANT> column, placed after the last counting stat.
+
+    Existing derived columns are replaced, so the stage can be re-run on stored frames.
+    `pace` is a scalar or one value per row; by default the team pace from team_pace().
+    """
+    stats = list(stats)
+    names = derived_columns(stats, variants)
+    rates = rate_block(df, stats, variants, pace, decimals)
+
+    # Drop the skipped (variant, stat) pairs, then flatten to (n, len(names))
+    keep = np.array([[stat not in skip for stat in stats] for _, _, skip in variants.values()]).ravel()
+    values = rates.reshape(len(df), -1)[:, keep]
+
+    # Assemble from a column dict: no drop/concat copies of the whole frame
+    derived = set(names)
+    base_cols = [c for c in df.columns if c not in derived]
+    at = max(base_cols.index(s) for s in stats) + 1
+    columns = {c: df[c] for c in base_cols[:at]}
+    columns.update(zip(names, values.T))
+    columns.update((c, df[c]) for c in base_cols[at:])
+    return pd.DataFrame(columns, index=df.index, copy=False)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Bounded-concurrency fetching with a token-bucket rate limit.
+
+``fetch_all`` runs one call per item on a thread pool. Every attempt takes a
+token from a shared ``TokenBucket`` (so the whole pool respects the API rate)
+and failures are retried with jittered exponential backoff. It returns one
+``FetchResult`` per item, in input order.
+
+The fetch function is injected, so the same code runs against nba_api or a
+local fake endpoint.
+"""
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+log = logging.getLogger("data_processing")
+
+
+# -------------------------------
+# Rate limit
+# -------------------------------
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `capacity` in reserve."""
+
+    def __init__(self, rate: float, capacity: float = 1.0, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available; otherwise return the seconds to wait (nothing taken)."""
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available; returns the total time waited."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return waited
+            self._sleep(wait)
+            waited += wait
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0, rng=random) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+# -------------------------------
+# Concurrent fetch
+# -------------------------------
+@dataclass
+class FetchResult:
+    key: Any
+    label: str
+    ok: bool
+    value: Any = None
+    attempts: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+def _fetch_one(key, label, fn, bucket, retries, base_delay, max_delay, rng, sleep, is_local) -> FetchResult:
+    started = time.perf_counter()
+    error = None
+    for attempt in range(retries):
+        if attempt or not (is_local and is_local(key)):
+            bucket.acquire()
+        try:
+            value = fn(key)
+            return FetchResult(key, label, True, value, attempt + 1, time.perf_counter() - started)
+        except Exception as e:  # network errors, timeouts, bad payloads
+            error = f"{type(e).__name__}: {e}"
+            if attempt + 1 < retries:
+                sleep(backoff_delay(attempt, base_delay, max_delay, rng))
+    return FetchResult(key, label, False, None, retries, time.perf_counter() - started, error)
+
+
+def fetch_all(
+    items,
+    fn: Callable[[Any], Any],
+    max_workers: int = 6,
+    rate: float = 4.0,
+    burst: float = 4.0,
+    retries: int = 4,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    progress: Optional[Callable] = None,
+    rng=None,
+    sleep=time.sleep,
+    is_local: Optional[Callable[[Any], bool]] = None,
+) -> list:
+    """Call fn(key) for every (key, label) in `items`; returns FetchResult list in input order.
+
+    `is_local(key)` -> True marks calls served without the network (e.g. a fresh
+    cache entry); their first attempt does not consume a rate-limit token.
+    """
+    items = list(items)
+    bucket = TokenBucket(rate, burst)
+    rng = rng or random.Random()
+    results = [None] * len(items)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="fetch") as pool:
+        futures = {
+            pool.submit(_fetch_one, key, label, fn, bucket, retries, base_delay, max_delay, rng, sleep, is_local): i
+            for i, (key, label) in enumerate(items)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            results[i] = res = future.result()
+            if res.ok:
+                log.info("  %-28s ok      (%d attempt%s, %.2fs)",
+                         res.label, res.attempts, "s" if res.attempts > 1 else "", res.elapsed)
+            else:
+                log.warning("  %-28s FAILED  (%d attempts, %.2fs) %s",
+                            res.label, res.attempts, res.elapsed, res.error)
+            if progress:
+                progress(done, len(items), res.label)
+    return results
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""Player game logs: append-only ingestion and streaming rolling form.
+
+Game logs (one row per player and game, nba_api PlayerGameLogs) land in the
+``df_game_logs`` partitions (season / season type). Every ingest writes one
+new part holding only the games not stored yet; earlier parts are never
+rewritten. The API is asked for the games since the last stored date.
+
+update_form() then feeds the parts not consumed yet to the rolling engines
+(nba_data.rolling), per player and per team game, and writes:
+    df_player_game_form, df_team_game_form    append-only partitions: 5/10/20-game means as of each game
+    df_player_form, df_team_form              latest form per player / team (small, read by the Team page)
+    df_player_form_state, df_team_form_state  the engines' last 20 games per key, carried between runs
+The consumed parts are recorded in df_game_logs/_form_cursor.json, so a
+batch only costs its own games plus the 20-game tails of the keys that played.
+
+Usage (from the repository root):
+    python -m data_processing.gamelogs                         # games since the last stored one
+    python -m data_processing.gamelogs --season-types all      # regular season and playoffs
+    python -m data_processing.gamelogs --synthetic --days 7    # next 7 game days of the synthetic league
+    python -m data_processing.gamelogs --rebuild-form          # replay every stored part from scratch
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from data_processing import http_cache
+from data_processing.pipeline import SEASON, SEASON_TYPES, add_team_columns
+from nba_data import teams
+from nba_data.rolling import PLAYER_STATS, TEAM_STATS, RollingForm
+from nba_data.store import (SEASON_TYPE_SLUGS, STORE_DIR, append_partition, list_partitions, partition_parts,
+                            read_frame, read_partitions, store_path, write_frame)
+
+log = logging.getLogger("data_processing")
+
+# -------------------------------
+# Config
+# -------------------------------
+GAME_LOGS          = "df_game_logs"
+PLAYER_GAME_FORM   = "df_player_game_form"
+TEAM_GAME_FORM     = "df_team_game_form"
+PLAYER_FORM        = "df_player_form"
+TEAM_FORM          = "df_team_form"
+PLAYER_FORM_STATE  = "df_player_form_state"
+TEAM_FORM_STATE    = "df_team_form_state"
+CURSOR_FILE        = "_form_cursor.json"
+
+GAME_LOG_COLS = ['PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 'GAME_ID', 'GAME_DATE',
+                 'MATCHUP', 'WL', 'MIN', 'FGM', 'FGA', 'FG3M', 'FG3A', 'FTM', 'FTA',
+                 'OREB', 'DREB', 'REB', 'AST', 'TOV', 'STL', 'BLK', 'PTS', 'PLUS_MINUS']
+TEAM_SUM_COLS = ['FGM', 'FGA', 'FG3M', 'FG3A', 'FTM', 'FTA', 'OREB', 'DREB', 'REB',
+                 'AST', 'TOV', 'STL', 'BLK', 'PTS', 'PLUS_MINUS']
+
+PLAYER_KEYS   = ["SEASON", "SEASON_TYPE", "PLAYER_ID"]
+PLAYER_LABELS = ["PLAYER_NAME", "TM", "TEAM"]
+TEAM_KEYS     = ["SEASON", "SEASON_TYPE", "TM"]
+TEAM_LABELS   = ["TEAM", "MATCHUP"]
+
+
+# -------------------------------
+# Fetch + clean
+# -------------------------------
+def fetch_game_logs_payload(season: str = SEASON, season_type: str = "Regular Season", date_from=None):
+    """(game logs frame, sha256 of the API payload), games on or after `date_from` only when given."""
+    from nba_api.stats.endpoints import playergamelogs
+
+    ep = http_cache.call(
+        playergamelogs.PlayerGameLogs,
+        season_nullable=season,
+        season_type_nullable=season_type,
+        date_from_nullable=pd.Timestamp(date_from).strftime("%m/%d/%Y") if date_from is not None else "",
+    )
+    return clean_game_logs(ep.get_data_frames()[0]), ep.cached_response.sha256
+
+
+def clean_game_logs(df: pd.DataFrame) -> pd.DataFrame:
+    """NBA teams only, GAME_LOG_COLS, TM / TEAM after PLAYER_NAME, typed and in game order."""
+    df = df[teams.is_known(df["TEAM_ABBREVIATION"])]
+    df = df[(df["PLAYER_NAME"].notna()) & (df["PLAYER_NAME"] != "None")]
+    return order_game_logs(add_team_columns(df[GAME_LOG_COLS].copy()))
+
+
+def order_game_logs(df: pd.DataFrame) -> pd.DataFrame:
+    """GAME_ID as text, GAME_DATE as a date, integer box score, sorted by date, game and player."""
+    df["GAME_ID"] = df["GAME_ID"].astype(str)
+    df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"]).dt.normalize()
+    df[TEAM_SUM_COLS] = df[TEAM_SUM_COLS].fillna(0).astype("int64")
+    df["MIN"] = df["MIN"].fillna(0).astype("float64")
+    return df.sort_values(["GAME_DATE", "GAME_ID", "PLAYER_ID"], kind="stable").reset_index(drop=True)
+
+
+def team_games(logs: pd.DataFrame) -> pd.DataFrame:
+    """One row per team and game: summed box score, margin as PLUS_MINUS, W = 1 for a win."""
+    keys = [c for c in ("SEASON", "SEASON_TYPE") if c in logs.columns] + ["TM", "TEAM", "GAME_ID", "GAME_DATE"]
+    df = logs.groupby(keys, observed=True, sort=False).agg(
+        {"MATCHUP": "first", "WL": "first", **{c: "sum" for c in TEAM_SUM_COLS}}).reset_index()
+    df["PLUS_MINUS"] = (df["PLUS_MINUS"] / 5).round().astype("int64")  # five players on the floor
+    df["W"] = (df["WL"] == "W").astype("int64")
+    return df
+
+
+# -------------------------------
+# Append-only store
+# -------------------------------
+def stored_games(season: str, season_type: str, columns=None, store_dir=None) -> pd.DataFrame:
+    return read_partitions(GAME_LOGS, [season], [season_type], columns, store_dir)
+
+
+def last_game_date(season: str, season_type: str, store_dir=None):
+    """Date of the latest stored game (None when the partition is empty)."""
+    dates = stored_games(season, season_type, ["GAME_DATE"], store_dir)["GAME_DATE"]
+    return None if dates.empty else pd.Timestamp(dates.max())
+
+
+def append_game_logs(df: pd.DataFrame, season: str, season_type: str, store_dir=None) -> pd.DataFrame:
+    """Append the (GAME_ID, PLAYER_ID) lines not stored yet as a new part; returns them."""
+    df = df.drop_duplicates(["GAME_ID", "PLAYER_ID"])
+    stored = stored_games(season, season_type, ["GAME_ID", "PLAYER_ID"], store_dir)
+    if len(stored):
+        seen = pd.MultiIndex.from_frame(stored[["GAME_ID", "PLAYER_ID"]])
+        df = df[~pd.MultiIndex.from_frame(df[["GAME_ID", "PLAYER_ID"]]).isin(seen)]
+    if df.empty:
+        log.info("  %s %s: no new game", season, season_type)
+        return df
+    path = append_partition(df, GAME_LOGS, season, season_type, store_dir)
+    log.info("  %s %s: %d lines, %d games -> %s", season, season_type, len(df), df["GAME_ID"].nunique(), path)
+    return df
+
+
+# -------------------------------
+# Rolling form
+# -------------------------------
+def _cursor_path(store_dir=None) -> Path:
+    return Path(store_dir or STORE_DIR) / GAME_LOGS / CURSOR_FILE
+
+
+def _read_optional(name: str, store_dir=None):
+    return read_frame(name, store_dir=store_dir) if store_path(name, store_dir).exists() else None
+
+
+def load_engines(store_dir=None, fresh: bool = False) -> tuple:
+    """(player engine, team engine) resumed from their stored state, or empty."""
+    def engine(keys, stats, labels, state, form):
+        if fresh:
+            return RollingForm(keys, stats, labels=labels)
+        return RollingForm(keys, stats, labels=labels, state=_read_optional(state, store_dir),
+                           form=_read_optional(form, store_dir))
+    return (engine(PLAYER_KEYS, PLAYER_STATS, PLAYER_LABELS, PLAYER_FORM_STATE, PLAYER_FORM),
+            engine(TEAM_KEYS, TEAM_STATS, TEAM_LABELS, TEAM_FORM_STATE, TEAM_FORM))
+
+
+def _append_by_partition(df: pd.DataFrame, name: str, store_dir=None):
+    for (season, season_type), part in df.groupby(["SEASON", "SEASON_TYPE"], sort=False):
+        append_partition(part, name, season, season_type, store_dir)
+
+
+def update_form(store_dir=None, rebuild: bool = False) -> dict:
+    """Feed the game-log parts not consumed yet to the rolling engines; returns {output: rows written}.
+
+    rebuild=True drops the form outputs and replays every stored part.
+    """
+    cursor_path = _cursor_path(store_dir)
+    cursor = {} if rebuild or not cursor_path.exists() else json.loads(cursor_path.read_text(encoding="utf-8"))
+    if rebuild:
+        for name in (PLAYER_GAME_FORM, TEAM_GAME_FORM):
+            shutil.rmtree(Path(store_dir or STORE_DIR) / name, ignore_errors=True)
+
+    batches = []
+    for season, season_type in sorted({p[:2] for p in list_partitions(GAME_LOGS, store_dir=store_dir)}):
+        key = f"{season}/{SEASON_TYPE_SLUGS[season_type]}"
+        parts = partition_parts(GAME_LOGS, season, season_type, store_dir)
+        for path in parts[cursor.get(key, 0):]:
+            df = pd.read_parquet(path, engine="pyarrow")
+            df.insert(0, "SEASON_TYPE", season_type)
+            df.insert(0, "SEASON", season)
+            batches.append(df)
+        cursor[key] = len(parts)
+    if not batches:
+        log.info("Rolling form up to date")
+        return {}
+
+    logs = pd.concat(batches, ignore_index=True).sort_values(["GAME_DATE", "GAME_ID"], kind="stable")
+    players, teams_engine = load_engines(store_dir, fresh=rebuild)
+    per_player = players.update(logs)
+    per_team = teams_engine.update(team_games(logs))
+
+    _append_by_partition(per_player, PLAYER_GAME_FORM, store_dir)
+    _append_by_partition(per_team, TEAM_GAME_FORM, store_dir)
+    write_frame(players.form, PLAYER_FORM, store_dir)
+    write_frame(teams_engine.form, TEAM_FORM, store_dir)
+    write_frame(players.state, PLAYER_FORM_STATE, store_dir)
+    write_frame(teams_engine.state, TEAM_FORM_STATE, store_dir)
+    # Written last: a run interrupted before this point is replayed by the next one
+    cursor_path.write_text(json.dumps(cursor, indent=1, sort_keys=True), encoding="utf-8")
+
+    log.info("Rolling form: %d player games, %d team games (%d players, %d teams in form)",
+             len(per_player), len(per_team), len(players.form), len(teams_engine.form))
+    return {PLAYER_GAME_FORM: len(per_player), TEAM_GAME_FORM: len(per_team)}
+
+
+# -------------------------------
+# Ingest
+# -------------------------------
+def ingest(season: str = SEASON, season_types=("Regular Season",), store_dir=None) -> dict:
+    """Fetch the games since the last stored one, append them, update the rolling form."""
+    for season_type in season_types:
+        since = last_game_date(season, season_type, store_dir)
+        log.info("Fetching %s game logs (%s) since %s", season_type, season,
+                 "the start" if since is None else since.date())
+        df, _ = fetch_game_logs_payload(season, season_type, since)
+        append_game_logs(df, season, season_type, store_dir)
+    return update_form(store_dir)
+
+
+def replay_synthetic(store_dir=None, days: int = None, config=None) -> dict:
+    """Append the next `days` game days (all remaining when None) of the synthetic league's current season.
+
+    The league is the one the store was generated from (its _league.json), else
+    `config`, else the default one; games are drawn from the current season's
+    stored players, so the earlier seasons are not regenerated.
+    """
+    from data_processing import synthetic
+
+    config = synthetic.load_config(store_dir) or config or synthetic.LeagueConfig()
+    logs = synthetic.game_logs(config, synthetic.stored_season(config, store_dir))
+    since = last_game_date(config.current, "Regular Season", store_dir)
+    if since is not None:
+        logs = logs[logs["GAME_DATE"] > since]
+    if days is not None:
+        logs = logs[logs["GAME_DATE"].isin(logs["GAME_DATE"].drop_duplicates().head(days))]
+    append_game_logs(logs, config.current, "Regular Season", store_dir)
+    return update_form(store_dir)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m data_processing.gamelogs",
+        description="Append new player game logs to the store and update the rolling 5/10/20-game form.",
+    )
+    parser.add_argument("--season", default=SEASON, help="default: %(default)s")
+    parser.add_argument("--season-types", choices=("regular", "playoffs", "all"), default="regular",
+                        help="default: %(default)s")
+    parser.add_argument("--store", type=Path, default=None,
+                        help="store directory (default: NBA_STORE_DIR or data/store)")
+    parser.add_argument("--offline", action="store_true", help="serve API calls from .cache/nba_api only")
+    parser.add_argument("--rebuild-form", action="store_true",
+                        help="only rebuild the rolling form from every stored part")
+    synth = parser.add_argument_group(
+        "synthetic feed (league of a store written by python -m data_processing.synthetic; the flags below "
+        "only apply to a store without _league.json)")
+    synth.add_argument("--synthetic", action="store_true", help="replay the synthetic league instead of the API")
+    synth.add_argument("--days", type=int, default=None, help="game days to append (default: all remaining)")
+    synth.add_argument("--teams", type=int, default=30, help="default: %(default)s")
+    synth.add_argument("--players-per-team", type=int, default=18, help="default: %(default)s")
+    synth.add_argument("--seed", type=int, default=0, help="default: %(default)s")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-7s %(message)s", datefmt="%H:%M:%S")
+    season_types = {"regular": ("Regular Season",), "playoffs": ("Playoffs",), "all": SEASON_TYPES}
+    try:
+        if args.rebuild_form:
+            update_form(args.store, rebuild=True)
+        elif args.synthetic:
+            from data_processing.synthetic import LeagueConfig
+
+            config = LeagueConfig(seasons=(args.season,), teams=args.teams, players_per_team=args.players_per_team,
+                                  seed=args.seed)
+            replay_synthetic(args.store, args.days, config)
+        else:
+            http_cache.configure(mode="offline" if args.offline else None)
+            ingest(args.season, season_types[args.season_types], args.store)
+    except KeyboardInterrupt:
+        log.error("Interrupted")
+        return 130
+    except Exception:
+        log.exception("Game log ingestion failed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
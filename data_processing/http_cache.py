@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""On-disk response cache for nba_api endpoint calls.
+
+Entries are keyed by sha256(endpoint + sorted parameters), so a given
+season / season type / team id always maps to the same file under
+``.cache/nba_api/``. Each entry keeps the raw JSON body, its sha256, the
+fetch time and the ETag / Last-Modified validators sent by the server.
+
+Modes:
+    default  fresh entries (younger than ttl) are served from disk; stale ones
+             are revalidated with If-None-Match / If-Modified-Since when the
+             server sent validators, otherwise fetched again
+    refresh  always revalidate / refetch (the cache is still written)
+    offline  never touch the network; a miss raises CacheMiss
+    off      bypass the cache entirely
+
+Usage:
+    ep = http_cache.call(leaguedashplayerstats.LeagueDashPlayerStats, season="2024-25")
+    df = ep.get_data_frames()[0]
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from nba_data.store import ROOT_DIR
+
+log = logging.getLogger("data_processing")
+
+MODES = ("default", "refresh", "offline", "off")
+
+DEFAULT_DIR  = Path(os.environ.get("NBA_API_CACHE_DIR", ROOT_DIR / ".cache" / "nba_api"))
+DEFAULT_TTL  = float(os.environ.get("NBA_API_CACHE_TTL", 12 * 3600))
+DEFAULT_MODE = os.environ.get("NBA_API_CACHE_MODE", "default")
+
+
+class CacheMiss(KeyError):
+    """Raised in offline mode when a request has never been cached."""
+
+
+@dataclass
+class CachedResponse:
+    key: str
+    endpoint: str
+    parameters: dict
+    body: str
+    sha256: str
+    fetched_at: float
+    status_code: int = 200
+    url: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    from_cache: bool = False
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self.fetched_at
+
+
+def request_key(endpoint: str, parameters: dict) -> str:
+    """Content address of a request: sha256 of the endpoint and its sorted parameters."""
+    canonical = json.dumps(
+        {"endpoint": endpoint.lower(),
+         "parameters": {k: "" if v is None else str(v) for k, v in sorted(parameters.items())}},
+        sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _send(endpoint: str, parameters: dict, extra_headers: dict, timeout=None, headers=None, proxy=None):
+    """GET through nba_api's session/base_url (so a local fake server can be swapped in)."""
+    from nba_api.stats.library.http import NBAStatsHTTP
+
+    http = NBAStatsHTTP()
+    request_headers = dict(headers if headers is not None else http.headers)
+    request_headers.update(extra_headers)
+    proxies = {"http": proxy, "https": proxy} if proxy else None
+    return http.get_session().get(
+        url=http.base_url.format(endpoint=endpoint),
+        params=sorted(parameters.items(), key=lambda kv: kv[0]),
+        headers=request_headers,
+        proxies=proxies,
+        timeout=timeout,
+    )
+
+
+class ResponseCache:
+    def __init__(self, cache_dir=DEFAULT_DIR, ttl: float = DEFAULT_TTL, mode: str = DEFAULT_MODE, sender=_send):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.cache_dir = Path(cache_dir)
+        self.ttl = float(ttl)
+        self.mode = mode
+        self._send = sender
+        self._lock = threading.Lock()
+        self.stats = {"hit": 0, "revalidated": 0, "miss": 0}
+
+    # -------------------------------
+    # Disk entries
+    # -------------------------------
+    def path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, endpoint: str, parameters: dict) -> Optional[CachedResponse]:
+        key = request_key(endpoint, parameters)
+        path = self.path(key)
+        if not path.exists():
+            return None
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            log.warning("Ignoring unreadable cache entry %s", path)
+            return None
+        return CachedResponse(from_cache=True, **entry)
+
+    def put(self, response: CachedResponse):
+        path = self.path(response.key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {k: v for k, v in response.__dict__.items() if k != "from_cache"}
+        # Atomic write: concurrent roster workers never see a half-written file
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def _count(self, what: str):
+        with self._lock:
+            self.stats[what] += 1
+
+    # -------------------------------
+    # Lookup + fetch
+    # -------------------------------
+    def is_fresh(self, endpoint: str, parameters: dict) -> bool:
+        """True when fetch() would answer without any network call."""
+        if self.mode == "offline":
+            return True
+        if self.mode != "default":
+            return False
+        cached = self.get(endpoint, parameters)
+        return cached is not None and cached.age() < self.ttl
+
+    def fetch(self, endpoint: str, parameters: dict, timeout=None, headers=None, proxy=None) -> CachedResponse:
+        key = request_key(endpoint, parameters)
+        cached = None if self.mode == "off" else self.get(endpoint, parameters)
+
+        if self.mode == "offline":
+            if cached is None:
+                raise CacheMiss(f"{endpoint} {parameters} is not in the offline cache ({self.cache_dir})")
+            self._count("hit")
+            return cached
+
+        if cached is not None and self.mode == "default" and cached.age() < self.ttl:
+            self._count("hit")
+            return cached
+
+        validators = {}
+        if cached is not None:
+            if cached.etag:
+                validators["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                validators["If-Modified-Since"] = cached.last_modified
+
+        resp = self._send(endpoint, parameters, validators, timeout=timeout, headers=headers, proxy=proxy)
+
+        if resp.status_code == 304 and cached is not None:
+            self._count("revalidated")
+            cached.fetched_at = time.time()
+            self.put(cached)
+            return cached
+
+        resp.raise_for_status()
+        body = resp.text
+        json.loads(body)  # never cache an error page
+        self._count("miss")
+        response = CachedResponse(
+            key=key,
+            endpoint=endpoint,
+            parameters={k: v for k, v in parameters.items()},
+            body=body,
+            sha256=_sha256(body),
+            fetched_at=time.time(),
+            status_code=resp.status_code,
+            url=getattr(resp, "url", None),
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+        if self.mode != "off":
+            self.put(response)
+        return response
+
+
+# -------------------------------
+# Process-wide cache + nba_api glue
+# -------------------------------
+_cache = ResponseCache()
+
+
+def configure(cache_dir=None, ttl: Optional[float] = None, mode: Optional[str] = None) -> ResponseCache:
+    """Replace the process-wide cache (used by the CLI flags)."""
+    global _cache
+    _cache = ResponseCache(
+        cache_dir=cache_dir or _cache.cache_dir,
+        ttl=_cache.ttl if ttl is None else ttl,
+        mode=mode or _cache.mode,
+    )
+    return _cache
+
+
+def get_cache() -> ResponseCache:
+    return _cache
+
+
+def would_hit(endpoint_cls, cache: Optional[ResponseCache] = None, **kwargs) -> bool:
+    """True when call(endpoint_cls, **kwargs) would be served from disk."""
+    ep = endpoint_cls(get_request=False, **kwargs)
+    return (cache or _cache).is_fresh(ep.endpoint, ep.parameters)
+
+
+def call(endpoint_cls, cache: Optional[ResponseCache] = None, **kwargs):
+    """Instantiate an nba_api endpoint and load its response through the cache."""
+    from nba_api.stats.library.http import NBAStatsResponse
+
+    cache = cache or _cache
+    ep = endpoint_cls(get_request=False, **kwargs)
+    cached = cache.fetch(ep.endpoint, ep.parameters, timeout=ep.timeout,
+                         headers=getattr(ep, "headers", None), proxy=ep.proxy)
+    ep.nba_response = NBAStatsResponse(response=cached.body, status_code=cached.status_code, url=cached.url)
+    ep.load_response()
+    ep.cached_response = cached
+    return ep
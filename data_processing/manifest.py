@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Build manifest for incremental refreshes.
+
+Every output of the pipeline is recorded with a fingerprint of its upstream
+inputs (API payload sha256, excel_source file hashes, PIPELINE_VERSION). On
+the next run an output whose fingerprint is unchanged, and whose files still
+exist, is skipped instead of being rebuilt and rewritten.
+
+The manifest lives next to the data it describes: ``data/store/_manifest.json``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from nba_data.store import ROOT_DIR, STORE_DIR
+
+log = logging.getLogger("data_processing")
+
+MANIFEST_PATH = STORE_DIR / "_manifest.json"
+
+
+def fingerprint(*parts) -> str:
+    """sha256 over the given input fingerprints (order matters)."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def frame_hash(df: pd.DataFrame) -> str:
+    """Content hash of a frame (columns + values, index ignored)."""
+    h = hashlib.sha256(",".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def _rel(path) -> str:
+    """Repo-relative path when possible, so the manifest survives a checkout move."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(ROOT_DIR).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class Manifest:
+    def __init__(self, path=MANIFEST_PATH, outputs=None, files=None):
+        self.path = Path(path)
+        self.outputs = outputs or {}  # key -> {"fingerprint", "paths", "built_at"}
+        self.files = files or {}      # source path -> {"mtime_ns", "size", "sha256"}
+        self.rebuilt = []
+        self.skipped = []
+
+    @classmethod
+    def load(cls, path=MANIFEST_PATH) -> "Manifest":
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            log.warning("Ignoring unreadable manifest %s, doing a full rebuild", path)
+            return cls(path)
+        return cls(path, data.get("outputs"), data.get("files"))
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"outputs": self.outputs, "files": self.files}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    # -------------------------------
+    # Inputs
+    # -------------------------------
+    def file_fingerprint(self, path) -> str:
+        """sha256 of a source file; rehashed only when its mtime or size moved."""
+        path = Path(path)
+        stat = path.stat()
+        key = _rel(path)
+        known = self.files.get(key)
+        if known and known["mtime_ns"] == stat.st_mtime_ns and known["size"] == stat.st_size:
+            return known["sha256"]
+        sha = _sha256_file(path)
+        self.files[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha}
+        return sha
+
+    # -------------------------------
+    # Outputs
+    # -------------------------------
+    def is_current(self, key: str, fp: str, paths) -> bool:
+        """True when `key` was built from the same inputs and all its files still exist."""
+        entry = self.outputs.get(key)
+        return (entry is not None and entry["fingerprint"] == fp
+                and all(Path(p).exists() for p in paths))
+
+    def check(self, key: str, fp: str, paths, force: bool = False) -> bool:
+        """is_current() + bookkeeping; logs and returns True when `key` can be skipped."""
+        if not force and self.is_current(key, fp, paths):
+            self.skipped.append(key)
+            log.info("  %-44s unchanged, skipped", key)
+            return True
+        self.rebuilt.append(key)
+        return False
+
+    def record(self, key: str, fp: str, paths):
+        self.outputs[key] = {
+            "fingerprint": fp,
+            "paths": [_rel(p) for p in paths],
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
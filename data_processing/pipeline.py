@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+"""Headless processing pipeline: fetch -> positions merge -> filter -> export.
+
+Plain Python stages with no UI dependency. They are used by the command line
+entry point (``python -m data_processing``) and by the Streamlit preview
+scripts (processing.py, processing_v2.py, processing_v3.py).
+
+Any range of seasons can be ingested: every (season, season type) lands in its
+own partition of ``df_players`` / ``df_players_filtered``. The current season
+is also written to the flat df_* datasets the pages read.
+
+Refreshes are incremental: outputs whose inputs (API payload sha256,
+excel_source file hash) did not change since the last run are skipped, see
+manifest.py. ``force=True`` rebuilds everything.
+"""
+
+import logging
+import time
+
+import pandas as pd
+
+from data_processing import http_cache
+from data_processing.derive import add_derived
+from data_processing.fetch import fetch_all
+from data_processing.manifest import Manifest, fingerprint, frame_hash
+from nba_data import teams
+from nba_data.store import (ROOT_DIR, SEASON_TYPE_SLUGS, excel_path, list_partitions, partition_path, read_frame,
+                            read_partitions, store_path, write_frames, write_partition)
+
+log = logging.getLogger("data_processing")
+
+# -------------------------------
+# Config
+# -------------------------------
+SEASON     = "2024-25"
+SOURCE_DIR = ROOT_DIR / "excel_source"
+
+# Part of every output fingerprint: bump it when a stage's logic changes
+PIPELINE_VERSION = "5"
+
+# Roster calls: concurrent workers and shared rate limit (calls per second)
+ROSTER_WORKERS = 6
+ROSTER_RATE    = 4.0
+
+PLAYER_COLS = ['PLAYER_ID', 'PLAYER_NAME', 'NICKNAME', 'TEAM_ABBREVIATION',
+               'AGE', 'GP', 'W', 'L', 'W_PCT', 'MIN', 'FGM', 'FGA',
+               'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA',
+               'FT_PCT', 'PTS', 'OREB', 'DREB', 'REB', 'AST', 'TOV',
+               'STL', 'BLK', 'PLUS_MINUS']
+
+POSITION_MAP = {
+    "G":   "Guard",
+    "F":   "Forward",
+    "C":   "Center",
+    "G-F": "Guard",          # chosen rule
+    "F-G": "Small Forward",  # chosen rule
+    "F-C": "Power Forward",
+    "C-F": "Center",
+}
+
+PLAYER_DATASETS = {
+    "Regular Season": "df_reg_season_players",
+    "Playoffs": "df_playoff_players",
+}
+FILTERED_DATASETS = {
+    "df_reg_season_players": "df_reg_season_players_filtered",
+    "df_playoff_players": "df_playoff_players_filtered",
+}
+SEASON_TYPES = tuple(PLAYER_DATASETS)
+
+# Partitioned multi-season datasets (season / season type)
+PLAYER_HISTORY          = "df_players"
+PLAYER_HISTORY_FILTERED = "df_players_filtered"
+
+
+def _no_progress(done: int, total: int, label: str = ""):
+    pass
+
+
+def season_range(first: str, last: str) -> list:
+    """'2015-16', '2017-18' -> ['2015-16', '2016-17', '2017-18']."""
+    start, end = int(first[:4]), int(last[:4])
+    if end < start:
+        raise ValueError(f"Empty season range {first}:{last}")
+    return [f"{year}-{(year + 1) % 100:02d}" for year in range(start, end + 1)]
+
+
+def parse_seasons(spec: str) -> list:
+    """'2015-16:2024-25' (inclusive range) or '2019-20,2024-25' (list) -> season list."""
+    seasons = []
+    for part in spec.split(","):
+        part = part.strip()
+        if ":" in part:
+            seasons.extend(season_range(*part.split(":", 1)))
+        elif part:
+            season_range(part, part)  # validates the format
+            seasons.append(part)
+    return sorted(set(seasons))
+
+
+# -------------------------------
+# Stage 1: fetch player stats + Excel sources
+# -------------------------------
+def fetch_players_payload(season: str = SEASON, season_type: str = "Regular Season"):
+    """(players frame, sha256 of the API payload) for one season / season type."""
+    from nba_api.stats.endpoints import leaguedashplayerstats
+
+    ep = http_cache.call(
+        leaguedashplayerstats.LeagueDashPlayerStats,
+        season=season,
+        season_type_all_star=season_type
+    )
+    df = ep.get_data_frames()[0]
+
+    # Keep only NBA players (any franchise, current or historical) with valid names
+    df = df[teams.is_known(df["TEAM_ABBREVIATION"])]
+    df = df[(df["PLAYER_NAME"].notna()) & (df["PLAYER_NAME"] != "None")]
+    return df[PLAYER_COLS].reset_index(drop=True), ep.cached_response.sha256
+
+
+def fetch_players(season: str = SEASON, season_type: str = "Regular Season") -> pd.DataFrame:
+    """LeagueDashPlayerStats totals, NBA teams only, with PLAYER_COLS."""
+    return fetch_players_payload(season, season_type)[0]
+
+
+def add_team_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Insert TEAM (full name) and TM (canonical abbreviation) after PLAYER_NAME."""
+    team = teams.resolve(df["TEAM_ABBREVIATION"])
+    df = df.drop(columns=["TM", "TEAM"], errors="ignore")
+    df.insert(2, "TEAM", team["TEAM"].fillna(teams.UNKNOWN))
+    df.insert(2, "TM", team["TM"].fillna(teams.UNKNOWN))
+    return df
+
+
+def build_player_frames(season: str = SEASON, season_types=SEASON_TYPES) -> dict:
+    """{season type: player frame} for one season."""
+    frames = {}
+    for season_type in season_types:
+        log.info("Fetching %s player stats (%s)", season_type, season)
+        df = fetch_players(season, season_type)
+        frames[season_type] = add_team_columns(add_derived(df))
+        log.info("  %s %s: %d players", season, season_type, len(frames[season_type]))
+    return frames
+
+
+def read_player_frames(season: str = SEASON, season_types=SEASON_TYPES) -> dict:
+    """{season type: player frame} from the store (partition first, flat file for the current season)."""
+    frames = {}
+    for season_type in season_types:
+        if list_partitions(PLAYER_HISTORY, [season], [season_type]):
+            df = read_partitions(PLAYER_HISTORY, [season], [season_type])
+            frames[season_type] = df.drop(columns=["SEASON", "SEASON_TYPE"])
+        elif season == SEASON:
+            frames[season_type] = read_frame(PLAYER_DATASETS[season_type])
+        else:
+            raise FileNotFoundError(f"No stored {season_type} players for {season}; run without --from-store")
+    return frames
+
+
+def _upper_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Rename columns (replace spaces with _ and uppercase)."""
+    df.columns = [col.replace(" ", "_").upper() for col in df.columns]
+    return df
+
+
+def clean_standing(df: pd.DataFrame, conf_col: str) -> pd.DataFrame:
+    df = _upper_columns(df)
+    # Playoff team flag (* in the team name), then remove the *
+    df.insert(1, "PLAYOFF_TEAM", df[conf_col].astype(str).str.contains("*", regex=False))
+    df[conf_col] = df[conf_col].str.replace("*", "", regex=False)
+    df = df.rename(columns={conf_col: "TEAM"})
+    df.insert(1, "TM", teams.abbreviation(df["TEAM"]))
+    return df
+
+
+def clean_team_stats(df: pd.DataFrame, keep=None) -> pd.DataFrame:
+    if keep is not None:
+        df = df[keep]
+    # Re-indexing: the rank column was only used as index and is never exported
+    df = _upper_columns(df.drop(columns="Rk")).rename(columns={"TM": "TEAM"})
+    df.insert(1, "TM", teams.abbreviation(df["TEAM"]))  # 'League Average' -> Unknown
+    return df
+
+
+def parse_salaries(s: pd.Series) -> pd.Series:
+    """'$59,606,817' -> 59606817 as Int64, <NA> when there is no contract that season."""
+    digits = s.astype("string").str.replace(r"[^0-9]", "", regex=True)
+    return pd.to_numeric(digits.replace("", pd.NA)).astype("Int64")
+
+
+def clean_salaries(df: pd.DataFrame) -> pd.DataFrame:
+    df = _upper_columns(df.drop(columns="Rk"))
+    team = teams.resolve(df["TM"])
+    df["TM"] = team["TM"].fillna(df["TM"])  # PHO / BRK / CHO -> PHX / BKN / CHA
+    df.insert(1, "TEAM", team["TEAM"].fillna(teams.UNKNOWN))
+    # Amounts parsed once here: the store holds integers, not '$…' strings
+    money = [c for c in df.columns if c not in ("PLAYER", "TEAM", "TM")]
+    df[money] = df[money].apply(parse_salaries)
+    return df
+
+
+def clean_champions(df: pd.DataFrame) -> pd.DataFrame:
+    df = _upper_columns(df.drop(columns="Unnamed: 5", errors="ignore"))
+    df.insert(4, "TM_CHAMP", teams.abbreviation(df["CHAMPION"]))
+    df.insert(5, "TM_RUNNER_UP", teams.abbreviation(df["RUNNER-UP"]))
+    return df
+
+
+# dataset -> (excel_source workbook, cleaning step)
+SOURCES = {
+    "df_western_conf_standing": (
+        "western_conf_standing.xlsx", lambda df: clean_standing(df, "WESTERN_CONFERENCE")),
+    "df_eastern_conf_standing": (
+        "eastern_conf_standing.xlsx", lambda df: clean_standing(df, "EASTERN_CONFERENCE")),
+    "df_nba_team_playoff_stats_pg": (
+        "nba_team_playoff_stats_pg.xlsx", clean_team_stats),
+    "df_nba_team_playoff_advanced_stats": (
+        "nba_team_playoff_advanced_stats.xlsx",
+        lambda df: clean_team_stats(df, ['Rk', 'Tm', 'Age', 'W', 'L', 'W/L%', 'ORtg', 'DRtg', 'NRtg',
+                                         'Pace', 'TS%', 'eFG%'])),
+    "df_nba_players_salaries": (
+        "nba_players_salaries.xlsx", clean_salaries),
+    "df_nba_team_reg_season_ratings": (
+        "nba_team_reg_season_ratings.xlsx",
+        lambda df: clean_team_stats(df, ['Rk', 'Team', 'Conf', 'Div', 'W', 'L', 'W/L%', 'ORtg', 'DRtg', 'NRtg'])),
+    "df_nba_champion": (
+        "nba_champion.xlsx", clean_champions),
+}
+
+
+def build_source_frames(source_dir=SOURCE_DIR, names=None) -> dict:
+    """Clean the excel_source/*.xlsx workbooks (standings, team stats, salaries, champions).
+
+    `names` restricts the build to some datasets; the others are not even read.
+    """
+    frames = {}
+    for name, (filename, clean) in SOURCES.items():
+        if names is not None and name not in names:
+            continue
+        log.info("Reading %s", source_dir / filename)
+        frames[name] = clean(pd.read_excel(source_dir / filename))
+    return frames
+
+
+# -------------------------------
+# Stage 2: roster positions
+# -------------------------------
+def fetch_roster(team_id: int, season: str = SEASON, timeout: int = 90) -> pd.DataFrame:
+    """One CommonTeamRoster call -> PLAYER_ID, PLAYER, POSITION."""
+    from nba_api.stats.endpoints import commonteamroster
+
+    roster = http_cache.call(
+        commonteamroster.CommonTeamRoster,
+        team_id=team_id, season=season, timeout=timeout
+    ).get_data_frames()[0]
+    return roster[["PLAYER_ID", "PLAYER", "POSITION"]]
+
+
+def fetch_positions(season: str = SEASON, progress=_no_progress, retries: int = 4,
+                    max_workers: int = ROSTER_WORKERS, rate: float = ROSTER_RATE,
+                    fetch_fn=None, team_list=None):
+    """Rosters for every team -> (one row per PLAYER_ID with POSITION, failed team names).
+
+    Calls run concurrently under a shared token bucket (`rate` calls/s) with
+    jittered exponential backoff; `fetch_fn(team_id)` and `team_list` can be
+    swapped for a local fake endpoint.
+    """
+    if team_list is None:
+        from nba_api.stats.static import teams
+        team_list = teams.get_teams()
+    is_local = None
+    if fetch_fn is None:
+        from nba_api.stats.endpoints import commonteamroster
+        fetch_fn = lambda team_id: fetch_roster(team_id, season)
+        # Cached rosters are served from disk and do not count against the rate limit
+        is_local = lambda team_id: http_cache.would_hit(
+            commonteamroster.CommonTeamRoster, team_id=team_id, season=season)
+
+    items = [(t["id"], t.get("full_name", t.get("abbreviation", str(t["id"])))) for t in team_list]
+    results = fetch_all(items, fetch_fn, max_workers=max_workers, rate=rate, burst=max_workers,
+                        retries=retries, progress=progress, is_local=is_local)
+
+    pos_frames = [r.value for r in results if r.ok]
+    failed = [r.label for r in results if not r.ok]
+
+    if not pos_frames:
+        raise RuntimeError("No roster data fetched after retries. Try again in a minute.")
+
+    df_positions = (
+        pd.concat(pos_frames, ignore_index=True)[["PLAYER_ID", "POSITION"]]
+        .dropna(subset=["PLAYER_ID"])
+        .drop_duplicates(subset=["PLAYER_ID"], keep="last")
+    )
+    return df_positions, failed
+
+
+def merge_positions(df: pd.DataFrame, df_positions: pd.DataFrame) -> pd.DataFrame:
+    """Left join the roster position as POS (raw) and POSITION (friendly label)."""
+    df = df.drop(columns=["POS", "POSITION"], errors="ignore")
+    df = df.merge(
+        df_positions.rename(columns={"POSITION": "POS"}),
+        how="left", on="PLAYER_ID", validate="m:1"
+    )
+    df["POSITION"] = df["POS"].map(POSITION_MAP).fillna("Unknown")
+    return df
+
+
+# -------------------------------
+# Stage 3: filter
+# -------------------------------
+def clean_players(df: pd.DataFrame) -> pd.DataFrame:
+    # Drop unknown positions
+    if "POSITION" in df.columns:
+        df = df[df["POSITION"] != "Unknown"]
+
+    # Drop players with <= 5 minutes per game
+    if "MIN_PG" in df.columns:
+        df = df[df["MIN_PG"] > 5]
+
+    return df
+
+
+def filter_frames(frames: dict) -> dict:
+    """{filtered dataset name: cleaned frame} for the player frames present in `frames`."""
+    return {FILTERED_DATASETS[name]: clean_players(df)
+            for name, df in frames.items() if name in FILTERED_DATASETS}
+
+
+# -------------------------------
+# Stage 4: export
+# -------------------------------
+def export(frames: dict, excel: bool = False) -> list:
+    """Write frames to the Parquet store (+ data/*.xlsx when excel=True)."""
+    paths = write_frames(frames, excel=excel)
+    for path in paths:
+        log.info("Exported: %s", path)
+    return paths
+
+
+# -------------------------------
+# Full run
+# -------------------------------
+def _player_outputs(season: str, season_type: str, current: bool, excel: bool) -> list:
+    paths = [partition_path(PLAYER_HISTORY, season, season_type),
+             partition_path(PLAYER_HISTORY_FILTERED, season, season_type)]
+    if current:
+        names = [PLAYER_DATASETS[season_type], FILTERED_DATASETS[PLAYER_DATASETS[season_type]]]
+        paths += [store_path(n) for n in names] + ([excel_path(n) for n in names] if excel else [])
+    return paths
+
+
+def run_season(season: str, season_types=SEASON_TYPES, fetch: bool = True, positions: bool = True,
+               progress=_no_progress, max_workers: int = ROSTER_WORKERS, rate: float = ROSTER_RATE,
+               manifest: Manifest = None, force: bool = False, current: bool = False,
+               excel: bool = False) -> dict:
+    """Stages 1-3 for one season; writes the partitions that changed.
+
+    Returns {season type: player frame} for the rebuilt season types only.
+    """
+    manifest = manifest or Manifest()
+
+    if fetch:
+        log.info("[1/4] Fetch")
+        raw, inputs = {}, {}
+        for season_type in season_types:
+            log.info("Fetching %s player stats (%s)", season_type, season)
+            raw[season_type], inputs[season_type] = fetch_players_payload(season, season_type)
+    else:
+        log.info("[1/4] Fetch skipped, reading player frames from the store")
+        raw = read_player_frames(season, season_types)
+        inputs = {t: frame_hash(df) for t, df in raw.items()}
+
+    if positions:
+        log.info("[2/4] Positions merge")
+        df_positions, failed = fetch_positions(season, progress=progress,
+                                               max_workers=max_workers, rate=rate)
+        if failed:
+            log.warning("Missing rosters: %s", ", ".join(failed))
+        positions_fp = frame_hash(df_positions)
+    else:
+        log.info("[2/4] Positions merge skipped")
+        positions_fp = "no-positions"
+
+    log.info("[3/4] Filter")
+    players = {}
+    for season_type, df in raw.items():
+        key = f"players/{season}/{SEASON_TYPE_SLUGS[season_type]}"
+        fp = fingerprint(PIPELINE_VERSION, inputs[season_type], positions_fp, fetch)
+        outputs = _player_outputs(season, season_type, current, excel)
+        if manifest.check(key, fp, outputs, force):
+            continue
+        # Rate columns (per game / per 36 / per 100 poss.) in one vectorized pass
+        df = add_team_columns(add_derived(df))
+        if positions:
+            df = merge_positions(df, df_positions)
+        players[season_type] = df
+        if df.empty:
+            log.info("  %s %s: no rows, partition not written", season, season_type)
+        else:
+            write_partition(df, PLAYER_HISTORY, season, season_type)
+            write_partition(clean_players(df), PLAYER_HISTORY_FILTERED, season, season_type)
+        manifest.record(key, fp, outputs)
+    return players
+
+
+def build_changed_sources(manifest: Manifest, source_dir=SOURCE_DIR, force: bool = False,
+                          excel: bool = False) -> dict:
+    """Source frames whose excel_source workbook changed since the last run."""
+    changed = []
+    for name, (filename, _) in SOURCES.items():
+        fp = fingerprint(PIPELINE_VERSION, manifest.file_fingerprint(source_dir / filename))
+        outputs = [store_path(name)] + ([excel_path(name)] if excel else [])
+        if not manifest.check(f"source/{name}", fp, outputs, force):
+            manifest.record(f"source/{name}", fp, outputs)
+            changed.append(name)
+    return build_source_frames(source_dir, names=changed) if changed else {}
+
+
+def run(season: str = SEASON, seasons=None, season_types=SEASON_TYPES,
+        fetch: bool = True, positions: bool = True,
+        excel: bool = False, progress=_no_progress,
+        max_workers: int = ROSTER_WORKERS, rate: float = ROSTER_RATE,
+        force: bool = False) -> dict:
+    """fetch -> positions merge -> filter -> export for every season; returns the flat frames written.
+
+    `seasons` defaults to [season]. `season` is the current season: only its
+    frames (and the Excel sources) are written to the flat df_* datasets.
+    Outputs whose inputs are unchanged since the last run are skipped unless
+    `force` is set.
+    """
+    started = time.perf_counter()
+    seasons = list(seasons or [season])
+    manifest = Manifest.load()
+    frames = {}
+
+    for i, s in enumerate(seasons, start=1):
+        log.info("Season %s (%d/%d)", s, i, len(seasons))
+        players = run_season(s, season_types, fetch=fetch, positions=positions,
+                             progress=progress, max_workers=max_workers, rate=rate,
+                             manifest=manifest, force=force, current=(s == season), excel=excel)
+        if s == season:
+            frames.update({PLAYER_DATASETS[t]: df for t, df in players.items()})
+
+    log.info("[4/4] Export")
+    if season in seasons:
+        frames.update(build_changed_sources(manifest, force=force, excel=excel))
+    frames.update(filter_frames(frames))
+    export(frames, excel=excel)
+    manifest.save()
+
+    log.info("Rebuilt %d output(s), skipped %d unchanged", len(manifest.rebuilt), len(manifest.skipped))
+    log.info("API cache (%s): %s", http_cache.get_cache().mode, http_cache.get_cache().stats)
+    log.info("Done in %.1fs (%d datasets)", time.perf_counter() - started, len(frames))
+    return frames
@@ -1,41 +1,35 @@
 # processing_v3.py
 # -*- coding: utf-8 -*-
-import pandas as pd
+import sys
+from pathlib import Path
+
 import streamlit as st
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # make nba_data importable
+from data_processing import pipeline
+from nba_data.store import read_frame
+
 st.set_page_config(page_title="Processing v3 — Filters", layout="wide")
 st.title("Processing v3 — Clean Players")
 
+# Excel workbooks are an optional human-readable side output; pages read data/store/*.parquet
+EXPORT_EXCEL = True
+
 # -------------------------------
 # Load Data
 # -------------------------------
 REG_PATH = "data/df_reg_season_players.xlsx"
 PO_PATH  = "data/df_playoff_players.xlsx"
 
-df_reg = pd.read_excel(REG_PATH)
-df_po  = pd.read_excel(PO_PATH)
-
-# -------------------------------
-# Simple filters
-# -------------------------------
-def clean_players(df):
-    # Drop unknown positions
-    if "POSITION" in df.columns:
-        df = df[df["POSITION"] != "Unknown"]
-
-    # Drop players with <= 5 minutes per game
-    if "MIN_PG" in df.columns:
-        df = df[df["MIN_PG"] > 5]
-
-    return df
-
-df_reg_clean = clean_players(df_reg)
-df_po_clean  = clean_players(df_po)
+df_reg = read_frame(REG_PATH)
+df_po  = read_frame(PO_PATH)
 
 # -------------------------------
-# Save cleaned data
+# Simple filters + save cleaned data
 # -------------------------------
-df_reg_clean.to_excel("data/df_reg_season_players_filtered.xlsx", index=False)
-df_po_clean.to_excel("data/df_playoff_players_filtered.xlsx", index=False)
+pipeline.export({
+    "data/df_reg_season_players_filtered.xlsx": pipeline.clean_players(df_reg),
+    "data/df_playoff_players_filtered.xlsx": pipeline.clean_players(df_po),
+}, excel=EXPORT_EXCEL)
 
 st.success("Filtered files saved!")
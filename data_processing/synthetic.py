@@ -0,0 +1,650 @@
+# -*- coding: utf-8 -*-
+"""Synthetic league generator: schema-compatible df_* datasets at any size.
+
+Produces every store dataset (players per season / season type, standings,
+team stats, salaries with one column per contract season, champions history)
+from a LeagueConfig: number of seasons, teams, players per team and games.
+Stats are drawn per position from realistic per-36 rates and run through the
+real pipeline stages (add_derived, clean_players), so the frames have the
+columns, dtypes and value ranges of the real exports.
+
+Output is deterministic for a given config: every (season, stage) draws from
+its own generator seeded by (seed, season index, stage). Seasons are produced
+one at a time by iter_seasons() and written as they come, so a 30-season
+league never holds more than one season in memory. The config is saved next
+to the datasets (_league.json), so a later step (the game-log replay of
+data_processing.gamelogs) can draw from the same league.
+
+Usage (from the repository root):
+    python -m data_processing.synthetic --out /tmp/league --seasons 1995-96:2024-25
+    python -m data_processing.synthetic --out /tmp/league --teams 300 --players-per-team 18
+    NBA_STORE_DIR=/tmp/league/store streamlit run home.py
+"""
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from data_processing.derive import add_derived
+from data_processing.pipeline import (PLAYER_COLS, PLAYER_DATASETS, PLAYER_HISTORY, PLAYER_HISTORY_FILTERED,
+                                      POSITION_MAP, SEASON, clean_players, filter_frames, parse_seasons)
+from nba_data import teams as nba_teams
+from nba_data.store import STORE_DIR, read_partitions, write_frames, write_partition
+
+log = logging.getLogger("data_processing")
+
+# -------------------------------
+# Config
+# -------------------------------
+ID_BASE = 3_000_000          # synthetic PLAYER_IDs never collide with nba_api ids
+SALARY_SEASONS = 6           # '2025-26' ... '2030-31' after a 2024-25 league
+MIN_SALARY = 1_200_000
+MAX_SALARY = 60_000_000
+RAISE = 0.05
+CONTRACT_YEARS_P = (0.3, 0.28, 0.24, 0.16, 0.02)   # remaining seasons: 1, 2, ... 5
+
+_STAGES = {"teams": 0, "Regular Season": 1, "Playoffs": 2, "contracts": 3, "history": 4, "roster": 5, "games": 6}
+OPENING_DAY = "10-22"        # first game day of a regular season, then one round every other day
+LEAGUE_FILE = "_league.json"  # the LeagueConfig a store was generated from
+
+
+@dataclass(frozen=True)
+class LeagueConfig:
+    seasons: tuple = (SEASON,)      # the last one is the current season (flat datasets, salaries)
+    teams: int = 30                 # past 30, expansion teams are added
+    players_per_team: int = 18
+    games: int = 82
+    playoff_teams: int = 16         # rounded down to a power of two per conference
+    series_length: int = 7
+    champion_years: int = 50
+    turnover: float = 0.2           # share of roster slots given to new players each season
+    seed: int = 0
+    salary_seasons: int = SALARY_SEASONS
+
+    @property
+    def current(self) -> str:
+        return self.seasons[-1]
+
+    def rng(self, season_index: int, stage: str) -> np.random.Generator:
+        return np.random.default_rng([self.seed, season_index, _STAGES[stage]])
+
+
+# Per-36 rates by position group (guard, wing, big)
+_GROUPS = {"G": 0, "G-F": 0, "F": 1, "F-G": 1, "F-C": 2, "C": 2, "C-F": 2}
+_POS = np.array(["G", "F", "C", "G-F", "F-C", "C-F", "F-G"])
+_POS_P = np.array([0.41, 0.32, 0.09, 0.07, 0.055, 0.037, 0.018])
+_RATES = {
+    #          guard  wing   big
+    "FGA":    (14.0, 12.8, 11.0),
+    "FG3_SH": (0.45, 0.38, 0.15),   # share of FGA from three
+    "FG2_PCT": (0.50, 0.52, 0.58),
+    "FG3_PCT": (0.36, 0.35, 0.31),
+    "FT_RATE": (0.25, 0.25, 0.33),
+    "FT_PCT": (0.80, 0.77, 0.68),
+    "OREB":   (0.8, 1.6, 3.2),
+    "DREB":   (3.6, 5.2, 8.0),
+    "AST":    (5.5, 2.8, 2.4),
+    "TOV":    (2.2, 1.6, 1.9),
+    "STL":    (1.2, 1.0, 0.8),
+    "BLK":    (0.4, 0.7, 1.6),
+}
+
+_FIRST = ["James", "Luka", "Tyrese", "Jalen", "Anthony", "De'Aaron", "Nikola", "Kevin", "Jayson", "Devin",
+          "Shai", "Donovan", "Zion", "Trae", "Jaren", "Scottie", "Paolo", "Franz", "Evan", "Chet",
+          "Desmond", "Mikal", "Bam", "Jrue", "Khris", "Domantas", "Karl-Anthony", "Dejounte", "Tyler", "Jamal",
+          "Alperen", "Victor", "Cade", "Josh", "Darius", "Immanuel", "Brandon", "Keegan", "Herbert", "Jabari"]
+_LAST = ["Brown", "Jokić", "Haliburton", "Williams", "Edwards", "Fox", "Dončić", "Durant", "Tatum", "Booker",
+         "Mitchell", "Johnson", "Young", "Jackson Jr.", "Barnes", "Banchero", "Wagner", "Mobley", "Holmgren", "Bane",
+         "Bridges", "Adebayo", "Holiday", "Middleton", "Sabonis", "Towns", "Murray", "Herro", "Schröder", "Şengün",
+         "Wembanyama", "Cunningham", "Giddey", "Garland", "Quickley", "Miller", "Ellis", "Smith", "Valančiūnas",
+         "Nurkić", "Porziņģis", "Gobert", "Green", "Hart", "Allen", "Lopez", "Harris", "White", "Thompson", "Carter",
+         "Walker", "Robinson", "Payton II", "Jones", "Davis", "Wright", "Gordon", "Porter", "Morris", "O'Neale"]
+_DIVISIONS = {"Atlantic": "A", "Central": "C", "Southeast": "SE",
+              "Northwest": "NW", "Pacific": "P", "Southwest": "SW"}
+
+
+# -------------------------------
+# Teams, names
+# -------------------------------
+def league_teams(n: int) -> pd.DataFrame:
+    """TEAM_ID, TM, TEAM, CONF, DIV: the 30 franchises, then expansion teams (X031, ...)."""
+    df = nba_teams.teams().head(n)
+    extra = n - len(df)
+    if extra > 0:
+        i = np.arange(len(df) + 1, n + 1)
+        conf = np.where(i % 2, "East", "West")
+        div = np.where(conf == "East", np.array(["Atlantic", "Central", "Southeast"])[i % 3],
+                       np.array(["Northwest", "Pacific", "Southwest"])[i % 3])
+        df = pd.concat([df, pd.DataFrame({
+            "TEAM_ID": 1_700_000_000 + i, "TM": [f"X{k:03d}" for k in i],
+            "TEAM": [f"Expansion Team {k}" for k in i], "CONF": conf, "DIV": div,
+        })], ignore_index=True)
+    return df.reset_index(drop=True)
+
+
+def player_names(ids: np.ndarray) -> tuple:
+    """(PLAYER_NAME, NICKNAME) arrays, unique per id for the first ~144k ids."""
+    k = np.asarray(ids, dtype=np.int64) - ID_BASE
+    nf, nl = len(_FIRST), len(_LAST)
+    first = np.array(_FIRST, dtype=object)[(k * 7) % nf]
+    last = np.array(_LAST, dtype=object)[(k // nf) % nl]
+    cycle = k // (nf * nl)
+    # Past the first / last combinations: double-barrelled ('Smith-Jokić'), then a counter
+    second = np.array(_LAST, dtype=object)[(cycle - 1) % nl]
+    last = np.where(cycle > 0, last + "-" + second, last)
+    last = np.where(cycle > nl, last + " " + (cycle // nl).astype(str), last)
+    return first + " " + last, first
+
+
+def short_name(name: str) -> str:
+    """'Nikola Jokić' -> 'N. Jokić' (champions history style)."""
+    first, _, last = name.partition(" ")
+    return f"{first[0]}. {last}" if last else name
+
+
+# -------------------------------
+# Seasons
+# -------------------------------
+class SeasonFrames(NamedTuple):
+    season: str
+    teams: pd.DataFrame        # one row per team: results, playoff run
+    players: dict              # {season type: player frame}
+    finalists: tuple           # (champion, runner-up) rows of `teams`
+
+
+@dataclass
+class _Roster:
+    """Roster slots (team x slot) and the player holding each one."""
+    ids: np.ndarray
+    age: np.ndarray
+    pos: np.ndarray
+    talent: np.ndarray
+    next_id: int = field(default=ID_BASE)
+
+    @classmethod
+    def draft(cls, n: int, rng: np.random.Generator) -> "_Roster":
+        roster = cls(np.zeros(n, np.int64), np.zeros(n, np.int64), np.empty(n, object), np.zeros(n))
+        roster.replace(np.ones(n, bool), rng, veteran=True)
+        return roster
+
+    def replace(self, mask: np.ndarray, rng: np.random.Generator, veteran: bool = False):
+        n = int(mask.sum())
+        self.ids[mask] = np.arange(self.next_id, self.next_id + n)
+        self.next_id += n
+        self.age[mask] = rng.integers(19, 34, n) if veteran else rng.integers(19, 24, n)
+        self.pos[mask] = rng.choice(_POS, n, p=_POS_P / _POS_P.sum())
+        self.talent[mask] = rng.standard_normal(n)
+
+    def next_season(self, config: LeagueConfig, rng: np.random.Generator):
+        self.age += 1
+        self.replace((rng.random(len(self.ids)) < config.turnover) | (self.age > 38), rng)
+
+
+def _series(strength_a, strength_b, rng, length: int):
+    """Vectorized best-of-`length` series: (a won, games played, wins of a, wins of b)."""
+    need = length // 2 + 1
+    p = 1 / (1 + np.exp(-(strength_a - strength_b) * 1.5))
+    a_won = rng.random(len(p)) < p
+    loser_wins = rng.integers(0, need, len(p))
+    wins_a = np.where(a_won, need, loser_wins)
+    wins_b = np.where(a_won, loser_wins, need)
+    return a_won, wins_a + wins_b, wins_a, wins_b
+
+
+def _team_season(config: LeagueConfig, league: pd.DataFrame, k: int) -> tuple:
+    """Team results of season k (W, L, ratings, playoff run) and (champion, runner-up) indexes."""
+    rng = config.rng(k, "teams")
+    n = len(league)
+    strength = rng.standard_normal(n)
+    p = 1 / (1 + np.exp(-strength * 0.9))
+    w = rng.binomial(config.games, p)
+    df = league.assign(STRENGTH=strength, W=w, L=config.games - w)
+    df["NRTG"] = np.round(strength * 5 + rng.normal(0, 1, n), 2)
+    df["ORTG"] = np.round(114 + strength * 3 + rng.normal(0, 2, n), 2)
+    df["DRTG"] = np.round(df["ORTG"] - df["NRTG"], 2)
+    df["PACE"] = np.round(rng.normal(99, 2, n), 1)
+
+    po_g = np.zeros(n, np.int64)
+    po_w = np.zeros(n, np.int64)
+    playoff = np.zeros(n, bool)
+    finalists = []
+    for conf in ("East", "West"):
+        members = np.flatnonzero(df["CONF"].to_numpy() == conf)
+        size = 1 << int(np.log2(max(min(config.playoff_teams // 2, len(members)), 1)))
+        alive = members[np.argsort(-(w[members] + strength[members] * 1e-3))][:size]
+        playoff[alive] = True
+        while len(alive) > 1:
+            a, b = alive[: len(alive) // 2], alive[len(alive) // 2:][::-1]
+            a_won, games, wins_a, wins_b = _series(strength[a], strength[b], rng, config.series_length)
+            po_g[a] += games
+            po_g[b] += games
+            po_w[a] += wins_a
+            po_w[b] += wins_b
+            alive = np.where(a_won, a, b)
+        finalists.extend(alive)
+    if len(finalists) == 2:
+        a, b = np.array(finalists[:1]), np.array(finalists[1:])
+        a_won, games, wins_a, wins_b = _series(strength[a], strength[b], rng, config.series_length)
+        po_g[a] += games
+        po_g[b] += games
+        po_w[a] += wins_a
+        po_w[b] += wins_b
+        champion, runner = (finalists[0], finalists[1]) if a_won[0] else (finalists[1], finalists[0])
+    else:
+        champion = runner = finalists[0] if finalists else 0
+    df["PLAYOFF_TEAM"] = playoff
+    df["PO_G"] = po_g
+    df["PO_W"] = po_w
+    df["PO_L"] = po_g - po_w
+    return df, (champion, runner)
+
+
+def _player_stats(config: LeagueConfig, roster: _Roster, team_df: pd.DataFrame, season_type: str,
+                  rng: np.random.Generator) -> pd.DataFrame:
+    """One row per player with games played: PLAYER_COLS + TM / TEAM + POS / POSITION, derived rates."""
+    ppt = config.players_per_team
+    team_idx = np.repeat(np.arange(len(team_df)), ppt)
+    slot = np.tile(np.arange(ppt), len(team_df))
+    if season_type == "Playoffs":
+        games, wins = team_df["PO_G"].to_numpy()[team_idx], team_df["PO_W"].to_numpy()[team_idx]
+    else:
+        games, wins = team_df["W"].to_numpy()[team_idx] + team_df["L"].to_numpy()[team_idx], \
+            team_df["W"].to_numpy()[team_idx]
+
+    # Rotation: starters ~34 min and most games, deep bench a few garbage-time minutes
+    mpg = np.clip(35 - 2.2 * slot + 2 * roster.talent + rng.normal(0, 3, len(slot)), 2, 40)
+    avail = np.clip(0.92 - 0.045 * slot, 0.15, 0.95)
+    gp = rng.binomial(games, avail)
+    # Scale the rotation so a team plays 240 minutes a game
+    played = np.bincount(team_idx, gp * mpg, minlength=len(team_df))
+    team_games = np.bincount(team_idx, games, minlength=len(team_df)) / ppt
+    mpg = np.clip(mpg * np.divide(team_games * 240, played, out=np.ones(len(played)), where=played > 0)[team_idx],
+                  1, 44)
+    keep = gp > 0
+    n = int(keep.sum())
+    team_idx, gp, mpg, games, wins = team_idx[keep], gp[keep], mpg[keep], games[keep], wins[keep]
+    ids, pos, talent, age = roster.ids[keep], roster.pos[keep], roster.talent[keep], roster.age[keep]
+    group = np.array([_GROUPS[p] for p in pos])
+    rate = {name: np.array(values)[group] for name, values in _RATES.items()}
+
+    minutes = np.round(gp * mpg * rng.uniform(0.97, 1.03, n), 2)
+    per36 = minutes / 36
+    skill = np.exp(0.3 * talent)
+    fga = rng.poisson(rate["FGA"] * skill * per36)
+    fg3a = rng.binomial(fga, rate["FG3_SH"])
+    fg3m = rng.binomial(fg3a, np.clip(rate["FG3_PCT"] + 0.02 * talent, 0.2, 0.48))
+    fg2m = rng.binomial(fga - fg3a, np.clip(rate["FG2_PCT"] + 0.02 * talent, 0.35, 0.7))
+    fta = rng.poisson(fga * rate["FT_RATE"])
+    ftm = rng.binomial(fta, np.clip(rate["FT_PCT"] + 0.03 * talent, 0.4, 0.95))
+    fgm = fg2m + fg3m
+    oreb, dreb = rng.poisson(rate["OREB"] * per36), rng.poisson(rate["DREB"] * per36)
+    w = rng.binomial(gp, np.divide(wins, games, out=np.zeros(n), where=games > 0))
+    net = team_df["NRTG"].to_numpy()[team_idx]
+
+    def pct(made, att):
+        return np.round(np.divide(made, att, out=np.zeros(n), where=att > 0), 3)
+
+    names, nicknames = player_names(ids)
+    df = pd.DataFrame({
+        "PLAYER_ID": ids,
+        "PLAYER_NAME": names,
+        "NICKNAME": nicknames,
+        "TEAM_ABBREVIATION": team_df["TM"].to_numpy()[team_idx],
+        "AGE": age,
+        "GP": gp,
+        "W": w,
+        "L": gp - w,
+        "W_PCT": pct(w, gp),
+        "MIN": minutes,
+        "FGM": fgm,
+        "FGA": fga,
+        "FG_PCT": pct(fgm, fga),
+        "FG3M": fg3m,
+        "FG3A": fg3a,
+        "FG3_PCT": pct(fg3m, fg3a),
+        "FTM": ftm,
+        "FTA": fta,
+        "FT_PCT": pct(ftm, fta),
+        "PTS": 2 * fg2m + 3 * fg3m + ftm,
+        "OREB": oreb,
+        "DREB": dreb,
+        "REB": oreb + dreb,
+        "AST": rng.poisson(rate["AST"] * np.exp(0.4 * talent) * per36),
+        "TOV": rng.poisson(rate["TOV"] * skill * per36),
+        "STL": rng.poisson(rate["STL"] * per36),
+        "BLK": rng.poisson(rate["BLK"] * per36),
+        "PLUS_MINUS": np.round(rng.normal(net * minutes / 48, np.sqrt(minutes) * 0.5)).astype(np.int64),
+    })[PLAYER_COLS]
+
+    # Same layout as the pipeline: TM / TEAM after PLAYER_NAME, rates, then POS / POSITION
+    df = add_derived(df)
+    df.insert(2, "TEAM", team_df["TEAM"].to_numpy()[team_idx])
+    df.insert(2, "TM", team_df["TM"].to_numpy()[team_idx])
+    df["POS"] = pos
+    df["POSITION"] = pd.Series(pos).map(POSITION_MAP).to_numpy()
+    return df.sort_values(["PLAYER_NAME", "PLAYER_ID"], kind="stable").reset_index(drop=True)
+
+
+def iter_seasons(config: LeagueConfig) -> Iterator[SeasonFrames]:
+    """SeasonFrames for every season of the config, oldest first, one at a time."""
+    league = league_teams(config.teams)
+    roster = _Roster.draft(len(league) * config.players_per_team, config.rng(0, "roster"))
+    for k, season in enumerate(config.seasons):
+        if k:
+            roster.next_season(config, config.rng(k, "roster"))
+        team_df, finalists = _team_season(config, league, k)
+        players = {t: _player_stats(config, roster, team_df, t, config.rng(k, t)) for t in PLAYER_DATASETS}
+        yield SeasonFrames(season, team_df, players, finalists)
+
+
+# -------------------------------
+# Game logs
+# -------------------------------
+def stored_season(config: LeagueConfig, store_dir=None) -> SeasonFrames:
+    """The current season's teams and regular-season players, read back from a generated store.
+
+    Only what game_logs() draws from: no earlier season is regenerated.
+    """
+    season = config.current
+    players = read_partitions(PLAYER_HISTORY, [season], ["Regular Season"], store_dir=store_dir)
+    if players.empty:
+        raise FileNotFoundError(f"No {season} regular-season players in {store_dir or STORE_DIR}")
+    players = players.drop(columns=["SEASON", "SEASON_TYPE"])
+    return SeasonFrames(season, league_teams(config.teams), {"Regular Season": players}, ())
+
+
+def game_logs(config: LeagueConfig, season: SeasonFrames) -> pd.DataFrame:
+    """Regular-season player game logs (data_processing.gamelogs layout) drawn from the season's players.
+
+    config.games rounds of random pairings, one every other day. A player
+    appears with probability GP / games and their lines are drawn around their
+    per-game averages; the team with more points wins (ties go to the home team).
+    """
+    from data_processing.gamelogs import GAME_LOG_COLS, order_game_logs
+
+    rng = config.rng(config.seasons.index(season.season), "games")
+    players = season.players["Regular Season"]
+    team_tm = season.teams["TM"].to_numpy()
+    n, half = len(team_tm), len(team_tm) // 2
+    pairing = np.argsort(rng.random((config.games, n)), axis=1)
+    home, away = pairing[:, :half].ravel(), pairing[:, half:2 * half].ravel()
+    games = len(home)
+    game_ids = [f"002{season.season[2:4]}{i:05d}" for i in range(1, games + 1)]
+    dates = (pd.Timestamp(f"{season.season[:4]}-{OPENING_DAY}")
+             + pd.to_timedelta(np.repeat(np.arange(config.games), half) * 2, "D"))
+    sides = pd.DataFrame({
+        "GAME_ID": np.tile(game_ids, 2),
+        "GAME_DATE": np.tile(dates, 2),
+        "TM": team_tm[np.r_[home, away]],
+        "OPP": team_tm[np.r_[away, home]],
+        "HOME": np.r_[np.ones(games, bool), np.zeros(games, bool)],
+    })
+
+    per_game = ["FGA", "FTA", "OREB", "DREB", "AST", "TOV", "STL", "BLK"]
+    season_df = players[["PLAYER_ID", "PLAYER_NAME", "TM", "TEAM", "GP", "MIN", "FG3A", "FG3_PCT", "FGM", "FG3M",
+                         *per_game, "FT_PCT"]]
+    df = sides.merge(season_df, on="TM")
+    team_games = df.groupby("TM")["GAME_ID"].transform("nunique")
+    df = df[rng.random(len(df)) < df["GP"] / team_games].reset_index(drop=True)
+    m = len(df)
+    gp = df["GP"].to_numpy()
+    # Whoever is available shares the 240 minutes of the game
+    expected = df["MIN"] / df["GP"]
+    share = np.clip(240 / expected.groupby([df["GAME_ID"], df["TM"]]).transform("sum"), 0.5, 3).to_numpy()
+    draws = {c: rng.poisson(df[c].to_numpy() / gp * share) for c in per_game}
+    fg3a = rng.binomial(draws["FGA"], np.clip(df["FG3A"].to_numpy() / np.maximum(df["FGA"].to_numpy(), 1), 0, 1))
+    fg2_pct = np.clip((df["FGM"] - df["FG3M"]).to_numpy() / np.maximum((df["FGA"] - df["FG3A"]).to_numpy(), 1),
+                      0, 1)
+    fg3m = rng.binomial(fg3a, df["FG3_PCT"].to_numpy())
+    fgm = fg3m + rng.binomial(draws["FGA"] - fg3a, fg2_pct)
+    ftm = rng.binomial(draws["FTA"], df["FT_PCT"].to_numpy())
+    minutes = np.round(np.clip(expected.to_numpy() * share * rng.uniform(0.8, 1.2, m), 1, 48), 1)
+    df = df.assign(MIN=minutes, FGM=fgm, FGA=draws["FGA"], FG3M=fg3m, FG3A=fg3a, FTM=ftm, FTA=draws["FTA"],
+                   OREB=draws["OREB"], DREB=draws["DREB"], REB=draws["OREB"] + draws["DREB"],
+                   PTS=2 * fgm + fg3m + ftm, **{c: draws[c] for c in ("AST", "TOV", "STL", "BLK")})
+
+    # Result of each side: points for / against, ties to the home team
+    score = df.groupby(["GAME_ID", "TM"])["PTS"].sum()
+    df["FOR"] = score.reindex(pd.MultiIndex.from_frame(df[["GAME_ID", "TM"]])).to_numpy()
+    df["AGAINST"] = score.reindex(pd.MultiIndex.from_frame(df[["GAME_ID", "OPP"]])).fillna(0).to_numpy()
+    won = (df["FOR"] > df["AGAINST"]) | ((df["FOR"] == df["AGAINST"]) & df["HOME"])
+    margin = (df["FOR"] - df["AGAINST"]).to_numpy()
+    df["WL"] = np.where(won, "W", "L")
+    df["PLUS_MINUS"] = np.round(margin * minutes / 48 + rng.normal(0, 4, m)).astype(np.int64)
+    df["MATCHUP"] = df["TM"] + np.where(df["HOME"], " vs. ", " @ ") + df["OPP"]
+    df["TEAM_ABBREVIATION"] = df["TM"]
+    # Same layout as the ingest: TM / TEAM after PLAYER_NAME (expansion teams are not in nba_data.teams)
+    out = df[GAME_LOG_COLS].copy()
+    out.insert(2, "TEAM", df["TEAM"].to_numpy())
+    out.insert(2, "TM", df["TM"].to_numpy())
+    return order_game_logs(out)
+
+
+# -------------------------------
+# Current-season datasets
+# -------------------------------
+def standings(team_df: pd.DataFrame, conf: str) -> pd.DataFrame:
+    df = team_df[team_df["CONF"] == conf].sort_values(["W", "STRENGTH"], ascending=False)
+    gb = ((df["W"].iloc[0] - df["W"]) + (df["L"] - df["L"].iloc[0])) / 2
+    ps = np.round(112 + df["ORTG"] - 114 + (df["PACE"] - 99), 1)
+    return pd.DataFrame({
+        "TEAM": df["TEAM"], "TM": df["TM"], "PLAYOFF_TEAM": df["PLAYOFF_TEAM"],
+        "W": df["W"], "L": df["L"], "W/L%": np.round(df["W"] / (df["W"] + df["L"]), 3),
+        "GB": np.where(gb == 0, "—", gb.map("{:.1f}".format)),
+        "PS/G": ps, "PA/G": np.round(ps - df["NRTG"], 1), "SRS": np.round(df["NRTG"] * 0.95, 2),
+    }).reset_index(drop=True)
+
+
+def team_ratings(team_df: pd.DataFrame) -> pd.DataFrame:
+    df = team_df.sort_values(["W", "STRENGTH"], ascending=False)
+    return pd.DataFrame({
+        "TEAM": df["TEAM"], "TM": df["TM"], "CONF": df["CONF"].str[0], "DIV": df["DIV"].map(_DIVISIONS),
+        "W": df["W"], "L": df["L"], "W/L%": np.round(df["W"] / (df["W"] + df["L"]), 3),
+        "ORTG": df["ORTG"], "DRTG": df["DRTG"], "NRTG": df["NRTG"],
+    }).reset_index(drop=True)
+
+
+def _with_league_average(df: pd.DataFrame, pct_cols=(), int_cols=(), blank_cols=()) -> pd.DataFrame:
+    """df + a 'League Average' row (TM Unknown), percentages to 3 decimals, the rest to 1."""
+    avg = df.drop(columns=["TEAM", "TM"]).mean()
+    for col in int_cols:
+        avg[col] = int(round(avg[col]))
+    for col in blank_cols:
+        avg[col] = np.nan
+    row = pd.DataFrame([{"TEAM": "League Average", "TM": nba_teams.UNKNOWN, **avg.to_dict()}])
+    df = pd.concat([df, row], ignore_index=True).astype({c: df[c].dtype for c in int_cols})
+    rest = df.columns.difference(["TEAM", "TM", *int_cols, *pct_cols])
+    df[list(pct_cols)] = df[list(pct_cols)].round(3)
+    df[rest] = df[rest].round(1)
+    return df
+
+
+def playoff_team_stats(team_df: pd.DataFrame, playoffs: pd.DataFrame, rng: np.random.Generator) -> tuple:
+    """(per-game box score, advanced ratings) of the playoff teams, from their players' totals."""
+    po = team_df[team_df["PO_G"] > 0].set_index("TM")
+    totals = playoffs.groupby("TM", observed=True)[
+        ["MIN", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV",
+         "PTS"]].sum().reindex(po.index, fill_value=0)
+    g = po["PO_G"]
+    per_game = totals.div(g, axis=0)
+    box = pd.DataFrame({
+        "TEAM": po["TEAM"], "TM": po.index, "G": g, "MP": per_game["MIN"],
+        "FG": per_game["FGM"], "FGA": per_game["FGA"], "FG%": totals["FGM"] / totals["FGA"].clip(lower=1),
+        "3P": per_game["FG3M"], "3PA": per_game["FG3A"], "3P%": totals["FG3M"] / totals["FG3A"].clip(lower=1),
+        "2P": per_game["FGM"] - per_game["FG3M"], "2PA": per_game["FGA"] - per_game["FG3A"],
+        "2P%": (totals["FGM"] - totals["FG3M"]) / (totals["FGA"] - totals["FG3A"]).clip(lower=1),
+        "FT": per_game["FTM"], "FTA": per_game["FTA"], "FT%": totals["FTM"] / totals["FTA"].clip(lower=1),
+        "ORB": per_game["OREB"], "DRB": per_game["DREB"], "TRB": per_game["REB"], "AST": per_game["AST"],
+        "STL": per_game["STL"], "BLK": per_game["BLK"], "TOV": per_game["TOV"],
+        "PF": rng.normal(20, 1.5, len(po)), "PTS": per_game["PTS"],
+    }).sort_values("PTS", ascending=False).reset_index(drop=True)
+
+    ts = totals["PTS"] / (2 * (totals["FGA"] + 0.44 * totals["FTA"])).clip(lower=1)
+    efg = (totals["FGM"] + 0.5 * totals["FG3M"]) / totals["FGA"].clip(lower=1)
+    age = (playoffs.groupby("TM", observed=True)
+           .apply(lambda d: np.average(d["AGE"], weights=d["MIN"]), include_groups=False)
+           .reindex(po.index))
+    advanced = pd.DataFrame({
+        "TEAM": po["TEAM"], "TM": po.index, "AGE": age,
+        "W": po["PO_W"].astype(float), "L": po["PO_L"].astype(float), "W/L%": po["PO_W"] / g,
+        # Playoff games are slower and tighter than the regular season
+        "ORTG": po["ORTG"] - 1, "DRTG": po["DRTG"] - 1, "NRTG": po["NRTG"], "PACE": po["PACE"] - 2,
+        "TS%": ts, "EFG%": efg,
+    }).sort_values("NRTG", ascending=False).reset_index(drop=True)
+    return (_with_league_average(box, pct_cols=["FG%", "3P%", "2P%", "FT%"], int_cols=["G"]),
+            _with_league_average(advanced, pct_cols=["W/L%", "TS%", "EFG%"], blank_cols=["W", "L", "W/L%", "NRTG"]))
+
+
+def salaries(config: LeagueConfig, players: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    """Contracts of the rotation players: PLAYER, TEAM, TM, one Int64 column per season, GUARANTEED."""
+    first = int(config.current[:4]) + 1
+    seasons = [f"{y}-{(y + 1) % 100:02d}" for y in range(first, first + config.salary_seasons)]
+    signed = (players.sort_values("MIN", ascending=False)
+              .groupby("TM", observed=True, sort=False).head(13)
+              .drop_duplicates("PLAYER_ID"))
+    quality = signed["PTS_PG"].rank(pct=True).to_numpy()
+    start = np.round(MIN_SALARY * (MAX_SALARY / MIN_SALARY) ** (quality ** 2) * rng.uniform(0.85, 1.1, len(signed)))
+    p = np.array(CONTRACT_YEARS_P[:config.salary_seasons])
+    years = rng.choice(np.arange(1, len(p) + 1), len(signed), p=p / p.sum())
+    amounts = start[:, None] * (1 + RAISE) ** np.arange(len(seasons))
+    amounts = np.where(np.arange(len(seasons)) < years[:, None], np.round(amounts), np.nan)
+    df = pd.DataFrame({"PLAYER": signed["PLAYER_NAME"].to_numpy(), "TEAM": signed["TEAM"].to_numpy(),
+                       "TM": signed["TM"].to_numpy()})
+    for j, season in enumerate(seasons):
+        df[season] = pd.array(amounts[:, j], dtype="Int64")
+    # Some contracts have no published guarantee
+    df["GUARANTEED"] = pd.Series(np.nansum(amounts, axis=1)).astype("Int64").mask(rng.random(len(df)) < 0.09)
+    return df.sort_values(seasons[0], ascending=False).reset_index(drop=True)
+
+
+def champions(config: LeagueConfig, league: pd.DataFrame, current: tuple, rng: np.random.Generator) -> pd.DataFrame:
+    """YEAR (latest first), LG, CHAMPION, RUNNER-UP, TM_*, FINALS_MVP and the finals leaders."""
+    n = config.champion_years
+    last = int(config.current[:4]) + 1
+    pairs = np.array([rng.choice(len(league), 2, replace=False) for _ in range(n)])
+    if n:
+        pairs[0] = current
+    name_ids = ID_BASE + rng.integers(0, 20_000, (n, 4))
+    names = [[short_name(v) for v in player_names(col)[0]] for col in name_ids.T]
+    return pd.DataFrame({
+        "YEAR": np.arange(last, last - n, -1),
+        "LG": "NBA",
+        "CHAMPION": league["TEAM"].to_numpy()[pairs[:, 0]],
+        "RUNNER-UP": league["TEAM"].to_numpy()[pairs[:, 1]],
+        "TM_CHAMP": league["TM"].to_numpy()[pairs[:, 0]],
+        "TM_RUNNER_UP": league["TM"].to_numpy()[pairs[:, 1]],
+        "FINALS_MVP": names[0],
+        "POINTS": [f"{p} ({v})" for p, v in zip(names[0], rng.integers(350, 700, n))],
+        "REBOUNDS": [f"{p} ({v})" for p, v in zip(names[1], rng.integers(150, 300, n))],
+        "ASSISTS": [f"{p} ({v})" for p, v in zip(names[2], rng.integers(80, 200, n))],
+        "WIN_SHARES": [f"{p} ({v:.1f})" for p, v in zip(names[3], rng.uniform(1.5, 4.5, n))],
+    })
+
+
+def current_frames(config: LeagueConfig, season: SeasonFrames) -> dict:
+    """The flat df_* datasets of the current season."""
+    k = len(config.seasons) - 1
+    rng = config.rng(k, "contracts")
+    reg, po = season.players["Regular Season"], season.players["Playoffs"]
+    box, advanced = playoff_team_stats(season.teams, po, rng)
+    frames = {
+        "df_western_conf_standing": standings(season.teams, "West"),
+        "df_eastern_conf_standing": standings(season.teams, "East"),
+        "df_nba_team_playoff_stats_pg": box,
+        "df_nba_team_playoff_advanced_stats": advanced,
+        "df_nba_players_salaries": salaries(config, reg, rng),
+        "df_nba_team_reg_season_ratings": team_ratings(season.teams),
+        "df_nba_champion": champions(config, season.teams, season.finalists, config.rng(k, "history")),
+        PLAYER_DATASETS["Regular Season"]: reg,
+        PLAYER_DATASETS["Playoffs"]: po,
+    }
+    frames.update(filter_frames(frames))
+    return frames
+
+
+def league_frames(config: LeagueConfig) -> dict:
+    """Flat datasets of the current season, in memory (the history partitions are not kept)."""
+    season = None
+    for season in iter_seasons(config):
+        pass
+    return current_frames(config, season)
+
+
+# -------------------------------
+# Output
+# -------------------------------
+def write_league(config: LeagueConfig, store_dir, excel: bool = False, data_dir=None) -> list:
+    """Write every season's partitions as it is generated, then the flat datasets."""
+    store_dir = Path(store_dir)
+    paths, season = [], None
+    for season in iter_seasons(config):
+        for season_type, df in season.players.items():
+            paths.append(write_partition(df, PLAYER_HISTORY, season.season, season_type, store_dir))
+            paths.append(write_partition(clean_players(df), PLAYER_HISTORY_FILTERED, season.season, season_type,
+                                         store_dir))
+        log.info("  %s: %s players", season.season,
+                 " / ".join(f"{len(df)} {t}" for t, df in season.players.items()))
+    if season is not None:
+        if excel and data_dir is not None:
+            Path(data_dir).mkdir(parents=True, exist_ok=True)
+        paths += write_frames(current_frames(config, season), store_dir, excel=excel, data_dir=data_dir)
+    paths.append(save_config(config, store_dir))
+    return paths
+
+
+def save_config(config: LeagueConfig, store_dir) -> Path:
+    path = Path(store_dir) / LEAGUE_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(asdict(config), indent=1), encoding="utf-8")
+    return path
+
+
+def load_config(store_dir=None):
+    """LeagueConfig saved by write_league() in `store_dir` (None when the store was not generated)."""
+    path = Path(store_dir or STORE_DIR) / LEAGUE_FILE
+    if not path.exists():
+        return None
+    values = json.loads(path.read_text(encoding="utf-8"))
+    return LeagueConfig(**{**values, "seasons": tuple(values["seasons"])})
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m data_processing.synthetic",
+        description="Generate a synthetic, schema-compatible league store.",
+    )
+    parser.add_argument("--out", type=Path, required=True,
+                        help="output directory (the store is written to OUT/store, Excel to OUT)")
+    parser.add_argument("--seasons", type=parse_seasons, default=[SEASON],
+                        help="seasons to generate, the last one is the current season (default: %(default)s)")
+    parser.add_argument("--teams", type=int, default=LeagueConfig.teams, help="default: %(default)s")
+    parser.add_argument("--players-per-team", type=int, default=LeagueConfig.players_per_team,
+                        help="default: %(default)s")
+    parser.add_argument("--games", type=int, default=LeagueConfig.games,
+                        help="regular season games per team (default: %(default)s)")
+    parser.add_argument("--champion-years", type=int, default=LeagueConfig.champion_years,
+                        help="rows of champions history (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=LeagueConfig.seed, help="default: %(default)s")
+    parser.add_argument("--excel", action="store_true", help="also write OUT/df_*.xlsx")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-7s %(message)s", datefmt="%H:%M:%S")
+    config = LeagueConfig(seasons=tuple(args.seasons), teams=args.teams, players_per_team=args.players_per_team,
+                          games=args.games, champion_years=args.champion_years, seed=args.seed)
+    paths = write_league(config, args.out / "store", excel=args.excel, data_dir=args.out)
+    log.info("Wrote %d files to %s", len(paths), args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
 import pandas as pd
+from nba_data import leaderboards, loaders, profiling, query
+
+pd.set_option("mode.copy_on_write", True)  # les vues du cache partagé (nba_data.loaders) sont copiées à l'écriture
+profiling.begin_page("home")  # temps du rerun par étape (voir nba_data.profiling)
 
 # -------------------------------
 # Configuration de la Page
@@ -21,22 +25,14 @@ with c5: st.page_link("pages/4_Trade_Machine.py",  label=" Machine à Trade") #
 
 
 # -------------------------------
-# Chargement des Données (cache) => But : éviter de relire 5 Excel à chaque interaction.
+# Chargement des Données (cache partagé par toutes les pages, une lecture par processus)
 # -------------------------------
-@st.cache_data(ttl=3600, show_spinner=False)
-def load_data():
-    df_west  = pd.read_excel("data/df_western_conf_standing.xlsx")
-    df_east  = pd.read_excel("data/df_eastern_conf_standing.xlsx")
-    df_team_ratings = pd.read_excel("data/df_nba_team_reg_season_ratings.xlsx")
-    df_players = pd.read_excel("data/df_reg_season_players_filtered.xlsx")
-    df_salaries = pd.read_excel("data/df_nba_players_salaries.xlsx")
-    return df_west, df_east, df_team_ratings, df_players, df_salaries
-
 with st.spinner("Chargement des données..."):
-    df_west, df_east, df_team_ratings, df_players, df_salaries = load_data()
-
-# ton filtrage existant
-df_players = df_players[(df_players["GP"] > 10) & (df_players["MIN_PG"] > 10)]
+    df_west         = loaders.frame("df_western_conf_standing")
+    df_east         = loaders.frame("df_eastern_conf_standing")
+    df_salaries     = loaders.frame("df_nba_players_salaries")
+    # Filtre qualité : GP>10 & MIN_PG>10 (précalculé une fois par version des données)
+    df_players      = loaders.qualified_players("Regular Season")
 
 # -------------------------------
 # Titre de la Page
@@ -91,10 +87,8 @@ with tab2:
         key="top_players_team_filter_single" # Clé unique pour le widget
     )
 
-    # Applique le filtre localement
-    df_tp = df_players.copy() # Crée une copie du DataFrame des joueurs
-    if team_choice != "Toutes les équipes": # Si une équipe spécifique est choisie
-        df_tp = df_tp[df_tp["TEAM"] == team_choice] # Filtre le DataFrame par l'équipe sélectionnée
+    # Filtre équipe appliqué dans l'index de classement (None = toutes les équipes)
+    team_param = None if team_choice == "Toutes les équipes" else team_choice
 
     metrics = {
         "Points Par Match": "PTS_PG",
@@ -103,15 +97,12 @@ with tab2:
     } # Dictionnaire des métriques à afficher
 
     # Itère sur chaque métrique pour afficher les 3 meilleurs joueurs
-    for label, col_name in metrics.items():
+    with profiling.span("top3_joueurs"):
+        for label, col_name in metrics.items():
 
-        top3 = (
-            df_tp[["PLAYER_NAME", "TEAM", col_name]] # Sélectionne les colonnes Joueur, Équipe et la métrique
-            .sort_values(by=col_name, ascending=False) # Trie par la métrique en ordre décroissant
-            .head(3) # Prend les 3 premiers joueurs
-        )
-        st.markdown(f"### {label}") # Affiche le titre de la métrique
-        st.dataframe(top3, hide_index=True, use_container_width=True) # Affiche le DataFrame des 3 meilleurs
+            top3 = leaderboards.top(col_name, n=3, team=team_param) # 3 meilleurs (index de classement précalculé)
+            st.markdown(f"### {label}") # Affiche le titre de la métrique
+            st.dataframe(top3, hide_index=True, use_container_width=True) # Affiche le DataFrame des 3 meilleurs
 
 # -------------------------------
 # Contenu de l'Onglet 3 : Évaluations des Équipes
@@ -124,21 +115,21 @@ with tab3:
     # Offensive Rating (plus élevé est mieux)
     with col1:
         st.markdown("### Évaluation Offensive") # Sous-titre
-        off = df_team_ratings[["TEAM", "ORTG"]].sort_values(by="ORTG", ascending=False).head(10) # Trie et prend les 10 meilleures
+        off = query.team_leaderboard("ORTG", n=10) # 10 meilleures (requête préparée DuckDB)
         st.dataframe(off, hide_index=True, use_container_width=True) # Affiche le DataFrame
        
 
     # Defensive Rating (plus faible est mieux → ordre croissant)
     with col2:
         st.markdown("### Évaluation Défensive") # Sous-titre
-        deff = df_team_ratings[["TEAM", "DRTG"]].sort_values(by="DRTG", ascending=True).head(10) # Trie et prend les 10 meilleures
+        deff = query.team_leaderboard("DRTG", n=10, ascending=True) # 10 meilleures
         st.dataframe(deff, hide_index=True, use_container_width=True) # Affiche le DataFrame
         
 
     # Net Rating (plus élevé est mieux)
     with col3:
         st.markdown("### Évaluation Nette") # Sous-titre
-        net = df_team_ratings[["TEAM", "NRTG"]].sort_values(by="NRTG", ascending=False).head(10) # Trie et prend les 10 meilleures
+        net = query.team_leaderboard("NRTG", n=10) # 10 meilleures
         st.dataframe(net, hide_index=True, use_container_width=True) # Affiche le DataFrame
 
 # -------------------------------
@@ -177,4 +168,13 @@ with tab4:
     if df_filtered.empty:
         st.info("Aucun résultat pour ces filtres.")
     else:
-        st.dataframe(df_filtered, hide_index=True, use_container_width=True)
+        # Montants stockés en entiers : format $ à l'affichage
+        argent = {c: st.column_config.NumberColumn(format="$%,.0f")
+                  for c in df_filtered.columns if c not in ("PLAYER", "TEAM", "TM")}
+        st.dataframe(df_filtered, column_config=argent, hide_index=True, use_container_width=True)
+
+
+# -------------------------------
+# Profiling : total du rerun, export des métriques, barre latérale de debug (?debug=1)
+# -------------------------------
+profiling.end_page()
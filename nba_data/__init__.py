@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""Shared data layer for the NBA dashboard pages and the processing pipeline."""
+
+from nba_data.store import (
+    DATASETS,
+    STORE_DIR,
+    read_frame,
+    read_frames,
+    write_frame,
+    write_frames,
+)
+
+__all__ = [
+    "DATASETS",
+    "STORE_DIR",
+    "read_frame",
+    "read_frames",
+    "write_frame",
+    "write_frames",
+]
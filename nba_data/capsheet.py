@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""Cap sheet: every team's payroll for every contract season, as dense matrices.
+
+Salaries are integers in the store (parsed once at ingest, see
+data_processing.pipeline.clean_salaries). The cap sheet takes them as one
+(contracts x seasons) int64 matrix and scatters it into a (teams x seasons)
+payroll matrix, once per store version. A team's payroll for a season is
+then an index lookup; committed years and the payroll change of a trade are
+computed for all teams at once.
+
+Usage:
+    sheet = capsheet.cap_sheet()
+    sheet.payroll_of("Boston Celtics", "2025-26")
+    sheet.committed_years("2025-26")
+    sheet.frame(sheet.post_trade(moves))
+"""
+
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from nba_data import loaders
+
+_lock = threading.Lock()
+
+
+class CapSheet:
+    """Contract salaries and team payrolls over the contract seasons."""
+
+    def __init__(self, salaries: pd.DataFrame, seasons):
+        self.seasons = list(seasons)
+        # (contracts x seasons); parse_money is a plain cast for the integer store columns
+        self.salaries = np.column_stack([loaders.parse_money(salaries[s]).to_numpy() for s in self.seasons])
+        codes, teams = pd.factorize(salaries["TEAM"].astype("object"), sort=True)
+        self.teams = list(teams)
+        self._team_pos = {team: i for i, team in enumerate(self.teams)}
+        self._season_pos = {season: j for j, season in enumerate(self.seasons)}
+
+        # First contract wins when a player is listed twice for the same team
+        self._rows = {}
+        for i, key in enumerate(zip(salaries["TEAM"].astype("object"), salaries["PLAYER"])):
+            self._rows.setdefault(key, i)
+
+        self.payroll = np.zeros((len(self.teams), len(self.seasons)), dtype=np.int64)
+        known = codes >= 0
+        np.add.at(self.payroll, codes[known], self.salaries[known])
+
+    # -------------------------------
+    # Lookups
+    # -------------------------------
+    def payroll_of(self, team: str, season: str) -> int:
+        """Committed payroll of `team` for `season` (0 when unknown)."""
+        i, j = self._team_pos.get(team), self._season_pos.get(season)
+        return 0 if i is None or j is None else int(self.payroll[i, j])
+
+    def committed_years(self, from_season: str = None) -> pd.DataFrame:
+        """COMMITTED_YEARS (seasons >= from_season with payroll > 0) and LAST_SEASON, per team.
+
+        `from_season` defaults to the first contract season (the current one);
+        LAST_SEASON is None for a team with nothing committed from then on.
+        """
+        start = self._season_pos.get(from_season, 0) if from_season is not None else 0
+        seasons = np.array(self.seasons[start:] + [None], dtype=object)
+        committed = self.payroll[:, start:] > 0
+        count = committed.sum(axis=1)
+        # Last committed column = last True of the row; the None sentinel when there is none
+        last = np.where(count > 0, committed.shape[1] - 1 - np.argmax(committed[:, ::-1], axis=1), -1)
+        return pd.DataFrame({"COMMITTED_YEARS": count, "LAST_SEASON": seasons[last]}, index=self.teams)
+
+    def frame(self, matrix: np.ndarray = None) -> pd.DataFrame:
+        """A (teams x seasons) matrix as a DataFrame (default: payroll)."""
+        return pd.DataFrame(self.payroll if matrix is None else matrix, index=self.teams, columns=self.seasons)
+
+    # -------------------------------
+    # Trades
+    # -------------------------------
+    def contract_salaries(self, moves) -> np.ndarray:
+        """(moves x seasons) salaries of the moved players (0 when unknown)."""
+        out = np.zeros((len(moves), len(self.seasons)), dtype=np.int64)
+        for i, move in enumerate(moves):
+            row = self._rows.get((move.from_team, move.player))
+            if row is not None:
+                out[i] = self.salaries[row]
+        return out
+
+    def trade_delta(self, moves) -> np.ndarray:
+        """(teams x seasons) payroll change of every team after `moves`."""
+        moves = list(moves)
+        salaries = self.contract_salaries(moves)
+        senders = np.array([self._team_pos.get(m.from_team, -1) for m in moves], dtype=np.intp)
+        receivers = np.array([self._team_pos.get(m.to_team, -1) for m in moves], dtype=np.intp)
+        ok = (senders >= 0) & (receivers >= 0)
+        delta = np.zeros_like(self.payroll)
+        np.subtract.at(delta, senders[ok], salaries[ok])
+        np.add.at(delta, receivers[ok], salaries[ok])
+        return delta
+
+    def post_trade(self, moves) -> np.ndarray:
+        """(teams x seasons) payroll after `moves`."""
+        return self.payroll + self.trade_delta(moves)
+
+
+@lru_cache(maxsize=1)
+def _cap_sheet(version: str) -> CapSheet:
+    return CapSheet(loaders.frame("df_nba_players_salaries"), loaders.salary_years())
+
+
+def cap_sheet() -> CapSheet:
+    """Cap sheet of the current store version (built once)."""
+    with _lock:
+        return _cap_sheet(loaders.dataset_version())
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""Process-wide cache of Plotly figures.
+
+A figure is keyed by the store version, a chart kind and its parameters, and
+the built Figure is kept in an LRU of MAX_FIGURES entries. A rerun that draws
+an unchanged chart is a dictionary lookup: no Plotly Express build, no JSON
+round trip, no hashing of the frame. The parameters must therefore pin down
+everything the chart's data depends on besides the store (season, team...).
+
+The same Figure is handed to every session: finish it inside `build` and
+treat the returned figure as read-only (st.plotly_chart only reads it).
+
+Usage:
+    fig = figures.figure("bar_leaders", {"stat": "PTS_PG", "season": "2024-25"}, lambda: px.bar(...))
+"""
+
+import threading
+from collections import OrderedDict
+
+from nba_data import loaders
+
+MAX_FIGURES = 256
+
+
+def _freeze(value):
+    """Hashable form of nested params (dicts, lists, sets)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return tuple(sorted(_freeze(v) for v in value))
+    return value
+
+
+class FigureCache:
+    """LRU of built figures."""
+
+    def __init__(self, max_entries: int = MAX_FIGURES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            fig = self._entries.get(key)
+            if fig is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return fig
+
+    def put(self, key, fig):
+        with self._lock:
+            self._entries[key] = fig
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_build(self, key, build):
+        fig = self.get(key)
+        if fig is None:
+            fig = build()
+            self.put(key, fig)
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_cache = FigureCache()
+
+
+def figure(kind: str, params, build, version: str = None):
+    """The figure `build()` returns, from the cache while kind / params / version are unchanged.
+
+    `version` defaults to loaders.store_version(); pass the version of the
+    datasets the chart reads when they are not part of it (e.g. a game-form partition).
+    """
+    key = (version or loaders.store_version(), kind, _freeze(params))
+    return _cache.get_or_build(key, build)
+
+
+def stats() -> dict:
+    return _cache.stats()
+
+
+def clear_cache():
+    _cache.clear()
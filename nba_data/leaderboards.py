@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Precomputed top-N leaderboard index.
+
+For one (season, season type) the qualified players are ranked once, per stat
+(totals, per game, per 36, per 100 poss.), and the row order is kept as an
+int32 array, for all teams and split per team. The index is built once per
+store version and cached; a leaderboard is then a slice of the first k
+positions plus a row gather, whatever the stat, mode or team filter.
+
+Ranking: stat descending, ties broken by PLAYER_NAME, NaN never ranked.
+
+Usage:
+    leaderboards.top("PTS_PG", n=5, season_type="Playoffs")
+    leaderboards.top("AST", n=3, team="Boston Celtics")
+"""
+
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from nba_data import loaders
+
+# Columns that are identifiers, not stats
+ID_COLS = ("PLAYER_ID", "TEAM_ID", "AGE")
+
+_lock = threading.Lock()
+
+
+class LeaderboardIndex:
+    """Rank arrays for every numeric stat of one player frame."""
+
+    def __init__(self, df: pd.DataFrame, team_col: str = "TEAM"):
+        self.frame = df.reset_index(drop=True)
+        self.stats = [c for c in self.frame.select_dtypes("number").columns if c not in ID_COLS]
+        self.order = {}       # stat -> positions, best first
+        self.team_order = {}  # stat -> {team: positions, best first}
+
+        # Names and teams as integer codes once: the per-stat sorts only touch numbers
+        name_rank = pd.factorize(self.frame["PLAYER_NAME"], sort=True)[0]
+        team_codes, self.teams = pd.factorize(self.frame[team_col].astype("object"))
+        self._team_pos = {team: i for i, team in enumerate(self.teams)}
+        for stat in self.stats:
+            values = self.frame[stat].to_numpy(dtype=np.float64, na_value=np.nan)
+            ranked = np.flatnonzero(~np.isnan(values))
+            ranked = ranked[np.lexsort((name_rank[ranked], -values[ranked]))].astype(np.int32)
+            self.order[stat] = ranked
+            self.team_order[stat] = self._split(ranked, team_codes[ranked])
+
+    def _split(self, ranked: np.ndarray, codes: np.ndarray) -> list:
+        """Per-team sub-orders of `ranked` (a stable sort by team keeps the ranking inside each team)."""
+        grouped = ranked[np.argsort(codes, kind="stable")]
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.teams))
+        skip = np.count_nonzero(codes < 0)  # rows without a team sort first
+        return np.split(grouped[skip:], np.cumsum(counts)[:-1])
+
+    def positions(self, stat: str, n: int, team: str = None) -> np.ndarray:
+        if stat not in self.order:
+            raise KeyError(f"No leaderboard for {stat!r}")
+        if team is None:
+            return self.order[stat][:n]
+        pos = self._team_pos.get(team)
+        if pos is None:
+            return self.order[stat][:0]
+        return self.team_order[stat][pos][:n]
+
+    def top(self, stat: str, n: int = 5, team: str = None, columns=("PLAYER_NAME", "TEAM")) -> pd.DataFrame:
+        """Top `n` rows by `stat` -> columns + stat."""
+        cols = [c for c in columns if c != stat] + [stat]
+        return self.frame.take(self.positions(stat, n, team))[cols].reset_index(drop=True)
+
+
+# -------------------------------
+# Cached indexes
+# -------------------------------
+@lru_cache(maxsize=8)
+def _index(version: str, season_type: str, season: str) -> LeaderboardIndex:
+    return LeaderboardIndex(loaders.qualified_players(season_type, season=season))
+
+
+def index(season_type: str = "Regular Season", season: str = None) -> LeaderboardIndex:
+    """The index of the qualified players of one season type (default: current season)."""
+    version = loaders.players_version(season_type, season)
+    with _lock:
+        return _index(version, season_type, season)
+
+
+def top(stat: str, n: int = 5, season_type: str = "Regular Season", season: str = None,
+        team: str = None, columns=("PLAYER_NAME", "TEAM")) -> pd.DataFrame:
+    """Top `n` qualified players by `stat`, optionally within one team."""
+    return index(season_type, season).top(stat, n, team, columns)
+
+
+def clear_cache():
+    _index.cache_clear()
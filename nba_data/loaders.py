@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""Process-wide loaders shared by every page.
+
+Datasets are read once per process and store version, and kept in a single
+cache. Callers receive shallow views that share memory with the cache. The
+Streamlit scripts (home.py, pages/*) turn on pandas copy-on-write, so a page
+that modifies its frame gets a private copy, the shared one is never touched
+and memory stays flat no matter how many pages or sessions are open. This
+module does not change pandas options itself: other callers must not modify
+the returned frames in place.
+
+Multi-season history is read from the season / season type partitions, and
+only the partitions a caller asks for are opened.
+
+Every frame is cast to the dtypes declared in nba_data.schema (categoricals,
+small ints) before it enters the cache; see memory_report().
+
+Recent form (rolling 5/10/20-game means, data_processing.gamelogs) is read
+from its small precomputed frames; they are empty until game logs are ingested.
+"""
+
+import hashlib
+import threading
+from functools import lru_cache
+
+import pandas as pd
+
+from nba_data import names, profiling, schema
+from nba_data.store import DATASETS, excel_path, list_partitions, read_frame, read_partitions, store_path
+
+SEASON_TYPES = ("Regular Season", "Playoffs")
+SALARY_ID_COLS = ("PLAYER", "TEAM", "TM", "GUARANTEED")
+SALARY_PLACEHOLDERS = ["None", "", "-", "—"]
+QUALIFIED = {"gp_over": 10, "min_pg_over": 10}  # GP > 10 & MIN_PG > 10
+TRADE_STAT_COLS = ["POSITION", "AST_PG", "BLK_PG", "AGE", "FG_PCT", "FG3_PCT",
+                   "GP", "MIN", "PLUS_MINUS", "PTS_PG", "REB_PG", "STL_PG", "TOV_PG"]
+
+_PLAYER_DATASETS = {
+    "Regular Season": "df_reg_season_players_filtered",
+    "Playoffs": "df_playoff_players_filtered",
+}
+PLAYER_HISTORY          = "df_players"
+PLAYER_HISTORY_FILTERED = "df_players_filtered"
+FORM_DATASETS           = ("df_player_form", "df_team_form")
+TEAM_GAME_FORM          = "df_team_game_form"
+
+_lock = threading.Lock()
+
+
+# -------------------------------
+# Store version
+# -------------------------------
+def dataset_version(names=DATASETS, store_dir=None) -> str:
+    """Fingerprint (mtime + size) of the store files; changes whenever an export is rewritten."""
+    h = hashlib.sha1()
+    for name in names:
+        path = store_path(name, store_dir)
+        if not path.exists():
+            path = excel_path(name)
+        if path.exists():
+            stat = path.stat()
+            h.update(f"{name}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    return h.hexdigest()[:12]
+
+
+def partition_version(name: str, seasons=None, season_types=None, store_dir=None) -> str:
+    """Same fingerprint, restricted to the selected partitions of a partitioned dataset."""
+    h = hashlib.sha1()
+    for season, season_type, path in list_partitions(name, seasons, season_types, store_dir):
+        stat = path.stat()
+        h.update(f"{season}/{season_type}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    return h.hexdigest()[:12]
+
+
+def store_version() -> str:
+    """dataset_version() + the partition versions: changes whenever anything in the store does."""
+    return dataset_version() + "".join(partition_version(name) for name in (PLAYER_HISTORY, PLAYER_HISTORY_FILTERED))
+
+
+def view(df: pd.DataFrame) -> pd.DataFrame:
+    """Shallow view of a cached frame (copied on write when pandas copy-on-write is on)."""
+    return df.copy(deep=False)
+
+
+# -------------------------------
+# Dtype coercion
+# -------------------------------
+def parse_money(s: pd.Series) -> pd.Series:
+    """'$59,606,817' -> 59606817 (int64, 0 when empty)."""
+    if pd.api.types.is_numeric_dtype(s):  # already parsed at ingest
+        return s.fillna(0).astype("int64")
+    digits = s.astype("string").str.replace(r"[^0-9]", "", regex=True)
+    return pd.to_numeric(digits.replace("", pd.NA), errors="coerce").fillna(0).astype("int64")
+
+
+def to_bool_playoff(x) -> bool:
+    return str(x).strip().lower() in ("*", "true", "1")
+
+
+def _coerce(name: str, df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = [str(c).strip() for c in df.columns]
+    if "PLAYOFF_TEAM" in df.columns and df["PLAYOFF_TEAM"].dtype != bool:
+        df["PLAYOFF_TEAM"] = df["PLAYOFF_TEAM"].map(to_bool_playoff)
+    if name == "df_nba_players_salaries":
+        # Legacy data/*.xlsx exports still hold '$…' strings and placeholders
+        years = [c for c in df.columns if c not in SALARY_ID_COLS and df[c].dtype == object]
+        if years:
+            df[years] = df[years].mask(df[years].isin(SALARY_PLACEHOLDERS))
+    if name == "df_nba_champion" and "RUNNER-UP" in df.columns:
+        df["RUNNER"] = df["RUNNER-UP"]
+    return schema.enforce(name, df)
+
+
+# -------------------------------
+# Process cache (one copy per store version)
+# -------------------------------
+@lru_cache(maxsize=1)
+def _load_all(version: str) -> dict:
+    return {name: _coerce(name, read_frame(name)) for name in DATASETS}
+
+
+def _frames(version: str) -> dict:
+    with _lock:
+        return _load_all(version)
+
+
+@profiling.timed()
+def frame(name: str) -> pd.DataFrame:
+    """Read-only view of one store dataset (e.g. 'df_nba_champion')."""
+    return view(_frames(dataset_version())[name])
+
+
+def memory_report() -> pd.DataFrame:
+    """Deep memory footprint of every cached store dataset (schema dtypes applied)."""
+    return schema.footprint(_frames(dataset_version()))
+
+
+def clear_cache():
+    for fn in (_load_all, _history, _players, _standings, _salaries_long, _trade_pool, _form_frames, _form,
+               _team_game_form):
+        fn.cache_clear()
+
+
+# -------------------------------
+# Season partitions
+# -------------------------------
+def seasons(season_type: str = None) -> list:
+    """Seasons present in the partitioned store, most recent first."""
+    types = None if season_type is None else [season_type]
+    return sorted({p[0] for p in list_partitions(PLAYER_HISTORY_FILTERED, season_types=types)}, reverse=True)
+
+
+@lru_cache(maxsize=16)
+def _history(version: str, name: str, seasons: tuple, season_types: tuple, columns: tuple) -> pd.DataFrame:
+    with _lock:
+        df = read_partitions(name, seasons, season_types, list(columns) if columns else None)
+    return schema.enforce(name, df)
+
+
+@profiling.timed()
+def player_history(seasons=None, season_types=SEASON_TYPES, columns=None, filtered: bool = True) -> pd.DataFrame:
+    """Players of the selected seasons / season types, with SEASON and SEASON_TYPE columns.
+
+    Only the matching partitions are read; each selection is cached per version.
+    """
+    name = PLAYER_HISTORY_FILTERED if filtered else PLAYER_HISTORY
+    seasons = None if seasons is None else tuple(sorted(seasons))
+    season_types = None if season_types is None else tuple(season_types)
+    columns = None if columns is None else tuple(columns)
+    version = partition_version(name, seasons, season_types)
+    return view(_history(version, name, seasons, season_types, columns))
+
+
+# -------------------------------
+# Derived frames
+# -------------------------------
+@lru_cache(maxsize=8)
+def _players(version: str, season_type: str, gp_over: int, min_pg_over: float, season: str = None) -> pd.DataFrame:
+    if season is None:
+        df = _frames(version)[_PLAYER_DATASETS[season_type]]
+    else:
+        df = (_history(version, PLAYER_HISTORY_FILTERED, (season,), (season_type,), None)
+              .drop(columns=["SEASON", "SEASON_TYPE"]))
+    if gp_over or min_pg_over:
+        df = df[(df["GP"] > gp_over) & (df["MIN_PG"] > min_pg_over)].reset_index(drop=True)
+    return df
+
+
+def players_version(season_type: str = "Regular Season", season: str = None) -> str:
+    """Store fingerprint of the data behind players(season_type, season=season)."""
+    if season is None:
+        return dataset_version()
+    return partition_version(PLAYER_HISTORY_FILTERED, (season,), (season_type,))
+
+
+@profiling.timed()
+def players(season_type: str = "Regular Season", gp_over: int = 0, min_pg_over: float = 0,
+            season: str = None) -> pd.DataFrame:
+    """Filtered players (GP > gp_over & MIN_PG > min_pg_over), computed once per version.
+
+    season=None reads the current-season dataset; any other season reads its
+    partition only.
+    """
+    return view(_players(players_version(season_type, season), season_type, gp_over, min_pg_over, season))
+
+
+@profiling.timed()
+def qualified_players(season_type: str = "Regular Season", season: str = None) -> pd.DataFrame:
+    """Players passing the QUALIFIED filter, shared by home and the Statistics page."""
+    return players(season_type, season=season, **QUALIFIED)
+
+
+@lru_cache(maxsize=1)
+def _standings(version: str) -> pd.DataFrame:
+    frames = _frames(version)
+    east = frames["df_eastern_conf_standing"].assign(CONF="Est")
+    west = frames["df_western_conf_standing"].assign(CONF="Ouest")
+    east["RANK"] = range(1, len(east) + 1)
+    west["RANK"] = range(1, len(west) + 1)
+    df = pd.concat([east, west], ignore_index=True)
+    if "PLAYOFF_TEAM" not in df.columns:
+        df["PLAYOFF_TEAM"] = False
+    return df
+
+
+@profiling.timed()
+def standings() -> pd.DataFrame:
+    """East + West union with CONF, RANK and a boolean PLAYOFF_TEAM."""
+    return view(_standings(dataset_version()))
+
+
+def _salary_years(frames: dict) -> list:
+    return [c for c in frames["df_nba_players_salaries"].columns if c not in SALARY_ID_COLS]
+
+
+def salary_years() -> list:
+    """Season columns of the salaries file ('2025-26', ...)."""
+    return _salary_years(_frames(dataset_version()))
+
+
+def build_salaries_long(df_salaries: pd.DataFrame, df_players: pd.DataFrame, years) -> pd.DataFrame:
+    """Melt the salary seasons to rows and join each contract with the player's position / stats."""
+    df_long = df_salaries.melt(
+        id_vars=["PLAYER", "TEAM"],
+        value_vars=list(years),
+        var_name="YEAR",
+        value_name="SALARY",
+    )
+    df_players_slim = df_players[["PLAYER_NAME", "TEAM", "POSITION", "PTS_PG", "AST_PG", "REB_PG"]]
+
+    # Name join keys: 'Nikola Jokić' / 'Nikola Jokic', 'Jimmy Butler III' / 'Jimmy Butler' match
+    df_join = names.merge_on_names(df_long, df_players_slim, "PLAYER", "PLAYER_NAME", on=["TEAM"], how="left")
+    df_join["SALARY_NUM"] = parse_money(df_join["SALARY"])
+    return df_join
+
+
+@lru_cache(maxsize=1)
+def _salaries_long(version: str) -> pd.DataFrame:
+    frames = _frames(version)
+    return build_salaries_long(frames["df_nba_players_salaries"],
+                               _players(version, "Regular Season", **QUALIFIED), _salary_years(frames))
+
+
+@profiling.timed()
+def salaries_long() -> pd.DataFrame:
+    """Long salaries (PLAYER, TEAM, YEAR, SALARY, SALARY_NUM) joined with REG position/stats."""
+    return view(_salaries_long(dataset_version()))
+
+
+def build_trade_pool(df_salaries: pd.DataFrame, df_players: pd.DataFrame, years) -> pd.DataFrame:
+    """Contracts with int64 salaries per season, contract_years and the player's REG stats."""
+    years = list(years)
+    df_salaries = df_salaries.copy()
+    df_salaries["contract_years"] = df_salaries[years].notna().sum(axis=1)
+
+    df_reg_subset = df_players[["PLAYER_NAME", "TEAM"] + TRADE_STAT_COLS]
+    df = names.merge_on_names(df_salaries, df_reg_subset, "PLAYER", "PLAYER_NAME", on=["TEAM"], how="left")
+    for col in years + ["GUARANTEED"]:
+        if col in df.columns:
+            df[col] = parse_money(df[col])
+    return df
+
+
+@lru_cache(maxsize=1)
+def _trade_pool(version: str) -> pd.DataFrame:
+    frames = _frames(version)
+    return build_trade_pool(frames["df_nba_players_salaries"], frames["df_reg_season_players_filtered"],
+                            _salary_years(frames))
+
+
+@profiling.timed()
+def trade_pool() -> pd.DataFrame:
+    """Salaries (int64 per season) + contract_years + REG stats, for the Trade Machine."""
+    return view(_trade_pool(dataset_version()))
+
+
+# -------------------------------
+# Recent form (game logs)
+# -------------------------------
+@lru_cache(maxsize=1)
+def _form_frames(version: str) -> dict:
+    with _lock:
+        return {name: read_frame(name) if store_path(name).exists() else pd.DataFrame(columns=["SEASON", "TEAM"])
+                for name in FORM_DATASETS}
+
+
+@lru_cache(maxsize=8)
+def _form(version: str, name: str, season_type: str, season: str = None) -> pd.DataFrame:
+    df = _form_frames(version)[name]
+    if df.empty:
+        return df
+    season = season or df["SEASON"].max()
+    return df[(df["SEASON"] == season) & (df["SEASON_TYPE"] == season_type)].reset_index(drop=True)
+
+
+@profiling.timed()
+def team_form(season_type: str = "Regular Season", season: str = None) -> pd.DataFrame:
+    """Latest rolling form per team (<stat>_L5 / _L10 / _L20, GP, last GAME_DATE); season=None is the latest."""
+    return view(_form(dataset_version(FORM_DATASETS), "df_team_form", season_type, season))
+
+
+@profiling.timed()
+def player_form(season_type: str = "Regular Season", season: str = None) -> pd.DataFrame:
+    """Latest rolling form per player, same columns as team_form() plus PLAYER_ID / PLAYER_NAME."""
+    return view(_form(dataset_version(FORM_DATASETS), "df_player_form", season_type, season))
+
+
+@lru_cache(maxsize=64)
+def _team_game_form(version: str, team: str, season: str, season_type: str) -> pd.DataFrame:
+    df = _history(version, TEAM_GAME_FORM, (season,), (season_type,), None)
+    return df[df["TEAM"] == team].sort_values("GAME_DATE").reset_index(drop=True)
+
+
+def _game_form_season(season_type: str, season: str = None):
+    """`season`, or the latest season with team game form (None without game logs)."""
+    if season is not None:
+        return season
+    stored = [p[0] for p in list_partitions(TEAM_GAME_FORM, season_types=[season_type])]
+    return max(stored) if stored else None
+
+
+def team_game_form_version(season_type: str = "Regular Season", season: str = None) -> str:
+    """Version of the df_team_game_form partition team_game_form() reads (for cache keys built on it)."""
+    season = _game_form_season(season_type, season)
+    return partition_version(TEAM_GAME_FORM, (season,), (season_type,)) if season else ""
+
+
+@profiling.timed()
+def team_game_form(team: str, season_type: str = "Regular Season", season: str = None) -> pd.DataFrame:
+    """One row per game of `team`: the rolling means as of that game (empty without game logs)."""
+    season = _game_form_season(season_type, season)
+    if season is None:
+        return pd.DataFrame(columns=["GAME_DATE", "TEAM"])
+    version = partition_version(TEAM_GAME_FORM, (season,), (season_type,))
+    return view(_team_game_form(version, team, season, season_type))
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Name normalization shared by the pages, the indexes and the pipeline.
+
+Two forms:
+    normalize('  Nikola Jokić ')      -> 'nikola jokic'   (display-insensitive search)
+    join_key('A.J. Green')            -> 'aj green'       (joins across sources)
+    join_key('Jimmy Butler III')      -> 'jimmy butler'
+
+Both are memoized per raw value, and the column versions factorize first:
+only the distinct values of a column go through the Python function, the
+result is gathered back by code.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Generational suffixes, dropped from join keys (sources disagree on them)
+SUFFIXES = ("jr", "sr", "ii", "iii", "iv", "v")
+
+_PUNCTUATION = re.compile(r"[.'’`,]")
+_SEPARATORS = re.compile(r"[\s\-_]+")
+_SUFFIX = re.compile(r"\s+(?:" + "|".join(SUFFIXES) + r")$")
+
+NAME_KEY = "NAME_KEY"
+
+
+# -------------------------------
+# Scalars (memoized)
+# -------------------------------
+@lru_cache(maxsize=65536)
+def _normalize(value: str) -> str:
+    s = value.strip().casefold()
+    return "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
+
+
+def normalize(value) -> str:
+    """Trimmed, case-folded, accents removed ('' for None / NaN)."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+    return _normalize(str(value))
+
+
+@lru_cache(maxsize=65536)
+def _join_key(value: str) -> str:
+    s = _SEPARATORS.sub(" ", _PUNCTUATION.sub("", _normalize(value))).strip()
+    return _SUFFIX.sub("", s)
+
+
+def join_key(value) -> str:
+    """normalize() without punctuation, hyphens or generational suffix."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+    return _join_key(str(value))
+
+
+# -------------------------------
+# Columns (one call per distinct value)
+# -------------------------------
+def _by_unique(values, func) -> pd.Series:
+    s = pd.Series(values)
+    codes, uniques = pd.factorize(s)
+    mapped = np.array([func(v) for v in uniques] + [""], dtype=object)  # code -1 (NaN) -> ''
+    return pd.Series(mapped[codes], index=s.index, name=s.name)
+
+
+def normalize_column(values) -> pd.Series:
+    return _by_unique(values, normalize)
+
+
+def join_keys(values) -> pd.Series:
+    return _by_unique(values, join_key)
+
+
+def with_join_key(df: pd.DataFrame, col: str, key: str = NAME_KEY) -> pd.DataFrame:
+    """df with a `key` column holding join_keys(df[col])."""
+    return df.assign(**{key: join_keys(df[col]).to_numpy()})
+
+
+def merge_on_names(left: pd.DataFrame, right: pd.DataFrame, left_on: str, right_on: str,
+                   on=(), **kwargs) -> pd.DataFrame:
+    """left.merge(right) on the join keys of two name columns (+ the exact `on` columns).
+
+    The left name column is kept, the right one and the key column are not.
+    """
+    right = with_join_key(right, right_on).drop(columns=right_on)
+    # One row per key on the right, so a merge never duplicates left rows
+    right = right.drop_duplicates([NAME_KEY, *on])
+    merged = with_join_key(left, left_on).merge(right, on=[NAME_KEY, *on], **kwargs)
+    return merged.drop(columns=NAME_KEY)
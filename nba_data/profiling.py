@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""Lightweight per-rerun profiling for the Streamlit pages.
+
+A page calls begin_page() at the top and end_page() at the bottom; named
+stages are timed with span() (context manager) or @timed (decorator). Every
+duration is attributed to the page being rendered on the current thread, so
+a loader called from the Team page is reported under the Team page.
+
+The last SAMPLES durations of each (page, span) are kept in a ring buffer;
+summary() turns them into count / p50 / p95 / p99 / max (ms). end_page()
+exports the summary to METRICS_PATH (JSON, at most every EXPORT_INTERVAL
+seconds) and, when debugging is on (?debug=1 in the URL or NBA_DEBUG=1),
+shows it in the sidebar.
+
+A rerun interrupted by st.stop() has its spans recorded but no page total.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nba_data.store import ROOT_DIR
+
+SAMPLES = 1000
+EXPORT_INTERVAL = 10.0  # seconds
+METRICS_PATH = Path(os.environ.get("NBA_METRICS_PATH", ROOT_DIR / "data" / "metrics" / "profiling.json"))
+PAGE_TOTAL = "rerun"
+NO_PAGE = "-"
+
+_lock = threading.Lock()
+_local = threading.local()
+_samples = defaultdict(lambda: deque(maxlen=SAMPLES))  # (page, span) -> durations (ms)
+_last_export = [0.0]
+
+
+# -------------------------------
+# Recording
+# -------------------------------
+def current_page() -> str:
+    return getattr(_local, "page", NO_PAGE)
+
+
+def record(name: str, ms: float, page: str = None):
+    with _lock:
+        _samples[(page or current_page(), name)].append(ms)
+
+
+@contextmanager
+def span(name: str):
+    """Time the enclosed block as stage `name` of the current page."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - start) * 1000)
+
+
+def timed(name: str = None):
+    """Decorator: time every call of the function as a span (default name: module.function)."""
+    def decorate(func):
+        label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def begin_page(page: str):
+    """Start a rerun of `page`: later spans on this thread are attributed to it."""
+    _local.page = page
+    _local.started = time.perf_counter()
+
+
+def end_page(sidebar: bool = True):
+    """Record the rerun total, export the metrics (throttled), show the debug sidebar if enabled."""
+    started = getattr(_local, "started", None)
+    if started is not None:
+        record(PAGE_TOTAL, (time.perf_counter() - started) * 1000)
+        _local.started = None
+    maybe_export()
+    if sidebar and debug_enabled():
+        debug_sidebar(current_page())
+
+
+# -------------------------------
+# Aggregation + export
+# -------------------------------
+def summary(page: str = None) -> pd.DataFrame:
+    """PAGE, SPAN, COUNT, P50_MS, P95_MS, P99_MS, MAX_MS (one row per recorded span)."""
+    with _lock:
+        items = [(key, np.fromiter(values, dtype=np.float64)) for key, values in _samples.items()
+                 if page is None or key[0] == page]
+    rows = []
+    for (pg, name), values in sorted(items):
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        rows.append({"PAGE": pg, "SPAN": name, "COUNT": len(values), "P50_MS": round(p50, 2),
+                     "P95_MS": round(p95, 2), "P99_MS": round(p99, 2), "MAX_MS": round(values.max(), 2)})
+    return pd.DataFrame(rows, columns=["PAGE", "SPAN", "COUNT", "P50_MS", "P95_MS", "P99_MS", "MAX_MS"])
+
+
+def export(path=None) -> Path:
+    """Write summary() as JSON (atomic replace)."""
+    path = Path(path or METRICS_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "spans": summary().to_dict(orient="records")}
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=1)
+    os.replace(tmp, path)
+    return path
+
+
+def maybe_export(interval: float = EXPORT_INTERVAL):
+    now = time.monotonic()
+    with _lock:
+        if now - _last_export[0] < interval:
+            return
+        _last_export[0] = now
+    try:
+        export()
+    except OSError:
+        pass  # metrics are best effort, never break a page
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+
+
+# -------------------------------
+# Debug sidebar
+# -------------------------------
+def debug_enabled() -> bool:
+    if os.environ.get("NBA_DEBUG") == "1":
+        return True
+    import streamlit as st
+    return st.query_params.get("debug") == "1"
+
+
+def debug_sidebar(page: str = None):
+    import streamlit as st
+    with st.sidebar:
+        st.markdown("### Profiling")
+        st.caption(f"Page : {page or current_page()} — percentiles sur les {SAMPLES} derniers reruns")
+        st.dataframe(summary(page).drop(columns="PAGE"), hide_index=True, use_container_width=True)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Embedded DuckDB query layer over the Parquet store.
+
+Every store dataset is a DuckDB view over its Parquet file(s); the partitioned
+datasets are read with hive partitioning, so a filter on season / season type
+only opens the matching files. Nothing is loaded into pandas except the rows a
+query returns.
+
+Values are bound as DuckDB parameters (? placeholders), never rendered into
+the SQL; identifiers are checked against the view's columns before they are
+quoted. Each thread gets its own cursor, and the views are rebuilt when the
+store version changes.
+
+Player leaderboards are served by nba_data.leaderboards.
+
+Usage:
+    query.team_leaderboard("DRTG", n=10, ascending=True)
+"""
+
+import threading
+
+import duckdb
+import pandas as pd
+
+from nba_data.loaders import store_version
+from nba_data.store import DATASETS, PARTITIONED_DATASETS, STORE_DIR, list_partitions, store_path
+
+TEAM_RATINGS = "df_nba_team_reg_season_ratings"
+
+_lock = threading.Lock()
+_local = threading.local()
+_db = {"version": None, "con": None, "columns": {}}
+
+
+# -------------------------------
+# Connection + views
+# -------------------------------
+def _sql_path(path) -> str:
+    return str(path).replace("'", "''")
+
+
+def _create_views(con, store_dir=STORE_DIR) -> dict:
+    """One view per dataset present in the store; returns {view: [columns]}."""
+    for name in DATASETS:
+        path = store_path(name, store_dir)
+        if path.exists():
+            con.execute(f"CREATE OR REPLACE VIEW {name} AS "
+                        f"SELECT * FROM read_parquet('{_sql_path(path)}')")
+    for name in PARTITIONED_DATASETS:
+        if list_partitions(name, store_dir=store_dir):
+            glob = store_dir / name / "*" / "*" / "*.parquet"
+            con.execute(f"CREATE OR REPLACE VIEW {name} AS "
+                        f"SELECT * FROM read_parquet('{_sql_path(glob)}', hive_partitioning = true, "
+                        f"union_by_name = true)")
+    views = con.execute("SELECT view_name FROM duckdb_views() WHERE NOT internal").fetchall()
+    return {v: [r[0] for r in con.execute(f"DESCRIBE {v}").fetchall()] for (v,) in views}
+
+
+def connection():
+    """This thread's cursor on the current store version (views rebuilt on change)."""
+    version = store_version()
+    if getattr(_local, "version", None) != version:
+        with _lock:
+            if _db["version"] != version:
+                con = duckdb.connect()
+                _db.update(version=version, con=con, columns=_create_views(con))
+            _local.con = _db["con"].cursor()
+            _local.version = version
+    return _local.con
+
+
+def columns(view: str) -> list:
+    connection()
+    return list(_db["columns"].get(view, []))
+
+
+def _column(view: str, col: str) -> str:
+    """Quoted identifier, after checking it is a real column (never interpolate user input)."""
+    if col not in _db["columns"].get(view, ()):
+        raise KeyError(f"{view} has no column {col!r}")
+    return '"' + col.replace('"', '""') + '"'
+
+
+def _execute(sql: str, params: list) -> pd.DataFrame:
+    """Run `sql` on this thread's cursor with `params` bound to its ? placeholders."""
+    cur = connection().execute(sql, params)
+    return pd.DataFrame(cur.fetchall(), columns=[d[0] for d in cur.description])
+
+
+# -------------------------------
+# Leaderboards
+# -------------------------------
+def team_leaderboard(stat: str, n: int = 10, ascending: bool = False, dataset: str = TEAM_RATINGS) -> pd.DataFrame:
+    """Top `n` teams of a team dataset -> TEAM + stat (ascending=True for DRTG)."""
+    connection()
+    stat_col = _column(dataset, stat)
+    order = "ASC" if ascending else "DESC"
+    sql = f"SELECT TEAM, {stat_col} FROM {dataset} ORDER BY {stat_col} {order}, TEAM LIMIT ?"
+    return _execute(sql, [int(n)])
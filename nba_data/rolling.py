@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Streaming rolling-window averages over game logs (recent form).
+
+RollingForm keeps, per key (a player or a team within a season and season
+type), only its last max(windows) games. update(games) merges a batch of
+new games with the kept tail of the keys that played and returns the
+rolling means as of each new game; the other keys are not touched. A nightly
+batch costs O(new games + keys that played x 20), never a season recompute.
+
+The means come from running sums over tail + batch: sum of the last w games
+= cumsum - cumsum shifted by w, within each key. A key with fewer than w
+games gets the mean of the games it has (GP tells how many).
+
+Games are expected in date order per key. A late game older than the kept
+tail is folded in at its date for the following windows, the means already
+emitted are not revised (replay the season to rebuild them).
+
+Usage:
+    engine = RollingForm(["SEASON", "SEASON_TYPE", "PLAYER_ID"], labels=["PLAYER_NAME", "TEAM"])
+    per_game = engine.update(new_logs)     # <stat>_L5 / _L10 / _L20 as of each new game
+    engine.form                            # latest row per key
+    engine.state                           # tail to persist until the next batch
+"""
+
+import numpy as np
+import pandas as pd
+
+WINDOWS = (5, 10, 20)
+ORDER = ["GAME_DATE", "GAME_ID"]
+PLAYER_STATS = ("MIN", "PTS", "REB", "AST", "STL", "BLK", "TOV", "FG3M", "PLUS_MINUS")
+TEAM_STATS = ("PTS", "REB", "AST", "STL", "BLK", "TOV", "FG3M", "PLUS_MINUS", "W")
+
+
+def _concat(frames: list, columns: list) -> pd.DataFrame:
+    """pd.concat without the empty frames (an empty state has object columns)."""
+    frames = [f for f in frames if len(f)]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def window_col(stat: str, window: int) -> str:
+    """'PTS', 5 -> 'PTS_L5'."""
+    return f"{stat}_L{window}"
+
+
+class RollingForm:
+    """Rolling means over the last `windows` games per key, updated one batch of games at a time."""
+
+    def __init__(self, keys, stats=PLAYER_STATS, windows=WINDOWS, labels=(), state: pd.DataFrame = None,
+                 form: pd.DataFrame = None):
+        self.keys = list(keys)
+        self.stats = list(stats)
+        self.windows = tuple(sorted(windows))
+        self.labels = [c for c in labels if c not in self.keys]
+        self.depth = self.windows[-1]
+        self._state_cols = self.keys + ORDER + ["GP"] + self.stats
+        self._out_cols = (self.keys + self.labels + ORDER + ["GP"]
+                          + [window_col(s, w) for w in self.windows for s in self.stats])
+        self.state = pd.DataFrame(columns=self._state_cols) if state is None else state[self._state_cols]
+        self.form = pd.DataFrame(columns=self._out_cols) if form is None else form[self._out_cols]
+
+    def _split(self, frame: pd.DataFrame, touched: pd.MultiIndex) -> tuple:
+        """(rows of the touched keys, the other rows)."""
+        hit = pd.MultiIndex.from_frame(frame[self.keys]).isin(touched)
+        return frame[hit], frame[~hit]
+
+    def update(self, games: pd.DataFrame) -> pd.DataFrame:
+        """Add a batch of games; returns keys, labels, GAME_DATE, GAME_ID, GP and <stat>_L<w> for each of them."""
+        if games.empty:
+            return pd.DataFrame(columns=self._out_cols)
+        new = games[self.keys + self.labels + ORDER + self.stats].copy()
+        new["GP"] = np.nan
+        new["_NEW"] = True
+        touched = pd.MultiIndex.from_frame(new[self.keys]).unique()
+        tail, rest = self._split(self.state, touched)
+
+        combined = _concat([tail.assign(_NEW=False), new], [])
+        combined = combined.sort_values(self.keys + ORDER, kind="stable").reset_index(drop=True)
+        # Every later groupby runs on one integer code per key
+        groups = combined.groupby(self.keys, sort=False, observed=True)
+        code = groups.ngroup().to_numpy()
+        rank = groups.cumcount()
+        # Games played: the tail carries the key's running count, new keys start at 1
+        offset = (combined["GP"].astype("float64") - rank).groupby(code).transform("max")
+        combined["GP"] = (rank + offset.fillna(1)).astype("int64")
+
+        running = combined[self.stats].astype("float64").groupby(code).cumsum()
+        is_new = combined["_NEW"].to_numpy(dtype=bool)
+        out = combined.loc[is_new, self.keys + self.labels + ORDER + ["GP"]]
+        for w in self.windows:
+            before = running.groupby(code).shift(w).fillna(0)
+            n = (rank + 1).clip(upper=w)
+            means = (running - before).div(n, axis=0)[is_new].round(2)
+            means.columns = [window_col(s, w) for s in self.stats]
+            out = out.join(means)
+        latest = out.groupby(code[is_new], sort=False).tail(1)[self._out_cols]
+        out = out[self._out_cols].reset_index(drop=True)
+
+        kept = combined.groupby(code, sort=False).tail(self.depth)[self._state_cols]
+        self.state = _concat([rest, kept], self._state_cols)
+        self.form = _concat([self._split(self.form, touched)[1], latest], self._out_cols)
+        return out
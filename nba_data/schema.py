@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Declared dtypes for the store datasets, enforced by the loaders.
+
+Team / position labels become categoricals, counting stats small integers and
+percentages float32. The rounded rate columns (*_PG, *_P36, *_P100) stay
+float64: they are displayed as-is, and float32 cannot hold 22.1 exactly
+(Plotly labels would print 22.100000381).
+
+A cast that would lose data (NaN in an integer column, value out of range) is
+skipped and the column keeps its stored dtype (e.g. W / L of the 'League
+Average' row in the playoff team stats).
+
+Memory report:
+    python -m nba_data.schema
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+CATEGORY = "category"
+
+COUNTING_STATS = ['FGM', 'FGA', 'FG3M', 'FG3A', 'FTM', 'FTA', 'PTS',
+                  'OREB', 'DREB', 'REB', 'AST', 'TOV', 'STL', 'BLK', 'PLUS_MINUS']
+
+PLAYER_SCHEMA = {
+    "SEASON": CATEGORY,
+    "SEASON_TYPE": CATEGORY,
+    "PLAYER_ID": "int32",
+    "TM": CATEGORY,
+    "TEAM": CATEGORY,
+    "NICKNAME": CATEGORY,
+    "TEAM_ABBREVIATION": CATEGORY,
+    "POS": CATEGORY,
+    "POSITION": CATEGORY,
+    "AGE": "int8",
+    "GP": "int16",
+    "W": "int16",
+    "L": "int16",
+    "W_PCT": "float32",
+    "FG_PCT": "float32",
+    "FG3_PCT": "float32",
+    "FT_PCT": "float32",
+    **{stat: "int16" for stat in COUNTING_STATS},
+}
+
+# One row per team: TEAM / TM are unique, a categorical would only add overhead
+TEAM_SCHEMA = {
+    "CONF": CATEGORY,
+    "DIV": CATEGORY,
+    "G": "int16",
+    "W": "int16",
+    "L": "int16",
+}
+
+SALARY_SCHEMA = {
+    "TEAM": CATEGORY,
+    "TM": CATEGORY,
+}
+
+SCHEMAS = {
+    "df_reg_season_players": PLAYER_SCHEMA,
+    "df_playoff_players": PLAYER_SCHEMA,
+    "df_reg_season_players_filtered": PLAYER_SCHEMA,
+    "df_playoff_players_filtered": PLAYER_SCHEMA,
+    "df_players": PLAYER_SCHEMA,
+    "df_players_filtered": PLAYER_SCHEMA,
+    "df_western_conf_standing": TEAM_SCHEMA,
+    "df_eastern_conf_standing": TEAM_SCHEMA,
+    "df_nba_team_playoff_stats_pg": TEAM_SCHEMA,
+    "df_nba_team_playoff_advanced_stats": TEAM_SCHEMA,
+    "df_nba_team_reg_season_ratings": TEAM_SCHEMA,
+    "df_nba_players_salaries": SALARY_SCHEMA,
+}
+
+
+# -------------------------------
+# Enforcement
+# -------------------------------
+def _fits(s: pd.Series, dtype: str) -> bool:
+    target = np.dtype(dtype)
+    if target.kind not in "iu":
+        return True
+    if s.isna().any():
+        return False
+    values = s.to_numpy()
+    if values.dtype.kind == "f" and not np.array_equal(values, np.round(values)):
+        return False
+    info = np.iinfo(target)
+    return len(values) == 0 or (values.min() >= info.min and values.max() <= info.max)
+
+
+def enforce(name: str, df: pd.DataFrame, schema=None) -> pd.DataFrame:
+    """Cast the columns of `df` declared in the schema of dataset `name` (in place, returns df)."""
+    schema = SCHEMAS.get(name, {}) if schema is None else schema
+    for col, dtype in schema.items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+        if dtype == CATEGORY or _fits(df[col], dtype):
+            df[col] = df[col].astype(dtype)
+        else:
+            log.debug("%s.%s kept as %s (does not fit %s)", name, col, df[col].dtype, dtype)
+    return df
+
+
+# -------------------------------
+# Memory footprint
+# -------------------------------
+def footprint(frames: dict) -> pd.DataFrame:
+    """Rows, columns and deep memory usage per dataset."""
+    rows = []
+    for name, df in frames.items():
+        size = int(df.memory_usage(deep=True, index=False).sum())
+        rows.append({"DATASET": name, "ROWS": len(df), "COLUMNS": df.shape[1],
+                     "BYTES": size, "BYTES_PER_ROW": round(size / max(len(df), 1), 1)})
+    return pd.DataFrame(rows)
+
+
+def compare(raw: dict, compact: dict) -> pd.DataFrame:
+    """Footprint of the stored dtypes vs the enforced schema, per dataset."""
+    before = footprint(raw).set_index("DATASET")
+    after = footprint(compact).set_index("DATASET")
+    report = before[["ROWS", "COLUMNS"]].assign(
+        STORED_BYTES=before["BYTES"],
+        SCHEMA_BYTES=after["BYTES"],
+        BYTES_PER_ROW=after["BYTES_PER_ROW"],
+    )
+    report["SAVED_PCT"] = (100 * (1 - report["SCHEMA_BYTES"] / report["STORED_BYTES"])).round(1)
+    return report.reset_index()
+
+
+if __name__ == "__main__":
+    from nba_data.store import DATASETS, read_frame
+
+    raw = {name: read_frame(name) for name in DATASETS}
+    compact = {name: enforce(name, df.copy()) for name, df in raw.items()}
+    report = compare(raw, compact)
+    print(report.to_string(index=False))
+    total_before, total_after = report["STORED_BYTES"].sum(), report["SCHEMA_BYTES"].sum()
+    print(f"\nTotal: {total_before / 1e6:.2f} MB -> {total_after / 1e6:.2f} MB "
+          f"({100 * (1 - total_after / total_before):.1f}% saved)")
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Inverted indexes for the filters of the history pages.
+
+An index maps, per field, each normalized term to the sorted ids of the rows
+that contain it. A field can span several columns (a player is matched in
+FINALS_MVP, POINTS, REBOUNDS or ASSISTS), and cells such as
+'N. Jokić (600)' are indexed under the name alone. Filters are posting-list
+intersections; nothing is split or compared per row at query time.
+
+The champions index is built once per store version.
+
+Usage:
+    ix = search.champions_index()
+    rows = ix.search(CHAMPION="Boston Celtics", PLAYER="L. Bird")
+"""
+
+import re
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from nba_data import loaders, names
+
+# 'N. Jokić (600)' -> 'N. Jokić'
+_STAT_SUFFIX = re.compile(r"\s*\([^)]*\)\s*$")
+
+# field -> columns it covers
+CHAMPION_FIELDS = {
+    "YEAR": ["YEAR"],
+    "CHAMPION": ["CHAMPION"],
+    "RUNNER": ["RUNNER"],
+    "PLAYER": ["FINALS_MVP", "POINTS", "REBOUNDS", "ASSISTS"],
+}
+
+_lock = threading.Lock()
+
+
+def _label(value):
+    return _STAT_SUFFIX.sub("", value) if isinstance(value, str) else value
+
+
+class InvertedIndex:
+    """{field: {term: row ids}} over a frame, with the display label of each term."""
+
+    def __init__(self, df: pd.DataFrame, fields: dict):
+        self.frame = df.reset_index(drop=True)
+        self.postings = {}
+        self.labels = {}
+        for field, columns in fields.items():
+            self._build(field, columns)
+
+    def _build(self, field: str, columns):
+        codes, rows, labels = [], [], []
+        for col in columns:
+            values = self.frame[col].map(_label) if self.frame[col].dtype == object else self.frame[col]
+            col_codes, uniques = pd.factorize(values)  # NaN -> -1, normalized once per distinct value
+            keep = col_codes >= 0
+            codes.append(col_codes[keep] + len(labels))
+            rows.append(np.flatnonzero(keep))
+            labels.extend(uniques)
+        codes = np.concatenate(codes) if codes else np.empty(0, dtype=np.intp)
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.intp)
+
+        # Distinct labels -> terms; several labels can share a term ('Jokic' / 'Jokić')
+        term_codes, terms = pd.factorize(names.normalize_column(pd.Series(labels, dtype="object")))
+        term_of_row = term_codes[codes]
+        order = np.lexsort((rows, term_of_row))
+        sorted_terms, sorted_rows = term_of_row[order], rows[order]
+        bounds = np.flatnonzero(np.diff(sorted_terms)) + 1
+        self.postings[field] = {}
+        if len(order):
+            for term_code, ids in zip(sorted_terms[np.r_[0, bounds]], np.split(sorted_rows, bounds)):
+                self.postings[field][terms[term_code]] = np.unique(ids).astype(np.int32)
+
+        # First label seen is the display label of a term
+        first = {}
+        for label, term_code in zip(labels, term_codes):
+            first.setdefault(terms[term_code], label)
+        self.labels[field] = first
+
+    def options(self, field: str, reverse: bool = False) -> list:
+        """Sorted display labels of the terms of `field`."""
+        return sorted(self.labels[field].values(), reverse=reverse)
+
+    def rows(self, field: str, value) -> np.ndarray:
+        return self.postings[field].get(names.normalize(_label(value)), np.empty(0, dtype=np.int32))
+
+    def search(self, **filters) -> np.ndarray:
+        """Row ids matching every {field: value} (AND); None values are ignored."""
+        lists = [self.rows(field, value) for field, value in filters.items() if value is not None]
+        if not lists:
+            return np.arange(len(self.frame), dtype=np.int32)
+        lists.sort(key=len)  # intersect from the shortest list
+        result = lists[0]
+        for ids in lists[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, ids, assume_unique=True)
+        return result
+
+    def take(self, rows) -> pd.DataFrame:
+        return self.frame.take(rows)
+
+
+@lru_cache(maxsize=1)
+def _champions_index(version: str) -> InvertedIndex:
+    return InvertedIndex(loaders.frame("df_nba_champion"), CHAMPION_FIELDS)
+
+
+def champions_index() -> InvertedIndex:
+    """Index of the champions history (year, champion, runner-up, player)."""
+    with _lock:
+        return _champions_index(loaders.dataset_version())
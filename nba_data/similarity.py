@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Player similarity: "players most like X".
+
+Players are points in a standardized feature space (per-game production +
+shooting, z-scored over the corpus; a missing value sits at the mean). The
+index precomputes the K nearest neighbours of every row, block by block so
+memory stays (block x n), once per store version: "most similar to a player
+of the corpus" is a row read. Arbitrary vectors are answered by one
+matrix-vector product + argpartition over the float32 matrix.
+
+The corpus is one season (index()) or every player-season of the history
+(history_index()).
+
+Usage:
+    similarity.index().similar("Jayson Tatum", n=5)
+"""
+
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from nba_data import loaders
+
+FEATURES = ["PTS_PG", "REB_PG", "AST_PG", "STL_PG", "BLK_PG", "TOV_PG",
+            "FG_PCT", "FG3_PCT", "FT_PCT", "MIN_PG"]
+K = 20         # neighbours precomputed per row
+BLOCK = 512    # rows per distance block
+
+_lock = threading.Lock()
+
+
+class SimilarityIndex:
+    """Standardized feature matrix + precomputed K nearest neighbours."""
+
+    def __init__(self, df: pd.DataFrame, features=FEATURES, k: int = K, block: int = BLOCK):
+        self.frame = df.reset_index(drop=True)
+        self.features = [f for f in features if f in self.frame.columns]
+        x = self.frame[self.features].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.mean = np.nanmean(x, axis=0) if len(x) else np.zeros(len(self.features))
+        std = np.nanstd(x, axis=0) if len(x) else np.ones(len(self.features))
+        self.std = np.where(std > 0, std, 1.0)
+        self.z = np.nan_to_num((x - self.mean) / self.std).astype(np.float32)
+        self._sq = (self.z ** 2).sum(axis=1)
+        self.k = min(k, max(len(self.frame) - 1, 0))
+        self.neighbors, self.distances = self._knn(block)
+
+        self._rows = {}
+        for i, (name, team) in enumerate(zip(self.frame["PLAYER_NAME"], self.frame["TEAM"].astype("object"))):
+            self._rows.setdefault((name, None), i)
+            self._rows.setdefault((name, team), i)
+
+    def _distances(self, rows: np.ndarray) -> np.ndarray:
+        """Squared distances (len(rows) x n) via |a|^2 + |b|^2 - 2ab."""
+        d2 = self._sq[rows, None] + self._sq[None, :] - 2.0 * (self.z[rows] @ self.z.T)
+        return np.maximum(d2, 0)
+
+    def _knn(self, block: int):
+        n, k = len(self.frame), self.k
+        neighbors = np.zeros((n, k), dtype=np.int32)
+        distances = np.zeros((n, k), dtype=np.float32)
+        if k == 0:
+            return neighbors, distances
+        for start in range(0, n, block):
+            rows = np.arange(start, min(start + block, n))
+            d2 = self._distances(rows)
+            d2[np.arange(len(rows)), rows] = np.inf  # a row is not its own neighbour
+            near = np.argpartition(d2, k - 1, axis=1)[:, :k]
+            near_d = np.take_along_axis(d2, near, axis=1)
+            order = np.argsort(near_d, axis=1, kind="stable")
+            neighbors[rows] = np.take_along_axis(near, order, axis=1)
+            distances[rows] = np.sqrt(np.take_along_axis(near_d, order, axis=1))
+        return neighbors, distances
+
+    # -------------------------------
+    # Queries
+    # -------------------------------
+    def locate(self, player: str, team: str = None) -> int:
+        """Row of `player` (first match when `team` is None); KeyError when absent."""
+        return self._rows[(player, team)]
+
+    def _result(self, rows, distances, columns) -> pd.DataFrame:
+        cols = [c for c in columns if c in self.frame.columns]
+        out = self.frame.take(rows)[cols + self.features].reset_index(drop=True)
+        out.insert(len(cols), "DISTANCE", np.round(np.asarray(distances, dtype=np.float64), 2))
+        return out
+
+    def similar(self, player: str, n: int = 5, team: str = None,
+                columns=("PLAYER_NAME", "TEAM", "SEASON")) -> pd.DataFrame:
+        """The `n` players closest to `player`, nearest first, with DISTANCE."""
+        row = self.locate(player, team)
+        if n <= self.k:
+            return self._result(self.neighbors[row, :n], self.distances[row, :n], columns)
+        d2 = self._distances(np.array([row]))[0]
+        d2[row] = np.inf
+        near = np.argsort(d2, kind="stable")[:min(n, len(d2) - 1)]
+        return self._result(near, np.sqrt(d2[near]), columns)
+
+    def query(self, values: dict, n: int = 5, columns=("PLAYER_NAME", "TEAM", "SEASON")) -> pd.DataFrame:
+        """The `n` players closest to a profile {feature: value} (missing features = league mean)."""
+        z = np.array([(values.get(f, m) - m) / s for f, m, s in zip(self.features, self.mean, self.std)],
+                     dtype=np.float32)
+        d2 = np.maximum(self._sq + (z ** 2).sum() - 2.0 * (self.z @ z), 0)
+        n = min(n, len(d2))
+        near = np.argpartition(d2, n - 1)[:n] if n < len(d2) else np.arange(len(d2))
+        near = near[np.argsort(d2[near], kind="stable")]
+        return self._result(near, np.sqrt(d2[near]), columns)
+
+
+# -------------------------------
+# Cached indexes
+# -------------------------------
+@lru_cache(maxsize=4)
+def _index(version: str, season_type: str, season: str, gp_over: int, min_pg_over: float) -> SimilarityIndex:
+    return SimilarityIndex(loaders.players(season_type, gp_over, min_pg_over, season=season))
+
+
+def index(season_type: str = "Regular Season", season: str = None,
+          gp_over: int = loaders.QUALIFIED["gp_over"],
+          min_pg_over: float = loaders.QUALIFIED["min_pg_over"]) -> SimilarityIndex:
+    """Index of the players of one season (default: current season, qualified players)."""
+    version = loaders.players_version(season_type, season)
+    with _lock:
+        return _index(version, season_type, season, gp_over, min_pg_over)
+
+
+@lru_cache(maxsize=2)
+def _history_index(version: str, season_type: str) -> SimilarityIndex:
+    df = loaders.player_history(season_types=(season_type,))
+    df = df[(df["GP"] > loaders.QUALIFIED["gp_over"]) & (df["MIN_PG"] > loaders.QUALIFIED["min_pg_over"])]
+    return SimilarityIndex(df)
+
+
+def history_index(season_type: str = "Regular Season") -> SimilarityIndex:
+    """Index of every qualified player-season of the partitioned history."""
+    version = loaders.partition_version(loaders.PLAYER_HISTORY_FILTERED, season_types=(season_type,))
+    with _lock:
+        return _history_index(version, season_type)
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""Columnar store (Parquet) for the processed df_* frames.
+
+The pipeline writes every frame to ``data/store/<name>.parquet``; the Excel
+workbooks in ``data/`` are only an optional, human-readable side output.
+
+Multi-season player data is partitioned by season and season type:
+``data/store/<name>/season=2024-25/season_type=playoffs/part-0.parquet``.
+Readers only open the partitions they ask for. Append-only datasets (game
+logs) add one ``part-<n>.parquet`` per batch to a partition and never rewrite
+the earlier parts; readers concatenate the parts in order.
+
+NBA_STORE_DIR points the app at another store (e.g. one written by
+``python -m data_processing.synthetic``).
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+# -------------------------------
+# Config
+# -------------------------------
+ROOT_DIR  = Path(__file__).resolve().parent.parent
+DATA_DIR  = ROOT_DIR / "data"
+STORE_DIR = Path(os.environ.get("NBA_STORE_DIR") or DATA_DIR / "store")  # e.g. a synthetic league
+
+DATASETS = (
+    "df_western_conf_standing",
+    "df_eastern_conf_standing",
+    "df_nba_team_playoff_stats_pg",
+    "df_nba_team_playoff_advanced_stats",
+    "df_nba_players_salaries",
+    "df_nba_team_reg_season_ratings",
+    "df_nba_champion",
+    "df_reg_season_players",
+    "df_playoff_players",
+    "df_reg_season_players_filtered",
+    "df_playoff_players_filtered",
+)
+
+# Partitioned (multi-season) datasets
+PARTITIONED_DATASETS = (
+    "df_players",
+    "df_players_filtered",
+    "df_game_logs",
+)
+SEASON_TYPE_SLUGS = {
+    "Regular Season": "regular_season",
+    "Playoffs": "playoffs",
+}
+_SLUG_SEASON_TYPES = {v: k for k, v in SEASON_TYPE_SLUGS.items()}
+
+
+# -------------------------------
+# Paths
+# -------------------------------
+def dataset_name(path) -> str:
+    """'data/df_x.xlsx' -> 'df_x' (accepts a bare name as well)."""
+    return Path(str(path)).stem
+
+
+def store_path(name: str, store_dir=None) -> Path:
+    return Path(store_dir or STORE_DIR) / f"{dataset_name(name)}.parquet"
+
+
+def excel_path(name: str, data_dir=None) -> Path:
+    return Path(data_dir or DATA_DIR) / f"{dataset_name(name)}.xlsx"
+
+
+# -------------------------------
+# Write
+# -------------------------------
+def write_frame(df: pd.DataFrame, name: str, store_dir=None, excel: bool = False, data_dir=None) -> Path:
+    """Write one frame to the Parquet store (and optionally to data/<name>.xlsx)."""
+    path = store_path(name, store_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    out = df.copy()
+    out.columns = [str(c) for c in out.columns]  # Parquet only accepts string column names
+    out.to_parquet(path, index=False, engine="pyarrow")
+
+    if excel:
+        df.to_excel(excel_path(name, data_dir), index=False)
+    return path
+
+
+def write_frames(frames: dict, store_dir=None, excel: bool = False, data_dir=None) -> list:
+    """Write a {name or path: DataFrame} mapping; returns the Parquet paths written."""
+    return [write_frame(df, name, store_dir, excel, data_dir) for name, df in frames.items()]
+
+
+# -------------------------------
+# Read
+# -------------------------------
+def read_frame(name: str, columns=None, store_dir=None, data_dir=None) -> pd.DataFrame:
+    """Load a dataset from the Parquet store, falling back to the Excel export."""
+    path = store_path(name, store_dir)
+    if path.exists():
+        return pd.read_parquet(path, columns=columns, engine="pyarrow")
+
+    xlsx = excel_path(name, data_dir)
+    if not xlsx.exists():
+        raise FileNotFoundError(f"Dataset '{dataset_name(name)}' not found in {path.parent} or {xlsx.parent}")
+    return pd.read_excel(xlsx, usecols=columns)
+
+
+def read_frames(names, store_dir=None, data_dir=None) -> dict:
+    return {dataset_name(n): read_frame(n, store_dir=store_dir, data_dir=data_dir) for n in names}
+
+
+# -------------------------------
+# Partitions (season / season type)
+# -------------------------------
+def partition_path(name: str, season: str, season_type: str, store_dir=None) -> Path:
+    return (Path(store_dir or STORE_DIR) / name / f"season={season}"
+            / f"season_type={SEASON_TYPE_SLUGS[season_type]}" / "part-0.parquet")
+
+
+def write_partition(df: pd.DataFrame, name: str, season: str, season_type: str, store_dir=None) -> Path:
+    """Replace one (season, season type) partition; SEASON/SEASON_TYPE live in the path only."""
+    path = partition_path(name, season, season_type, store_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    out = df.drop(columns=["SEASON", "SEASON_TYPE"], errors="ignore")
+    out.columns = [str(c) for c in out.columns]
+    out.to_parquet(path, index=False, engine="pyarrow")
+    return path
+
+
+def _part_number(path: Path) -> int:
+    return int(path.stem.split("-", 1)[1])
+
+
+def partition_parts(name: str, season: str, season_type: str, store_dir=None) -> list:
+    """Part files of one partition, in the order they were written."""
+    folder = partition_path(name, season, season_type, store_dir).parent
+    return sorted(folder.glob("part-*.parquet"), key=_part_number)
+
+
+def append_partition(df: pd.DataFrame, name: str, season: str, season_type: str, store_dir=None) -> Path:
+    """Add `df` as the next part of a (season, season type) partition; earlier parts are left untouched."""
+    parts = partition_parts(name, season, season_type, store_dir)
+    path = partition_path(name, season, season_type, store_dir)
+    path = path.with_name(f"part-{_part_number(parts[-1]) + 1 if parts else 0}.parquet")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    out = df.drop(columns=["SEASON", "SEASON_TYPE"], errors="ignore")
+    out.columns = [str(c) for c in out.columns]
+    out.to_parquet(path, index=False, engine="pyarrow")
+    return path
+
+
+def list_partitions(name: str, seasons=None, season_types=None, store_dir=None) -> list:
+    """[(season, season_type, path)] sorted by season, then part, optionally restricted."""
+    root = Path(store_dir or STORE_DIR) / name
+    found = []
+    for path in root.glob("season=*/season_type=*/part-*.parquet"):
+        season = path.parent.parent.name.split("=", 1)[1]
+        season_type = _SLUG_SEASON_TYPES.get(path.parent.name.split("=", 1)[1])
+        if season_type is None:
+            continue
+        if seasons is not None and season not in seasons:
+            continue
+        if season_types is not None and season_type not in season_types:
+            continue
+        found.append((season, season_type, path))
+    return sorted(found, key=lambda p: (p[0], p[1], _part_number(p[2])))
+
+
+def read_partitions(name: str, seasons=None, season_types=None, columns=None, store_dir=None) -> pd.DataFrame:
+    """Concatenate only the requested partitions, with SEASON and SEASON_TYPE columns added."""
+    parts = []
+    for season, season_type, path in list_partitions(name, seasons, season_types, store_dir):
+        df = pd.read_parquet(path, columns=columns, engine="pyarrow")
+        df.insert(0, "SEASON_TYPE", season_type)
+        df.insert(0, "SEASON", season)
+        parts.append(df)
+    if not parts:
+        return pd.DataFrame(columns=["SEASON", "SEASON_TYPE"] + list(columns or []))
+    return pd.concat(parts, ignore_index=True)
+
+
+def convert_excel_outputs(data_dir=None, store_dir=None) -> list:
+    """One-off migration: copy every data/df_*.xlsx into the Parquet store."""
+    written = []
+    for xlsx in sorted(Path(data_dir or DATA_DIR).glob("df_*.xlsx")):
+        written.append(write_frame(pd.read_excel(xlsx), xlsx.stem, store_dir))
+    return written
+
+
+if __name__ == "__main__":
+    for p in convert_excel_outputs():
+        print(f"Converted: {p}")
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""Canonical team table: franchise ids, abbreviations, names, conference, aliases.
+
+Every team reference in the data (nba_api abbreviations, Basketball-Reference
+codes such as PHO / BRK / CHO, full names, historical franchise names) is
+resolved through one alias index. Lookups are a categorical join: values are
+hashed once against the alias categories and the result columns are taken by
+code, with no per-row Python.
+
+Historical names keep their own abbreviation and name (Seattle SuperSonics ->
+SEA) but carry the TEAM_ID of the franchise today (OKC).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+UNKNOWN = "Unknown"
+
+# -------------------------------
+# Franchises (nba_api ids and abbreviations)
+# -------------------------------
+FRANCHISES = [
+    # TEAM_ID,  TM,    TEAM,                     CONF,   DIV
+    (1610612737, "ATL", "Atlanta Hawks",          "East", "Southeast"),
+    (1610612738, "BOS", "Boston Celtics",         "East", "Atlantic"),
+    (1610612751, "BKN", "Brooklyn Nets",          "East", "Atlantic"),
+    (1610612766, "CHA", "Charlotte Hornets",      "East", "Southeast"),
+    (1610612741, "CHI", "Chicago Bulls",          "East", "Central"),
+    (1610612739, "CLE", "Cleveland Cavaliers",    "East", "Central"),
+    (1610612742, "DAL", "Dallas Mavericks",       "West", "Southwest"),
+    (1610612743, "DEN", "Denver Nuggets",         "West", "Northwest"),
+    (1610612765, "DET", "Detroit Pistons",        "East", "Central"),
+    (1610612744, "GSW", "Golden State Warriors",  "West", "Pacific"),
+    (1610612745, "HOU", "Houston Rockets",        "West", "Southwest"),
+    (1610612754, "IND", "Indiana Pacers",         "East", "Central"),
+    (1610612746, "LAC", "Los Angeles Clippers",   "West", "Pacific"),
+    (1610612747, "LAL", "Los Angeles Lakers",     "West", "Pacific"),
+    (1610612763, "MEM", "Memphis Grizzlies",      "West", "Southwest"),
+    (1610612748, "MIA", "Miami Heat",             "East", "Southeast"),
+    (1610612749, "MIL", "Milwaukee Bucks",        "East", "Central"),
+    (1610612750, "MIN", "Minnesota Timberwolves", "West", "Northwest"),
+    (1610612740, "NOP", "New Orleans Pelicans",   "West", "Southwest"),
+    (1610612752, "NYK", "New York Knicks",        "East", "Atlantic"),
+    (1610612760, "OKC", "Oklahoma City Thunder",  "West", "Northwest"),
+    (1610612753, "ORL", "Orlando Magic",          "East", "Southeast"),
+    (1610612755, "PHI", "Philadelphia 76ers",     "East", "Atlantic"),
+    (1610612756, "PHX", "Phoenix Suns",           "West", "Pacific"),
+    (1610612757, "POR", "Portland Trail Blazers", "West", "Northwest"),
+    (1610612758, "SAC", "Sacramento Kings",       "West", "Pacific"),
+    (1610612759, "SAS", "San Antonio Spurs",      "West", "Southwest"),
+    (1610612761, "TOR", "Toronto Raptors",        "East", "Atlantic"),
+    (1610612762, "UTA", "Utah Jazz",              "West", "Northwest"),
+    (1610612764, "WAS", "Washington Wizards",     "East", "Southeast"),
+]
+
+# Former names of a franchise: (franchise TM, era TM, era name)
+HISTORICAL = [
+    ("ATL", "STL", "St. Louis Hawks"),
+    ("BKN", "NJN", "New Jersey Nets"),
+    ("BKN", "NYN", "New York Nets"),
+    ("CHA", "CHA", "Charlotte Bobcats"),
+    ("CHA", "CHH", "Charlotte Hornets"),
+    ("DET", "FTW", "Fort Wayne Pistons"),
+    ("GSW", "SFW", "San Francisco Warriors"),
+    ("GSW", "PHW", "Philadelphia Warriors"),
+    ("HOU", "SDR", "San Diego Rockets"),
+    ("LAC", "SDC", "San Diego Clippers"),
+    ("LAC", "BUF", "Buffalo Braves"),
+    ("LAL", "MNL", "Minneapolis Lakers"),
+    ("MEM", "VAN", "Vancouver Grizzlies"),
+    ("NOP", "NOH", "New Orleans Hornets"),
+    ("NOP", "NOK", "New Orleans/Oklahoma City Hornets"),
+    ("OKC", "SEA", "Seattle SuperSonics"),
+    ("PHI", "SYR", "Syracuse Nationals"),
+    ("SAC", "KCK", "Kansas City Kings"),
+    ("SAC", "CIN", "Cincinnati Royals"),
+    ("SAC", "ROC", "Rochester Royals"),
+    ("UTA", "NOJ", "New Orleans Jazz"),
+    ("WAS", "WSB", "Washington Bullets"),
+    ("WAS", "CAP", "Capital Bullets"),
+    ("WAS", "BAL", "Baltimore Bullets"),
+]
+
+# Alternative codes for the same abbreviation (Basketball-Reference, older feeds)
+ABBREVIATION_ALIASES = {
+    "PHO": "PHX",
+    "BRK": "BKN",
+    "CHO": "CHA",
+    "GOS": "GSW",
+    "UTH": "UTA",
+    "SA":  "SAS",
+    "NO":  "NOP",
+    "NY":  "NYK",
+    "GS":  "GSW",
+    "WSH": "WAS",
+}
+
+_FIELDS = ["TEAM_ID", "TM", "TEAM", "CONF", "DIV"]
+
+
+# -------------------------------
+# Tables
+# -------------------------------
+@lru_cache(maxsize=1)
+def _franchises() -> pd.DataFrame:
+    return pd.DataFrame(FRANCHISES, columns=_FIELDS)
+
+
+def teams() -> pd.DataFrame:
+    """The 30 franchises: TEAM_ID, TM, TEAM, CONF ('East'/'West'), DIV."""
+    return _franchises().copy()
+
+
+def _key(values) -> pd.Series:
+    return pd.Series(values, dtype="string").str.strip().str.rstrip("*").str.upper()
+
+
+@lru_cache(maxsize=1)
+def aliases() -> pd.DataFrame:
+    """One row per known alias (upper-case key) -> the team it designates."""
+    franchises = _franchises().set_index("TM")
+    rows = []
+    for tm, row in franchises.iterrows():
+        entry = (row.TEAM_ID, tm, row.TEAM, row.CONF, row.DIV)
+        rows += [(tm,) + entry, (row.TEAM,) + entry]
+    for alias, tm in ABBREVIATION_ALIASES.items():
+        row = franchises.loc[tm]
+        rows.append((alias, row.TEAM_ID, tm, row.TEAM, row.CONF, row.DIV))
+    for franchise, era_tm, era_name in HISTORICAL:
+        row = franchises.loc[franchise]
+        entry = (row.TEAM_ID, era_tm, era_name, row.CONF, row.DIV)
+        rows.append((era_name,) + entry)
+        if era_tm not in franchises.index:  # CHA stays the current Charlotte code
+            rows.append((era_tm,) + entry)
+
+    df = pd.DataFrame(rows, columns=["ALIAS"] + _FIELDS)
+    df["ALIAS"] = _key(df["ALIAS"])
+    return df.drop_duplicates("ALIAS", keep="first").reset_index(drop=True)
+
+
+# -------------------------------
+# Vectorized lookups
+# -------------------------------
+def resolve(values) -> pd.DataFrame:
+    """TEAM_ID, TM, TEAM, CONF, DIV for each abbreviation or name (NaN when unknown).
+
+    The values are factorized once, only the distinct values are normalized and
+    matched against the alias categories, and output columns are gathered by code.
+    """
+    table = aliases()
+    index = getattr(values, "index", None)
+    raw_codes, uniques = pd.factorize(pd.Series(values, dtype="object"))
+    alias_codes = pd.Categorical(_key(uniques), categories=table["ALIAS"]).codes
+    codes = np.where(raw_codes >= 0, alias_codes[np.maximum(raw_codes, 0)], -1)
+    found = codes >= 0
+    out = {}
+    for field in _FIELDS:
+        col = table[field].to_numpy()
+        taken = np.where(found, col[np.where(found, codes, 0)], None)
+        out[field] = pd.Series(taken, index=index, dtype="Int64" if field == "TEAM_ID" else "object")
+    return pd.DataFrame(out, index=index)
+
+
+def team_id(values) -> pd.Series:
+    return resolve(values)["TEAM_ID"]
+
+
+def abbreviation(values, unknown: str = UNKNOWN) -> pd.Series:
+    """Canonical abbreviation ('PHO' -> 'PHX', 'Seattle SuperSonics' -> 'SEA')."""
+    return resolve(values)["TM"].fillna(unknown)
+
+
+def team_name(values, unknown: str = UNKNOWN) -> pd.Series:
+    """Full name ('PHX' / 'PHO' -> 'Phoenix Suns', 'NJN' -> 'New Jersey Nets')."""
+    return resolve(values)["TEAM"].fillna(unknown)
+
+
+def conference(values, unknown: str = UNKNOWN) -> pd.Series:
+    return resolve(values)["CONF"].fillna(unknown)
+
+
+def is_known(values) -> pd.Series:
+    return resolve(values)["TEAM_ID"].notna()
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""Trade rules and the counter-offer finder of the Trade Machine.
+
+Salary matching: two packages match when their totals differ by at most
+SALARY_TOLERANCE of the larger one (|A - B| / max(A, B) <= 5%).
+
+find_counter_offers() takes what team A sends out and enumerates the packages
+of team B (1 to max_players players) whose total for the chosen season falls
+in the matching window, ranked by a stat-value score. A roster is ~15
+contracts, so every package size is enumerated at once as an index matrix
+(C(15, 4) = 1365 rows) and summed with NumPy; package sizes whose smallest /
+largest possible totals cannot reach the window are pruned before
+enumeration, as are players who are over the window on their own.
+
+validate() checks a trade between N teams (2 to 4) for every contract season
+at once: moves are routed with (teams x moves) one-hot matrices over the cap
+sheet's (contracts x seasons) int64 salaries, so each team's outgoing /
+incoming salary vectors are two matrix products.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from nba_data import capsheet, profiling
+
+SALARY_TOLERANCE = 0.05
+
+# Stat-value score of a player (per game): points + rebounds + assists + stocks - turnovers
+SCORE_WEIGHTS = {"PTS_PG": 1.0, "REB_PG": 1.0, "AST_PG": 1.0, "STL_PG": 1.0, "BLK_PG": 1.0, "TOV_PG": -1.0}
+
+MAX_TEAMS = 4
+
+
+# -------------------------------
+# Salary matching
+# -------------------------------
+def salary_window(total: int, tolerance: float = SALARY_TOLERANCE) -> tuple:
+    """(min, max) incoming total that matches an outgoing `total`."""
+    return int(np.ceil(total * (1 - tolerance))), int(np.floor(total / (1 - tolerance)))
+
+
+def salary_gap(total_a: int, total_b: int) -> float:
+    """|A - B| / max(A, B) (0 when both are 0)."""
+    top = max(total_a, total_b)
+    return abs(total_a - total_b) / top if top else 0.0
+
+
+def salaries_match(total_a: int, total_b: int, tolerance: float = SALARY_TOLERANCE) -> bool:
+    return total_a > 0 and total_b > 0 and salary_gap(total_a, total_b) <= tolerance
+
+
+def player_scores(pool: pd.DataFrame, weights=SCORE_WEIGHTS) -> np.ndarray:
+    """Stat-value score per row of `pool` (missing stats count as 0)."""
+    score = np.zeros(len(pool))
+    for col, weight in weights.items():
+        if col in pool.columns:
+            score += weight * pool[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.nan_to_num(score)
+
+
+# -------------------------------
+# Counter-offer search
+# -------------------------------
+@lru_cache(maxsize=64)
+def _combinations(n: int, r: int) -> np.ndarray:
+    """All r-subsets of range(n) as an (C(n, r), r) index matrix."""
+    if r > n:
+        return np.empty((0, r), dtype=np.int16)
+    return np.fromiter((i for combo in combinations(range(n), r) for i in combo),
+                       dtype=np.int16).reshape(-1, r)
+
+
+@profiling.timed()
+def find_counter_offers(pool: pd.DataFrame, season: str, outgoing, team_b: str, team_a: str = None,
+                        max_players: int = 4, limit: int = 10, tolerance: float = SALARY_TOLERANCE,
+                        weights=SCORE_WEIGHTS) -> pd.DataFrame:
+    """Team B packages that match the salary of `outgoing` (players of team A) for `season`.
+
+    Returns PLAYERS (list), N, SALARY, GAP, SCORE, best score first (then
+    smallest salary gap), at most `limit` rows.
+    """
+    empty = pd.DataFrame(columns=["PLAYERS", "N", "SALARY", "GAP", "SCORE"])
+    sent = pool["PLAYER"].isin(outgoing)
+    if team_a is not None:
+        sent &= pool["TEAM"] == team_a
+    total_out = int(pool.loc[sent, season].sum())
+    if total_out <= 0:
+        return empty
+    lo, hi = salary_window(total_out, tolerance)
+
+    # Candidates: paid that season and not over the window on their own
+    candidates = pool[(pool["TEAM"] == team_b) & (pool[season] > 0) & (pool[season] <= hi)]
+    salaries = candidates[season].to_numpy(dtype=np.int64)
+    scores = player_scores(candidates, weights)
+    names = candidates["PLAYER"].to_numpy()
+    ascending = np.sort(salaries)
+
+    found = []
+    for r in range(1, min(max_players, len(salaries)) + 1):
+        # Bound: the r cheapest already too expensive -> no larger package fits either
+        if ascending[:r].sum() > hi:
+            break
+        if ascending[-r:].sum() < lo:
+            continue
+        combos = _combinations(len(salaries), r)
+        totals = salaries[combos].sum(axis=1)
+        ok = (totals >= lo) & (totals <= hi)
+        if ok.any():
+            found.append((combos[ok], totals[ok], scores[combos[ok]].sum(axis=1)))
+    if not found:
+        return empty
+
+    # Rank on the arrays, only the kept packages become rows
+    totals = np.concatenate([t for _, t, _ in found])
+    package_scores = np.concatenate([sc for _, _, sc in found])
+    gaps = np.abs(totals - total_out) / np.maximum(totals, total_out)
+    best = np.lexsort((gaps, -package_scores))[:limit]
+    packages = [combo for combos, _, _ in found for combo in combos]
+    return pd.DataFrame({
+        "PLAYERS": [list(names[packages[i]]) for i in best],
+        "N": [len(packages[i]) for i in best],
+        "SALARY": totals[best],
+        "GAP": gaps[best],
+        "SCORE": np.round(package_scores[best], 1),
+    })
+
+
+# -------------------------------
+# N-team trades
+# -------------------------------
+@dataclass(frozen=True)
+class Move:
+    """One player routed from a team to another."""
+    player: str
+    from_team: str
+    to_team: str
+
+
+@profiling.timed()
+def validate(moves, teams=None, sheet: capsheet.CapSheet = None, tolerance: float = SALARY_TOLERANCE) -> pd.DataFrame:
+    """Salary matching of every team, for every contract season.
+
+    Returns one row per (TEAM, SEASON): OUT, IN, GAP, VALID. A season in which
+    a team neither sends nor receives salary is valid.
+    """
+    moves = list(moves)
+    sheet = sheet or capsheet.cap_sheet()
+    teams = list(teams) if teams is not None else list(dict.fromkeys(
+        t for move in moves for t in (move.from_team, move.to_team)))
+    if not 2 <= len(teams) <= MAX_TEAMS:
+        raise ValueError(f"A trade involves 2 to {MAX_TEAMS} teams, got {len(teams)}")
+    position = {team: i for i, team in enumerate(teams)}
+    for move in moves:
+        if move.from_team == move.to_team or move.from_team not in position or move.to_team not in position:
+            raise ValueError(f"Invalid route for {move.player}: {move.from_team} -> {move.to_team}")
+
+    # Routing: (teams x moves) one-hot, then per-team salary vectors for every season
+    cols = np.arange(len(moves))
+    sends = np.zeros((len(teams), len(moves)), dtype=np.int64)
+    gets = np.zeros_like(sends)
+    sends[[position[m.from_team] for m in moves], cols] = 1
+    gets[[position[m.to_team] for m in moves], cols] = 1
+    salaries = sheet.contract_salaries(moves)
+    out, inc = sends @ salaries, gets @ salaries       # (teams x seasons)
+
+    top = np.maximum(out, inc)
+    gap = np.divide(np.abs(out - inc), top, out=np.zeros(top.shape), where=top > 0)
+    valid = (top == 0) | ((out > 0) & (inc > 0) & (gap <= tolerance))
+    return pd.DataFrame({
+        "TEAM": np.repeat(teams, len(sheet.seasons)),
+        "SEASON": np.tile(sheet.seasons, len(teams)),
+        "OUT": out.ravel(),
+        "IN": inc.ravel(),
+        "GAP": gap.ravel(),
+        "VALID": valid.ravel(),
+    })
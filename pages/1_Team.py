@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
 import pandas as pd
+from nba_data import capsheet, figures, loaders, profiling, similarity
 import plotly.express as px
 
+pd.set_option("mode.copy_on_write", True)  # les vues du cache partagé (nba_data.loaders) sont copiées à l'écriture
+profiling.begin_page("team")  # temps du rerun par étape (voir nba_data.profiling)
+
 # -------------------------------
 # Configuration de la Page
 # -------------------------------
@@ -18,53 +22,6 @@ with c3: st.page_link("pages/2_Statistics.py",     label=" Statistiques")
 with c4: st.page_link("pages/3_Champ_Historic.py", label=" Historique")
 with c5: st.page_link("pages/4_Trade_Machine.py",  label=" Machine à Trade")
 
-# =========================================================
-# CACHES
-# =========================================================
-@st.cache_data(ttl=3600, show_spinner=False)
-def load_team_page_data():
-    df_west         = pd.read_excel("data/df_western_conf_standing.xlsx")
-    df_east         = pd.read_excel("data/df_eastern_conf_standing.xlsx")
-    df_team_ratings = pd.read_excel("data/df_nba_team_reg_season_ratings.xlsx")
-    df_reg_players  = pd.read_excel("data/df_reg_season_players_filtered.xlsx")
-    df_po_players   = pd.read_excel("data/df_playoff_players_filtered.xlsx")
-    df_salaries     = pd.read_excel("data/df_nba_players_salaries.xlsx")
-    return df_west, df_east, df_team_ratings, df_reg_players, df_po_players, df_salaries
-
-@st.cache_data(ttl=3600, show_spinner=False)
-def build_salaries_long_join(df_salaries: pd.DataFrame, df_reg_players: pd.DataFrame):
-    # Colonnes d'années dynamiques (exclut PLAYER/TEAM/GUARANTEED)
-    year_cols = [c for c in df_salaries.columns if c not in ["PLAYER", "TEAM"] and str(c).upper() != "GUARANTEED"]
-
-    df_salaries_long = df_salaries.melt(
-        id_vars=["PLAYER", "TEAM"],
-        value_vars=year_cols,
-        var_name="YEAR",
-        value_name="SALARY"
-    )
-
-    # Jointure pour récupérer position et stats clés (depuis REG saison)
-    df_players_slim = df_reg_players[["PLAYER_NAME", "TEAM", "POSITION", "PTS_PG", "AST_PG", "REB_PG"]].rename(
-        columns={"PLAYER_NAME": "PLAYER"}
-    )
-
-    df_join = pd.merge(
-        df_salaries_long,
-        df_players_slim,
-        how="left",
-        on=["PLAYER", "TEAM"]
-    )
-
-    # SALARY_NUM numérique
-    df_join["SALARY_NUM"] = (
-        df_join["SALARY"]
-        .astype(str)
-        .str.replace(r"[^0-9]", "", regex=True)
-        .replace("", "0")
-        .astype(int)
-    )
-    return df_salaries_long, df_join
-
 # =========================================================
 # UTILITAIRES UI
 # =========================================================
@@ -129,16 +86,14 @@ def pick_display_columns(
     return defaults + selected_extra
 
 # =========================================================
-# CHARGEMENT DES DONNÉES
+# CHARGEMENT DES DONNÉES (cache partagé nba_data)
 # =========================================================
-df_west, df_east, df_team_ratings, df_reg_players, df_po_players, df_salaries = load_team_page_data()
-
 # Filtre qualité (cohérent avec ta home) : GP>10 & MIN_PG>10
-df_reg_players = df_reg_players[(df_reg_players["GP"] > 10) & (df_reg_players["MIN_PG"] > 10)]
-df_po_players  = df_po_players[(df_po_players["GP"] >= 4) & (df_po_players["MIN_PG"] > 10)]
+df_reg_players = loaders.qualified_players("Regular Season")
+df_po_players  = loaders.players("Playoffs", gp_over=3, min_pg_over=10)  # GP>=4
 
-# Build salaires long + join (caché)
-df_salaries_unpivoted, df_join = build_salaries_long_join(df_salaries, df_reg_players)
+# Salaires long + join (caché)
+df_join = loaders.salaries_long()
 
 # =========================================================
 # TITRE
@@ -154,23 +109,7 @@ selected_team = st.selectbox("Sélectionnez une Équipe", team_options, index=0,
 # =========================================================
 # STANDINGS (conf + rang)
 # =========================================================
-df_west_local = df_west.copy()
-df_east_local = df_east.copy()
-df_west_local["CONF"] = "Ouest"
-df_east_local["CONF"] = "Est"
-df_west_local["RANK"] = range(1, len(df_west_local) + 1)
-df_east_local["RANK"] = range(1, len(df_east_local) + 1)
-df_standings = pd.concat([df_east_local, df_west_local], ignore_index=True)
-
-def to_bool_playoff(x):
-    s = str(x).strip().lower()
-    return s in ("*", "true", "1")
-
-if "PLAYOFF_TEAM" in df_standings.columns:
-    if df_standings["PLAYOFF_TEAM"].dtype != bool:
-        df_standings["PLAYOFF_TEAM"] = df_standings["PLAYOFF_TEAM"].apply(to_bool_playoff)
-else:
-    df_standings["PLAYOFF_TEAM"] = False
+df_standings = loaders.standings()
 
 team_row = df_standings[df_standings["TEAM"] == selected_team]
 if not team_row.empty:
@@ -206,7 +145,7 @@ st.markdown("## Statistiques Générales")
 # =========================================================
 # ONGLETS
 # =========================================================
-tab_stats, tab_salaries = st.tabs([" Statistiques de l'Équipe", " Salaires"])
+tab_stats, tab_salaries, tab_form = st.tabs([" Statistiques de l'Équipe", " Salaires", " Forme Récente"])
 
 # ===============================
 # I. STATISTIQUES DE L'ÉQUIPE
@@ -237,24 +176,41 @@ with tab_stats:
         key="team_full_fields"
     )
     if cols_to_show:
-        st.dataframe(df_current[cols_to_show], hide_index=True, use_container_width=True)
+        # Rendu du tableau (sérialisation Arrow du DataFrame) mesuré à part
+        with profiling.span("rendu.tableau_effectif"):
+            st.dataframe(df_current[cols_to_show], hide_index=True, use_container_width=True)
     else:
         st.info("Aucune colonne sélectionnée. Veuillez en choisir au moins une.")
 
+    # Joueurs similaires (plus proches voisins sur les stats par match + adresse)
+    st.markdown("## Joueurs Similaires")
+    if season_filter == "Saison Régulière":
+        index_sim = similarity.index("Regular Season")
+    else:
+        index_sim = similarity.index("Playoffs", gp_over=3, min_pg_over=10)  # même filtre que df_po_players
+    joueur_ref = st.selectbox("Joueur de référence", df_current["PLAYER_NAME"].tolist(), key="team_similar_player")
+    try:
+        with profiling.span("joueurs_similaires"):
+            proches = index_sim.similar(joueur_ref, n=5, team=selected_team)
+        st.dataframe(proches, hide_index=True, use_container_width=True)
+    except KeyError:
+        st.info("Ce joueur n'a pas assez de données pour la recherche de joueurs similaires.")
+
 # ===============================
 # II. SALAIRES
 # ===============================
 with tab_salaries:
     st.markdown(f"### Salaires des Joueurs — {selected_team}")
 
-    # Liste d'années disponibles (hors 'GUARANTEED' déjà exclu en amont)
-    all_years = sorted(df_salaries_unpivoted["YEAR"].dropna().unique())
+    # Liste d'années disponibles (hors 'TM'/'GUARANTEED', exclus en amont)
+    all_years = loaders.salary_years()
     selected_year = st.selectbox("Sélectionnez la Saison", all_years, index=0, key="salary_year")
 
     df_team_year = df_join[(df_join["TEAM"] == selected_team) & (df_join["YEAR"] == selected_year)].copy()
 
     # KPIs salaires
-    team_total = int(df_team_year["SALARY_NUM"].sum()) if not df_team_year.empty else 0
+    sheet = capsheet.cap_sheet()
+    team_total = sheet.payroll_of(selected_team, selected_year)  # lecture directe de la matrice équipes x saisons
     if not df_team_year.empty and df_team_year["SALARY_NUM"].max() > 0:
         top_row = df_team_year.loc[df_team_year["SALARY_NUM"].idxmax()]
         top_player = str(top_row["PLAYER"])
@@ -281,11 +237,27 @@ with tab_salaries:
     with c1: render_kpi_box("Masse Salariale de l'Équipe", f"${team_total:,.0f}", f"{selected_team} — {selected_year}")
     with c2: render_kpi_box("Joueur le Mieux Payé", f"${top_salary:,.0f}", top_player)
     with c3: render_kpi_box("Meilleure valeur (PTS+AST+REB / 1 M$)", f"{best_value_score:.1f}", best_value_player)
+
+    # Masse salariale engagée sur toutes les saisons de contrat
+    engagements = sheet.frame().loc[[selected_team]] if selected_team in sheet.teams else pd.DataFrame()
+    if not engagements.empty:
+        # Années engagées à partir de la saison choisie (matrice équipes x saisons, toutes équipes d'un coup)
+        annees = sheet.committed_years(selected_year).loc[selected_team]
+        if annees["COMMITTED_YEARS"]:
+            st.markdown(f"**Années engagées depuis {selected_year}** : {annees['COMMITTED_YEARS']} saison(s), "
+                        f"jusqu'en {annees['LAST_SEASON']}")
+        else:
+            st.markdown(f"**Années engagées depuis {selected_year}** : aucun contrat")
+        st.dataframe(
+            engagements,
+            column_config={c: st.column_config.NumberColumn(format="$%,.0f") for c in engagements.columns},
+            use_container_width=True
+        )
     
     # Pie salaires par position
     df_team_year = df_team_year[df_team_year["POSITION"].notna()]  # <-- exclut les joueurs sans position
     df_pie = (
-        df_team_year.groupby("POSITION", as_index=False)["SALARY_NUM"]
+        df_team_year.groupby("POSITION", as_index=False, observed=True)["SALARY_NUM"]
         .sum()
         .sort_values("SALARY_NUM", ascending=False)
     )
@@ -294,21 +266,28 @@ with tab_salaries:
     if df_pie.empty or df_pie["SALARY_NUM"].sum() == 0:
         st.info("Aucune donnée de salaire disponible pour cette équipe/année.")
     else:
-        fig = px.pie(
-            df_pie,
-            names="POSITION",
-            values="SALARY_NUM",
-            title=f"Total des Salaires par Position — {selected_team} ({selected_year})",
-            hole=0.35,
-            color_discrete_sequence=px.colors.sequential.Blues_r
-        )
-        fig.update_traces(
-            textposition="inside",
-            texttemplate="%{label}<br>$%{value:,.0f} (%{percent:.1%})",
-            hovertemplate="%{label}<br>Total: $%{value:,.0f}<br>%{percent}",
-            sort=False
-        )
-        fig.update_layout(margin=dict(t=60, b=30, l=10, r=10))
+        def construire_camembert():
+            fig = px.pie(
+                df_pie,
+                names="POSITION",
+                values="SALARY_NUM",
+                title=f"Total des Salaires par Position — {selected_team} ({selected_year})",
+                hole=0.35,
+                color_discrete_sequence=px.colors.sequential.Blues_r
+            )
+            fig.update_traces(
+                textposition="inside",
+                texttemplate="%{label}<br>$%{value:,.0f} (%{percent:.1%})",
+                hovertemplate="%{label}<br>Total: $%{value:,.0f}<br>%{percent}",
+                sort=False
+            )
+            fig.update_layout(margin=dict(t=60, b=30, l=10, r=10))
+            return fig
+
+        # Servi par le cache de figures (clé : version des données, équipe, saison)
+        with profiling.span("camembert_salaires"):
+            fig = figures.figure("team_salaires_pie", {"team": selected_team, "year": selected_year},
+                                 construire_camembert)
         st.plotly_chart(fig, use_container_width=True)
 
         with st.expander("Afficher les lignes de joueurs pour cette saison"):
@@ -328,3 +307,69 @@ with tab_salaries:
                     hide_index=True,
                     use_container_width=True
                 )
+
+# ===============================
+# III. FORME RÉCENTE (moyennes glissantes 5/10/20 matchs, précalculées à l'ingestion)
+# ===============================
+with tab_form:
+    type_saison = "Regular Season" if season_filter == "Saison Régulière" else "Playoffs"
+    forme_equipe = loaders.team_form(type_saison)
+    forme_equipe = forme_equipe[forme_equipe["TEAM"] == selected_team]
+
+    if forme_equipe.empty:
+        st.info("Aucun journal de matchs pour cette équipe. "
+                "Lancez `python -m data_processing.gamelogs` pour les ingérer.")
+    else:
+        forme = forme_equipe.iloc[0]
+        st.markdown(f"### Forme Récente — {selected_team} "
+                    f"({int(forme['GP'])} matchs, dernier le {forme['GAME_DATE']:%d/%m/%Y})")
+
+        n10, n5 = min(int(forme["GP"]), 10), min(int(forme["GP"]), 5)
+        v10, v5 = round(forme["W_L10"] * n10), round(forme["W_L5"] * n5)
+        c1, c2, c3 = st.columns(3)
+        with c1: render_kpi_box(f"Bilan sur {n10} matchs", f"{v10}-{n10 - v10}", f"{n5} derniers : {v5}-{n5 - v5}")
+        with c2: render_kpi_box("Points (5 derniers matchs)", f"{forme['PTS_L5']:.1f}",
+                                f"10 : {forme['PTS_L10']:.1f} — 20 : {forme['PTS_L20']:.1f}")
+        with c3: render_kpi_box("Écart moyen (5 derniers matchs)", f"{forme['PLUS_MINUS_L5']:+.1f}",
+                                f"10 : {forme['PLUS_MINUS_L10']:+.1f} — 20 : {forme['PLUS_MINUS_L20']:+.1f}")
+
+        # Points marqués : moyennes glissantes après chaque match
+        matchs = loaders.team_game_form(selected_team, type_saison)[["GAME_DATE", "MATCHUP", "PTS_L5", "PTS_L10",
+                                                                      "PTS_L20"]]
+        if not matchs.empty:
+            def construire_forme():
+                fig = px.line(
+                    matchs.rename(columns={"PTS_L5": "5 matchs", "PTS_L10": "10 matchs", "PTS_L20": "20 matchs"}),
+                    x="GAME_DATE", y=["5 matchs", "10 matchs", "20 matchs"], hover_data=["MATCHUP"],
+                    title=f"Points par match, moyennes glissantes — {selected_team}",
+                    labels={"GAME_DATE": "Date", "value": "Points", "variable": "Fenêtre"},
+                )
+                fig.update_layout(margin=dict(t=60, b=30, l=10, r=10))
+                return fig
+
+            with profiling.span("forme_courbe"):
+                # Clé liée à la partition df_team_game_form lue (pas à la version globale du store)
+                fig = figures.figure("team_forme_points", {"team": selected_team, "type": type_saison},
+                                     construire_forme, version=loaders.team_game_form_version(type_saison))
+            st.plotly_chart(fig, use_container_width=True)
+
+        # Joueurs : forme sur 5 matchs et tendance par rapport aux 20 derniers
+        forme_joueurs = loaders.player_form(type_saison)
+        forme_joueurs = forme_joueurs[forme_joueurs["TEAM"] == selected_team].copy()
+        forme_joueurs["TENDANCE_PTS"] = (forme_joueurs["PTS_L5"] - forme_joueurs["PTS_L20"]).round(1)
+        with profiling.span("rendu.tableau_forme"):
+            st.dataframe(
+                forme_joueurs.sort_values("PTS_L5", ascending=False)[
+                    ["PLAYER_NAME", "GP", "MIN_L5", "PTS_L5", "PTS_L10", "PTS_L20", "TENDANCE_PTS",
+                     "REB_L5", "AST_L5", "PLUS_MINUS_L5"]],
+                column_config={"TENDANCE_PTS": st.column_config.NumberColumn("TENDANCE PTS (L5 − L20)",
+                                                                             format="%+.1f")},
+                hide_index=True,
+                use_container_width=True
+            )
+
+
+# -------------------------------
+# Profiling : total du rerun, export des métriques, barre latérale de debug (?debug=1)
+# -------------------------------
+profiling.end_page()
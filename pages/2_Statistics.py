@@ -1,7 +1,11 @@
 import pandas as pd
+from nba_data import figures, leaderboards, loaders, profiling
 import streamlit as st
 import plotly.express as px
 
+pd.set_option("mode.copy_on_write", True)  # les vues du cache partagé (nba_data.loaders) sont copiées à l'écriture
+profiling.begin_page("statistics")  # temps du rerun par étape (voir nba_data.profiling)
+
 # Lancer avec : py -m streamlit run test.py
 st.set_page_config(layout="wide")
 
@@ -16,15 +20,15 @@ with c4: st.page_link("pages/3_Champ_Historic.py", label=" Historique")
 with c5: st.page_link("pages/4_Trade_Machine.py",  label=" Simulateur de Trade")
 
 
-# Charger les données
-df_reg_season_players = pd.read_excel("data/df_reg_season_players_filtered.xlsx")
-df_playoff_players = pd.read_excel("data/df_playoff_players_filtered.xlsx")
+# Saisons disponibles dans le store partitionné (la plus récente d'abord)
+saisons = loaders.seasons() or ["2024-25"]
+saison = st.session_state.get("saison", saisons[0])
 
 # -------------------------------
 # Titre principal
 # -------------------------------
 st.markdown(
-    "<h1 style='text-align: center;'>NBA 2024-25 Statistiques</h1>", 
+    f"<h1 style='text-align: center;'>NBA {saison} Statistiques</h1>", 
     unsafe_allow_html=True
 )
 st.markdown(
@@ -35,6 +39,9 @@ st.markdown(
 # -------------------------------
 # Filtres
 # -------------------------------
+# Mode statistique -> suffixe des colonnes dérivées (data_processing/derive.py)
+SUFFIXES = {"Par match": "_PG", "Total": "", "Par 36 min": "_P36", "Par 100 poss.": "_P100"}
+
 col1, col2, col3, col4 = st.columns([1, 1, 1, 1], gap="large")
 
 with col1:
@@ -43,6 +50,8 @@ with col1:
         ["Leaders", "Top 30", "Toutes les données"],
         key="metric_filter"
     )
+    if len(saisons) > 1:
+        st.selectbox("Saison", saisons, key="saison")
 
 with col2:
     season_filter = st.radio(
@@ -54,7 +63,7 @@ with col2:
 with col3:
     stat_mode = st.radio(
         "Mode statistique", 
-        ["Par match", "Total"], 
+        list(SUFFIXES), 
         horizontal=True,
         key="stat_mode"
     )
@@ -75,13 +84,33 @@ else:
 # -------------------------------
 # Sélection du dataset
 # -------------------------------
-df = df_reg_season_players if season_filter == "Saison régulière" else df_playoff_players
-df = df[(df["GP"] > 10) & (df["MIN_PG"] > 10)]
+# Cache partagé nba_data : lecture + filtre GP>10 & MIN_PG>10 faits une seule fois
+# par version des données (invalidé dès que le pipeline réécrit le store).
+# Seule la partition (saison, type de saison) affichée est lue.
+season_type = "Regular Season" if season_filter == "Saison régulière" else "Playoffs"
+if len(saisons) > 1:
+    df = loaders.qualified_players(season_type, season=saison)
+else:
+    df = loaders.qualified_players(season_type)
+
+@profiling.timed("top_joueurs")
+def top_joueurs(col_name, n):
+    """Top n joueurs : tranche de l'index de classement précalculé (construit une fois par version des données)."""
+    return leaderboards.top(col_name, n=n, season_type=season_type, season=saison if len(saisons) > 1 else None)
+
 
 # -------------------------------
 # Utilitaire : graphique en barres
 # -------------------------------
+@profiling.timed("graphique_barres")
 def graphique_barres(data, col_name, titre):
+    """Graphique en barres, servi par le cache de figures tant que données et paramètres sont inchangés."""
+    # La clé décrit la tranche affichée (stat, type de saison, saison, taille du top)
+    params = {"col": col_name, "titre": titre, "type": season_type, "saison": saison, "n": len(data)}
+    return figures.figure("stats_barres", params, lambda: _construire_barres(data, col_name, titre))
+
+
+def _construire_barres(data, col_name, titre):
     
     # Renommer la colonne avant de trier
     data = data.rename(columns={"PLAYER_NAME": "PLAYER"})
@@ -119,8 +148,9 @@ def graphique_barres(data, col_name, titre):
 # -------------------------------
 # Fonctions d'affichage
 # -------------------------------
+@profiling.timed("leaders_offensifs")
 def afficher_offensif(df, label, mode, view_mode):
-    suffix = "_PG" if mode == "Par match" else ""
+    suffix = SUFFIXES[mode]
     st.markdown(f"##  Statistiques offensives ({label} - {mode})")
 
     stats = {
@@ -132,7 +162,7 @@ def afficher_offensif(df, label, mode, view_mode):
 
     col1, col2 = st.columns(2)
     for (titre, col_name), col in zip(stats.items(), [col1, col2, col1, col2]):
-        top_data = df[["PLAYER_NAME", "TEAM", col_name + suffix]].sort_values(by=col_name + suffix, ascending=False).head(5)
+        top_data = top_joueurs(col_name + suffix, 5)
         if view_mode == "Tableau":
             col.markdown(f"### {titre} {mode}")
             col.dataframe(top_data, hide_index=True, use_container_width=True)
@@ -140,8 +170,9 @@ def afficher_offensif(df, label, mode, view_mode):
             fig = graphique_barres(top_data, col_name + suffix, f"{titre}")
             col.plotly_chart(fig, use_container_width=True)
 
+@profiling.timed("leaders_defensifs")
 def afficher_defensif(df, label, mode, view_mode):
-    suffix = "_PG" if mode == "Par match" else ""
+    suffix = SUFFIXES[mode]
     st.markdown(f"##  Statistiques défensives ({label} - {mode})")
 
     stats = {
@@ -153,7 +184,7 @@ def afficher_defensif(df, label, mode, view_mode):
 
     col1, col2 = st.columns(2)
     for (titre, col_name), col in zip(stats.items(), [col1, col2, col1, col2]):
-        top_data = df[["PLAYER_NAME", "TEAM", col_name + suffix]].sort_values(by=col_name + suffix, ascending=False).head(5)
+        top_data = top_joueurs(col_name + suffix, 5)
         if view_mode == "Tableau":
             col.markdown(f"### {titre} {mode}")
             col.dataframe(top_data, hide_index=True, use_container_width=True)
@@ -199,23 +230,7 @@ if metric_filter == "Leaders":
     afficher_defensif(df, season_filter, stat_mode, view_mode)
 
 elif metric_filter == "Top 30":
-    stat_choice = st.selectbox(
-        "Sélectionner une statistique",
-        [
-            "Points",
-            "Passes décisives",
-            "Rebonds totaux",
-            "Rebonds offensifs",
-            "Rebonds défensifs",
-            "Minutes",
-            "3 points marqués",
-            "Lancers francs marqués",
-            "Contres",
-            "Interceptions",
-            "Ballons perdus",
-        ]
-    )
-    suffix = "_PG" if stat_mode == "Par match" else ""
+    suffix = SUFFIXES[stat_mode]
     stat_map = {
         "Points": "PTS",
         "Passes décisives": "AST",
@@ -229,16 +244,18 @@ elif metric_filter == "Top 30":
         "Interceptions": "STL",
         "Ballons perdus": "TOV",
     }
+    # Les minutes n'ont pas de version par 36 min / par 100 possessions
+    stat_choice = st.selectbox(
+        "Sélectionner une statistique",
+        [label for label, col in stat_map.items() if col + suffix in df.columns]
+    )
 
     chosen_col = stat_map[stat_choice] + suffix
-    top30 = (
-        df[["PLAYER_NAME", "TEAM", chosen_col]]
-        .sort_values(by=chosen_col, ascending=False)
-        .head(30)
-    )
+    top30 = top_joueurs(chosen_col, 30)
 
     st.markdown(f"##  Top 30 {stat_choice} ({stat_mode}) - {season_filter}")
-    st.dataframe(top30, hide_index=True, use_container_width=True)
+    with profiling.span("rendu.tableau_top30"):
+        st.dataframe(top30, hide_index=True, use_container_width=True)
 
 elif metric_filter == "Toutes les données":
     st.markdown(f"##  {season_filter} — Données complètes (par champ)")
@@ -251,6 +268,14 @@ elif metric_filter == "Toutes les données":
     )
 
     if cols_to_show:
-        st.dataframe(df[cols_to_show], hide_index=True, use_container_width=True)
+        # Tableau le plus lourd de la page : sérialisation Arrow mesurée à part
+        with profiling.span("rendu.tableau_complet"):
+            st.dataframe(df[cols_to_show], hide_index=True, use_container_width=True)
     else:
         st.info("Aucune colonne sélectionnée. Veuillez en choisir au moins une.")
+
+
+# -------------------------------
+# Profiling : total du rerun, export des métriques, barre latérale de debug (?debug=1)
+# -------------------------------
+profiling.end_page()
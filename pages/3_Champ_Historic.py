@@ -1,7 +1,10 @@
-import unicodedata
 import pandas as pd
 import streamlit as st
 import plotly.express as px
+from nba_data import figures, profiling, search
+
+pd.set_option("mode.copy_on_write", True)  # les vues du cache partagé (nba_data.loaders) sont copiées à l'écriture
+profiling.begin_page("champ_historic")  # temps du rerun par étape (voir nba_data.profiling)
 
 # --------------------------------------------------
 # Lancer avec :  streamlit run 3_Champ_Historic.py
@@ -26,19 +29,11 @@ with c5:
 # -------------------------------
 # Chargement des données
 # -------------------------------
-@st.cache_data(show_spinner=False)
-def load_data(path: str) -> pd.DataFrame:
-    df = pd.read_excel(path)
-    # Normalisation minimale des noms de colonnes pour robustesse
-    df.columns = [c.strip() for c in df.columns]
-    # Unifier le nom de la colonne des finalistes (RUNNER) 
-    df["RUNNER"] = df["RUNNER-UP"]
-    return df
-
-
-df_raw = load_data("data/df_nba_champion.xlsx")
+# Index inversé (année, champion, finaliste, joueur) construit une fois par version des données
+index_hist = search.champions_index()
+df = index_hist.frame
 
-#st.dataframe(df_raw)
+#st.dataframe(df)
 
 st.markdown(
     """
@@ -51,20 +46,15 @@ st.markdown(
 # Functions
 # -------------------------------
 
-def normalize_txt(s: str) -> str:
-    """Minuscule + trim + suppression des accents. Gère None/NaN."""
-    if s is None:
-        return ""
-    s = str(s)
-    if s.lower() == "nan":
-        return ""
-    s = s.strip().casefold()
-    s = "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
-    return s
+@profiling.timed("graphique_barres")
+def graphique_barres(data: pd.DataFrame, col_valeur: str, col_label: str, titre: str, col_couleur: str | None = None):
+    """Graphique en barres horizontales (top to bottom) avec valeurs affichées (via le cache de figures)."""
+    params = {"valeur": col_valeur, "label": col_label, "titre": titre, "couleur": col_couleur}
+    return figures.figure("champ_barres", params,
+                          lambda: _construire_barres(data, col_valeur, col_label, titre, col_couleur))
 
 
-def graphique_barres(data: pd.DataFrame, col_valeur: str, col_label: str, titre: str, col_couleur: str | None = None):
-    """Graphique en barres horizontales (top to bottom) avec valeurs affichées."""
+def _construire_barres(data: pd.DataFrame, col_valeur: str, col_label: str, titre: str, col_couleur: str | None = None):
     data_sorted = data.sort_values(by=col_valeur, ascending=False)  # ascending False pour barres du haut vers le bas
 
     kwargs = dict(
@@ -101,21 +91,6 @@ def graphique_barres(data: pd.DataFrame, col_valeur: str, col_label: str, titre:
     return fig
 
 
-# -------------------------------
-# Préparation des colonnes normalisées
-# -------------------------------
-df = df_raw.copy()
-for col in ["CHAMPION", "RUNNER", "FINALS_MVP", "POINTS", "REBOUNDS", "ASSISTS"]:
-    df[f"{col}_NORM"] = df[col].map(normalize_txt)
-
-# Colonne concaténée (pour le filtre joueur, recherche exacte et robuste)
-df["PLAYERS_ALL_NORM"] = (
-    df["FINALS_MVP_NORM"].fillna("") + "|" +
-    df["POINTS_NORM"].fillna("") + "|" +
-    df["REBOUNDS_NORM"].fillna("") + "|" +
-    df["ASSISTS_NORM"].fillna("")
-)
-
 # -------------------------------
 # Onglets
 # -------------------------------
@@ -125,18 +100,11 @@ onglet_hist, onglet_stats = st.tabs([" Tableau d'honneur", " Bilan des franchise
 with onglet_hist:
     st.markdown("### Filtrer le palmarès")
 
-    # Listes d'options (indépendantes, depuis le DF complet)
-    years = ["Toutes"] + sorted([y for y in df["YEAR"].dropna().unique().tolist()], reverse=True)
-    champs = ["Toutes"] + sorted([c for c in df["CHAMPION"].dropna().unique().tolist()])
-    runners = ["Toutes"] + sorted([r for r in df["RUNNER"].dropna().unique().tolist()])
-    players = ["Toutes"] + sorted(
-        pd.concat([
-            df["FINALS_MVP"].dropna(),
-            df["POINTS"].dropna(),
-            df["REBOUNDS"].dropna(),
-            df["ASSISTS"].dropna(),
-        ]).astype(str).unique().tolist()
-    )
+    # Listes d'options (lues dans l'index, sans recalcul à chaque interaction)
+    years = ["Toutes"] + index_hist.options("YEAR", reverse=True)
+    champs = ["Toutes"] + index_hist.options("CHAMPION")
+    runners = ["Toutes"] + index_hist.options("RUNNER")
+    players = ["Toutes"] + index_hist.options("PLAYER")  # noms seuls : 'N. Jokić (600)' -> 'N. Jokić'
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -148,31 +116,26 @@ with onglet_hist:
     with col4:
         player_filter = st.selectbox("Sélectionner un joueur", players, key="player_hist")
 
-    # Application cumulative des filtres (AND)
-    filtered = df.copy()
-
-    def apply_eq(_df: pd.DataFrame, col: str, val):
-        return _df if val == "Toutes" else _df[_df[col] == val]
-
-    filtered = apply_eq(filtered, "YEAR", year_filter)
-    filtered = apply_eq(filtered, "CHAMPION", champ_filter)
-    filtered = apply_eq(filtered, "RUNNER", runner_filter)
+    # Application cumulative des filtres (AND) : intersection des listes de lignes de l'index
+    def valeur(choix):
+        return None if choix == "Toutes" else choix
 
-    if player_filter != "Toutes":
-        player_norm = normalize_txt(player_filter)
-        # Recherche exacte sur l'une des 4 colonnes (via split de la concat)
-        filtered = filtered[filtered["PLAYERS_ALL_NORM"].str.split("|").apply(lambda lst: player_norm in lst)]
+    with profiling.span("filtres_index"):
+        lignes = index_hist.search(
+            YEAR=valeur(year_filter),
+            CHAMPION=valeur(champ_filter),
+            RUNNER=valeur(runner_filter),
+            PLAYER=valeur(player_filter),  # présent en Finals MVP, meilleur marqueur, rebondeur ou passeur
+        )
+    filtered = index_hist.take(lignes)
 
     st.markdown("### Résultats")
 
-    # Colonnes techniques à masquer
-    tech_cols = [c for c in filtered.columns if c.endswith("_NORM") or c == "PLAYERS_ALL_NORM"]
-
     if filtered.empty:
         st.info("Aucun résultat pour cette combinaison de filtres.")
     else:
         st.dataframe(
-            filtered.drop(columns=tech_cols, errors="ignore"),
+            filtered,
             hide_index=True,
             use_container_width=True,
         )
@@ -224,3 +187,9 @@ with onglet_stats:
         #st.dataframe(team_appearances, hide_index=True, use_container_width=True)
         fig3 = graphique_barres(team_appearances, col_valeur="Participations", col_label="Équipe", titre="Participations en finales")
         st.plotly_chart(fig3, use_container_width=True, theme="streamlit")
+
+
+# -------------------------------
+# Profiling : total du rerun, export des métriques, barre latérale de debug (?debug=1)
+# -------------------------------
+profiling.end_page()
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
 import pandas as pd
+from nba_data import capsheet, loaders, names, profiling, similarity, trades
 import plotly.express as px
 
+pd.set_option("mode.copy_on_write", True)  # les vues du cache partagé (nba_data.loaders) sont copiées à l'écriture
+profiling.begin_page("trade_machine")  # temps du rerun par étape (voir nba_data.profiling)
+
 
 # -------------------------------
 # Afficher la barre de navigation
@@ -28,25 +32,16 @@ st.write("Sélectionnez deux équipes et des joueurs pour simuler un échange. L
 
 
 # =========================================================
-# CACHES
+# DONNÉES (cache partagé nba_data)
 # =========================================================
-@st.cache_data(ttl=3600, show_spinner=False)
-def load_trade_machine_data():
-    df_ouest        = pd.read_excel("data/df_western_conf_standing.xlsx")
-    df_est          = pd.read_excel("data/df_eastern_conf_standing.xlsx")
-    df_classements  = pd.read_excel("data/df_nba_team_reg_season_ratings.xlsx")
-    df_joueurs_reg  = pd.read_excel("data/df_reg_season_players_filtered.xlsx")
-    df_joueurs_po   = pd.read_excel("data/df_playoff_players_filtered.xlsx")
-    df_salaires     = pd.read_excel("data/df_nba_players_salaries.xlsx")
-    return df_ouest, df_est, df_classements, df_joueurs_reg, df_joueurs_po, df_salaires
-
-# Utilisation
-df_ouest, df_est, df_classements_equipe, df_joueurs_reg, df_joueurs_po, df_salaires = load_trade_machine_data()
+# Salaires déjà numériques (int) par saison + contract_years + stats REG (POSITION, PTS_PG, ...)
+df_jointures = loaders.trade_pool()
 
 
 # -------------------------------
 # Fonctions
 # -------------------------------
+@profiling.timed("salaire_cumule")
 def salaire_cumule(pool_df: pd.DataFrame, saison: str, joueurs_selectionnes: list[str]) -> int:
     """Retourne le salaire cumulé (déjà numérique) pour les joueurs sélectionnés."""
     if not joueurs_selectionnes or pool_df is None or saison not in pool_df.columns:
@@ -56,46 +51,13 @@ def salaire_cumule(pool_df: pd.DataFrame, saison: str, joueurs_selectionnes: lis
 def formater_argent(montant: int) -> str:
     return f"${montant:,.0f}"
 
-# Étape 1: Compter combien d'années de contrat valides chaque joueur a
-annees_cols = ["2025-26","2026-27","2027-28","2028-29","2029-30","2030-31"]
-
-# Remplacer les espaces réservés comme "None", "-", "" par NaN
-df_salaires[annees_cols] = df_salaires[annees_cols].replace(
-    ["None", "", "-", "—"], pd.NA
-)
-
-# Créer une nouvelle colonne avec le nombre d'années de contrat non nulles
-df_salaires["contract_years"] = df_salaires[annees_cols].notna().sum(axis=1)
-
-# Étape 2: Créer un sous-ensemble propre de df_joueurs_reg avec seulement les colonnes pertinentes
-# Renommer PLAYER_NAME -> PLAYER pour s'aligner avec df_salaires
-stat_cols = ["POSITION","AST_PG","BLK_PG","AGE","FG_PCT","FG3_PCT",
-             "GP","MIN","PLUS_MINUS","PTS_PG","REB_PG","STL_PG","TOV_PG"]
-
-df_reg_subset = (
-    df_joueurs_reg
-      .rename(columns={"PLAYER_NAME": "PLAYER"})
-      [["PLAYER","TEAM"] + stat_cols]
-)
-
-# Étape 3: Fusionner les salaires et les statistiques des joueurs dans un seul dataframe
-df_jointures = df_salaires.merge(df_reg_subset, on=["PLAYER","TEAM"], how="left")
-
-# Prétraiter les colonnes de salaire: ne garder que les chiffres, convertir en int
-for col in annees_cols + ["GUARANTEED"]:
-    if col in df_jointures.columns:
-        df_jointures[col] = (
-            df_jointures[col]
-            .astype(str)
-            .str.replace(r"[^0-9]", "", regex=True)
-            .replace("", "0")
-            .astype(int)
-        )
+# Saisons de contrat disponibles ("2025-26", ..., "2030-31")
+annees_cols = loaders.salary_years()
 
 # -------------------------------
 # Ligne 1: sélecteur de saison
 # -------------------------------
-SAISONS = ["2025-26","2026-27","2027-28","2028-29","2029-30","2030-31"]
+SAISONS = annees_cols
 saison = st.selectbox("Sélectionner la saison", SAISONS)
 
 # -------------------------------
@@ -181,7 +143,7 @@ if clique:
         if totalA <= 0 or totalB <= 0:
             st.info("Les joueurs sélectionnés doivent avoir un salaire pour la saison choisie.")
         else:
-            diff_pct = abs(totalA - totalB) / max(totalA, totalB)
+            diff_pct = trades.salary_gap(totalA, totalB)
 
             # Afficher les métriques dans 3 colonnes propres
             col1, col2, col3 = st.columns(3)
@@ -190,12 +152,12 @@ if clique:
             col3.metric("Différence", f"{diff_pct:.2%}")
 
             # Vérification de la règle métier
-            if diff_pct <= 0.05:
+            if diff_pct <= trades.SALARY_TOLERANCE:
                 st.success(" L'échange est valide selon la règle de correspondance des salaires de ±5%.")
             else:
-                # Afficher les plages acceptables
-                a_min, a_max = int(totalA * 0.95), int(totalA * 1.05)
-                b_min, b_max = int(totalB * 0.95), int(totalB * 1.05)
+                # Afficher les plages acceptables (même règle que la validation : écart / plus grand total)
+                a_min, a_max = trades.salary_window(totalA)
+                b_min, b_max = trades.salary_window(totalB)
                 st.markdown(
                     f"""
                 <div style="background-color:#ffe6e6; padding:15px; border-radius:10px; border:1px solid #ff4d4d;">
@@ -207,4 +169,125 @@ if clique:
                 </div>
                 """,
                     unsafe_allow_html=True
-                )
\ No newline at end of file
+                )
+
+
+# -------------------------------
+# Ligne 5: Recherche de contreparties
+# -------------------------------
+st.divider()
+st.subheader("Recherche de contreparties")
+st.write("À partir des joueurs sélectionnés de l'Équipe A, liste les combinaisons de joueurs de l'Équipe B "
+         "dont le salaire correspond (±5%), classées par score statistique (PTS + REB + AST + STL + BLK - TOV par match).")
+
+nb_max = st.slider("Nombre maximum de joueurs de l'Équipe B", 1, 4, 3, key="nb_max")
+
+if st.button("Chercher des contreparties", key="chercher"):
+    if equipeA == "" or equipeB == "":
+        st.warning("Veuillez d'abord sélectionner les deux équipes.")
+    elif not joueursA:
+        st.warning("Veuillez sélectionner au moins un joueur de l'Équipe A.")
+    else:
+        offres = trades.find_counter_offers(df_jointures, saison, joueursA, equipeB, team_a=equipeA, max_players=nb_max)
+        if offres.empty:
+            st.info("Aucune combinaison de l'Équipe B ne correspond au salaire envoyé pour cette saison.")
+        else:
+            affichage = pd.DataFrame({
+                "Joueurs": offres["PLAYERS"].map(", ".join),
+                "Nb": offres["N"],
+                "Salaire": offres["SALARY"].map(formater_argent),
+                "Différence": offres["GAP"].map("{:.2%}".format),
+                "Score": offres["SCORE"],
+            })
+            st.dataframe(affichage, hide_index=True, use_container_width=True)
+
+
+# -------------------------------
+# Ligne 5 bis: Joueurs similaires (cibles d'échange)
+# -------------------------------
+st.divider()
+st.subheader("Joueurs similaires")
+st.write("Les joueurs des autres équipes dont le profil statistique (saison régulière) est le plus proche, "
+         "avec leur salaire pour la saison sélectionnée.")
+
+index_sim = similarity.index("Regular Season")
+# Noms comparés sur leur clé de jointure (accents, suffixes Jr./III, ponctuation), affichés comme dans l'index
+cles_salaires = set(names.join_keys(df_jointures["PLAYER"]))
+noms_index = index_sim.frame["PLAYER_NAME"]
+joueurs_ref = sorted(set(noms_index[names.join_keys(noms_index).isin(cles_salaires).to_numpy()]))
+joueur_ref = st.selectbox("Joueur de référence", [""] + joueurs_ref, key="trade_similar_player")
+if joueur_ref:
+    proches = index_sim.similar(joueur_ref, n=similarity.K)
+    equipe_ref = index_sim.frame.loc[index_sim.locate(joueur_ref), "TEAM"]
+    proches = proches[proches["TEAM"] != equipe_ref].head(8)
+    salaires = df_jointures[["PLAYER", "TEAM", saison]].rename(columns={saison: "Salaire"})
+    proches = names.merge_on_names(proches, salaires, "PLAYER_NAME", "PLAYER", on=["TEAM"], how="left")
+    proches["Salaire"] = proches["Salaire"].map(lambda x: formater_argent(x) if pd.notna(x) else "—")
+    st.dataframe(proches, hide_index=True, use_container_width=True)
+
+# -------------------------------
+# Ligne 6: Échange à plusieurs équipes (toutes les saisons de contrat)
+# -------------------------------
+st.divider()
+st.subheader("Échange à plusieurs équipes")
+st.write("Chaque équipe envoie des joueurs vers une autre équipe de l'échange. La correspondance des salaires (±5%) "
+         "est vérifiée pour chaque équipe et pour chaque saison de contrat.")
+
+nb_equipes = st.radio("Nombre d'équipes", [3, 4], horizontal=True, key="nb_equipes")
+colonnes = st.columns(nb_equipes)
+
+equipes_multi = []
+for i, col in enumerate(colonnes):
+    with col:
+        equipes_multi.append(st.selectbox(f"Équipe {i + 1}", [""] + liste_equipes, key=f"multi_equipe_{i}"))
+
+# Joueurs envoyés + destination de chacun (une fois toutes les équipes connues)
+mouvements = []
+for i, col in enumerate(colonnes):
+    equipe = equipes_multi[i]
+    if equipe == "":
+        continue
+    with col:
+        autres = [e for e in equipes_multi if e and e != equipe]
+        roster = df_jointures.loc[df_jointures["TEAM"] == equipe, "PLAYER"].tolist()
+        envoyes = st.multiselect(f"Joueurs envoyés par {equipe}", roster, key=f"multi_joueurs_{i}")
+        for joueur in envoyes:
+            if autres:
+                destination = st.selectbox(f"{joueur} vers", autres, key=f"multi_dest_{i}_{joueur}")
+                mouvements.append(trades.Move(joueur, equipe, destination))
+
+if st.button("Valider l'échange sur toutes les saisons", key="valider_multi"):
+    choisies = [e for e in equipes_multi if e]
+    if len(set(choisies)) < nb_equipes:
+        st.warning(f"Veuillez sélectionner {nb_equipes} équipes différentes.")
+    elif not mouvements:
+        st.warning("Veuillez sélectionner au moins un joueur envoyé.")
+    else:
+        resultat = trades.validate(mouvements, teams=choisies)
+        resultat["Statut"] = (resultat["VALID"].map({True: "Valide", False: "Invalide"})
+                              + " (" + resultat["GAP"].map("{:.1%}".format) + ")")
+        tableau = resultat.pivot(index="TEAM", columns="SEASON", values="Statut").reindex(choisies)
+        st.dataframe(tableau, use_container_width=True)
+
+        # Masse salariale avant / après, pour toutes les saisons (matrice équipes x saisons du cap sheet)
+        sheet = capsheet.cap_sheet()
+        apres = sheet.frame(sheet.post_trade(mouvements)).reindex(choisies, fill_value=0)
+        variation = sheet.frame(sheet.trade_delta(mouvements)).reindex(choisies, fill_value=0)
+        argent = {c: st.column_config.NumberColumn(format="$%,.0f") for c in sheet.seasons}
+        st.markdown("**Masse salariale après l'échange**")
+        st.dataframe(apres, column_config=argent, use_container_width=True)
+        st.markdown("**Variation de la masse salariale**")
+        st.dataframe(variation, column_config=argent, use_container_width=True)
+
+        invalides = resultat[~resultat["VALID"]]
+        if invalides.empty:
+            st.success(" L'échange est valide pour toutes les équipes et toutes les saisons de contrat.")
+        else:
+            st.error(" Échange invalide : "
+                     + "; ".join(f"{t} ({', '.join(g['SEASON'])})" for t, g in invalides.groupby("TEAM", sort=False)))
+
+
+# -------------------------------
+# Profiling : total du rerun, export des métriques, barre latérale de debug (?debug=1)
+# -------------------------------
+profiling.end_page()
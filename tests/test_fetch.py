@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""fetch_all / TokenBucket against a fake endpoint: retries, backoff, rate limit, result order.
+
+Run from the repository root: python -m pytest tests
+"""
+
+import random
+import threading
+
+import pytest
+
+from data_processing.fetch import TokenBucket, backoff_delay, fetch_all
+
+
+class FakeEndpoint:
+    """fn(key) that raises for the first failures[key] calls of a key, then returns key * 10."""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, key):
+        with self._lock:
+            self.calls.append(key)
+            if self.failures.get(key, 0) > 0:
+                self.failures[key] -= 1
+                raise ConnectionError(f"boom {key}")
+        return key * 10
+
+
+class FakeClock:
+    """Monotonic clock that only moves when sleep() is called; sleeps are recorded."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+
+def _fetch(items, fn, sleep, **kwargs):
+    # High rate / burst: the bucket never waits, only the backoff sleeps are exercised
+    kwargs.setdefault("rate", 1000.0)
+    kwargs.setdefault("burst", 1000.0)
+    return fetch_all(items, fn, rng=random.Random(0), sleep=sleep, **kwargs)
+
+
+def test_retries_with_backoff_then_succeeds():
+    fn, clock = FakeEndpoint({2: 2}), FakeClock()
+    results = _fetch([(1, "a"), (2, "b")], fn, clock.sleep, retries=4, base_delay=0.5, max_delay=8.0)
+
+    assert [r.ok for r in results] == [True, True]
+    assert results[1].value == 20 and results[1].attempts == 3
+    assert fn.calls.count(2) == 3
+    # One backoff sleep per failed attempt, each within its full-jitter range
+    assert len(clock.sleeps) == 2
+    for attempt, slept in enumerate(clock.sleeps):
+        assert 0 <= slept <= min(8.0, 0.5 * 2 ** attempt)
+
+
+def test_gives_up_after_retries():
+    fn, clock = FakeEndpoint({1: 99}), FakeClock()
+    (result,) = _fetch([(1, "a")], fn, clock.sleep, retries=3)
+
+    assert not result.ok and result.value is None
+    assert result.attempts == 3
+    assert result.error == "ConnectionError: boom 1"
+    assert len(clock.sleeps) == 2  # no sleep after the last attempt
+
+
+def test_results_in_input_order_after_failures():
+    keys = list(range(12))
+    fn, clock = FakeEndpoint({k: k % 3 for k in keys}), FakeClock()
+    done = []
+    results = _fetch([(k, f"team {k}") for k in keys], fn, clock.sleep, max_workers=4, retries=3,
+                     progress=lambda n, total, label: done.append(n))
+
+    assert [r.key for r in results] == keys
+    assert [r.value for r in results] == [k * 10 for k in keys]
+    assert [r.attempts for r in results] == [k % 3 + 1 for k in keys]
+    assert done == list(range(1, len(keys) + 1))
+
+
+def test_local_calls_skip_the_rate_limit():
+    fn, clock = FakeEndpoint(), FakeClock()
+    # 0.001 token/s: any call that needs a token would block for ~1000 s of real time
+    results = fetch_all([(k, str(k)) for k in range(5)], fn, rate=0.001, burst=1.0,
+                        sleep=clock.sleep, is_local=lambda key: key > 0)
+    assert all(r.ok for r in results)
+
+
+def test_token_bucket_rate_limit():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=1.0, clock=clock, sleep=clock.sleep)
+
+    waited = [bucket.acquire() for _ in range(5)]
+
+    # The first token is in reserve, then one every 1 / rate seconds
+    assert waited == pytest.approx([0.0, 0.5, 0.5, 0.5, 0.5])
+    assert clock.now == pytest.approx(2.0)
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_backoff_delay_is_capped():
+    rng = random.Random(1)
+    assert all(0 <= backoff_delay(10, base=0.5, cap=8.0, rng=rng) <= 8.0 for _ in range(100))
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Synthetic game-log replay: day-by-day appends match the full season drawn from the same league.
+
+Run from the repository root: python -m pytest tests
+"""
+
+import pandas as pd
+import pytest
+
+from data_processing import gamelogs, synthetic
+from nba_data.store import read_partitions
+
+CONFIG = synthetic.LeagueConfig(seasons=("2023-24", "2024-25"), teams=30, players_per_team=6, games=10,
+                                champion_years=5, seed=3)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store_dir = tmp_path / "store"
+    synthetic.write_league(CONFIG, store_dir)
+    return store_dir
+
+
+def _full_season() -> pd.DataFrame:
+    season = None
+    for season in synthetic.iter_seasons(CONFIG):
+        pass
+    return synthetic.game_logs(CONFIG, season)
+
+
+def _stored(store_dir) -> pd.DataFrame:
+    df = read_partitions(gamelogs.GAME_LOGS, store_dir=store_dir).drop(columns=["SEASON", "SEASON_TYPE"])
+    return df.sort_values(["GAME_DATE", "GAME_ID", "PLAYER_ID"]).reset_index(drop=True)
+
+
+def _first_days(df: pd.DataFrame, days: int) -> pd.DataFrame:
+    df = df[df["GAME_DATE"].isin(df["GAME_DATE"].drop_duplicates().head(days))]
+    return df.sort_values(["GAME_DATE", "GAME_ID", "PLAYER_ID"]).reset_index(drop=True)
+
+
+def test_write_league_saves_its_config(store):
+    assert synthetic.load_config(store) == CONFIG
+
+
+def test_replay_matches_the_full_season(store):
+    full = _full_season()
+
+    gamelogs.replay_synthetic(store, days=3)
+    pd.testing.assert_frame_equal(_stored(store), _first_days(full, 3), check_dtype=False)
+
+    # The next batch continues after the last stored day
+    gamelogs.replay_synthetic(store, days=2)
+    pd.testing.assert_frame_equal(_stored(store), _first_days(full, 5), check_dtype=False)
+    assert len(gamelogs.stored_games(CONFIG.current, "Regular Season", store_dir=store)) == len(_first_days(full, 5))
+
+
+def test_replay_uses_the_store_league_over_the_given_config(store):
+    other = synthetic.LeagueConfig(seasons=("2024-25",), teams=30, players_per_team=6, games=10, seed=99)
+
+    gamelogs.replay_synthetic(store, days=1, config=other)
+
+    pd.testing.assert_frame_equal(_stored(store), _first_days(_full_season(), 1), check_dtype=False)
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""ResponseCache against a fake sender: fresh hits, TTL expiry + 304 revalidation, offline misses.
+
+Run from the repository root: python -m pytest tests
+"""
+
+import json
+
+import pytest
+
+from data_processing.http_cache import CacheMiss, ResponseCache
+
+ENDPOINT = "leaguedashplayerstats"
+PARAMS = {"Season": "2024-25", "SeasonType": "Regular Season"}
+BODY = json.dumps({"resultSets": [{"name": "LeagueDashPlayerStats", "rowSet": [[1, "A"]]}]})
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.url = "https://stats.example/" + ENDPOINT
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSender:
+    """Replays queued responses and records the validators of every request."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, endpoint, parameters, extra_headers, timeout=None, headers=None, proxy=None):
+        self.requests.append((endpoint, dict(parameters), dict(extra_headers)))
+        return self.responses.pop(0)
+
+
+def _cache(tmp_path, sender, mode="default", ttl=3600):
+    return ResponseCache(cache_dir=tmp_path, ttl=ttl, mode=mode, sender=sender)
+
+
+def _expire(cache, seconds=7200):
+    entry = cache.get(ENDPOINT, PARAMS)
+    entry.fetched_at -= seconds
+    cache.put(entry)
+
+
+def test_fresh_hit_sends_no_request(tmp_path):
+    sender = FakeSender(FakeResponse(200, BODY, {"ETag": '"v1"'}))
+    cache = _cache(tmp_path, sender)
+
+    first = cache.fetch(ENDPOINT, PARAMS)
+    second = cache.fetch(ENDPOINT, PARAMS)
+
+    assert len(sender.requests) == 1
+    assert sender.requests[0][2] == {}  # nothing cached yet: no validators
+    assert not first.from_cache and second.from_cache
+    assert second.body == BODY and second.sha256 == first.sha256
+    assert cache.stats == {"hit": 1, "revalidated": 0, "miss": 1}
+    assert cache.is_fresh(ENDPOINT, PARAMS)
+
+
+def test_expired_entry_revalidates_and_keeps_body_on_304(tmp_path):
+    validators = {"ETag": '"v1"', "Last-Modified": "Tue, 01 Apr 2025 00:00:00 GMT"}
+    sender = FakeSender(FakeResponse(200, BODY, validators), FakeResponse(304))
+    cache = _cache(tmp_path, sender)
+    cache.fetch(ENDPOINT, PARAMS)
+    _expire(cache)
+    assert not cache.is_fresh(ENDPOINT, PARAMS)
+
+    revalidated = cache.fetch(ENDPOINT, PARAMS)
+
+    assert sender.requests[1][2] == {"If-None-Match": '"v1"',
+                                     "If-Modified-Since": "Tue, 01 Apr 2025 00:00:00 GMT"}
+    assert revalidated.body == BODY and revalidated.etag == '"v1"'
+    assert cache.stats["revalidated"] == 1
+    # The 304 renews the entry: the next call is a fresh hit again
+    assert cache.is_fresh(ENDPOINT, PARAMS)
+    cache.fetch(ENDPOINT, PARAMS)
+    assert len(sender.requests) == 2
+
+
+def test_expired_entry_without_validators_is_refetched(tmp_path):
+    new_body = json.dumps({"resultSets": []})
+    sender = FakeSender(FakeResponse(200, BODY), FakeResponse(200, new_body))
+    cache = _cache(tmp_path, sender)
+    cache.fetch(ENDPOINT, PARAMS)
+    _expire(cache)
+
+    refetched = cache.fetch(ENDPOINT, PARAMS)
+
+    assert sender.requests[1][2] == {}
+    assert refetched.body == new_body
+    assert cache.get(ENDPOINT, PARAMS).body == new_body
+
+
+def test_error_page_is_not_cached(tmp_path):
+    sender = FakeSender(FakeResponse(200, "<html>rate limited</html>"))
+    cache = _cache(tmp_path, sender)
+
+    with pytest.raises(ValueError):
+        cache.fetch(ENDPOINT, PARAMS)
+    assert cache.get(ENDPOINT, PARAMS) is None
+
+
+def test_offline_miss_raises_without_sending(tmp_path):
+    sender = FakeSender()
+    cache = _cache(tmp_path, sender, mode="offline")
+
+    with pytest.raises(CacheMiss):
+        cache.fetch(ENDPOINT, PARAMS)
+    assert sender.requests == []
+
+
+def test_offline_serves_expired_entries(tmp_path):
+    online = _cache(tmp_path, FakeSender(FakeResponse(200, BODY)))
+    online.fetch(ENDPOINT, PARAMS)
+    _expire(online)
+
+    sender = FakeSender()
+    offline = _cache(tmp_path, sender, mode="offline")
+    assert offline.fetch(ENDPOINT, PARAMS).body == BODY
+    assert sender.requests == []